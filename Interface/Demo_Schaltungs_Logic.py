@@ -6,6 +6,12 @@ import sys
 import os
 import serial.tools.list_ports
 
+from asset_cache import AssetCache
+from led_ring import LedRing
+from crossing_engine import (CrossingConfig, CrossingEngine, EVENT_PERSON_DOWN, EVENT_PERSON_UP, EVENT_SLOW,
+                             EVENT_START, EVENT_TRAM, EVENT_TRAM_SENSOR,
+                             STATE_CLEARANCE, STATE_GREEN, STATE_IDLE, STATE_RED, STATE_SAFETY_1, STATE_TRAM)
+
 # Hardware-Module laden
 try:
     from esp_control import ESPController
@@ -62,9 +68,6 @@ TIME_TRAM_PRE_GREEN = 5000
 TIME_TRAM_GREEN_DURATION = 25000
 TIME_TRAM_YELLOW = 3000
 
-# Basis-Dauer Rotphase berechnen
-DURATION_RED_BASE_MS = int(TOTAL_LEDS_RED * SECONDS_PER_LED_RED * 1000)
-
 # 5. OPTIK / FARBEN
 TIMER_FONT_SIZE = 280
 ORIGINAL_LED_RADIUS = 235
@@ -99,31 +102,25 @@ TIMER_POS_X, TIMER_POS_Y = 0, 0
 
 LED_RADIUS = 0
 DOT_SIZE_BASE = 0
+led_ring = None
 images = {}
 waiting_images = []
 game_font = None
 info_font = None
 
-# ZUSTÄNDE
-STATE_IDLE = "IDLE"
-STATE_RED = "RED"
-STATE_SAFETY_1 = "SAFETY_1"
-STATE_GREEN = "GREEN"
-STATE_CLEARANCE = "CLEARANCE"
-STATE_TRAM = "TRAM"
-
 def debug_log(message):
     print(f"[DEBUG] {message}", flush=True)
 
-def load_and_scale_image(path, scale=SCALE_FACTOR):
+def load_and_scale_image(assets, filename, scale=SCALE_FACTOR):
+    path = assets.path(filename)
     try:
         if not os.path.exists(path):
             if "tram" in path or "waiting" in path:
                 return None
             else:
                 raise FileNotFoundError(f"Datei fehlt: {path}")
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.smoothscale(img, (int(img.get_width()*scale), int(img.get_height()*scale)))
+        # Skaliert aus dem Platten-Cache (siehe asset_cache.py), nur beim ersten Start per smoothscale
+        return assets.image(filename, scale)
     except Exception as e:
         print(f"[FEHLER] Bild konnte nicht geladen werden: {path}\nGrund: {e}")
         sys.exit()
@@ -137,23 +134,19 @@ def load_images():
         print(f"[CRITICAL ERROR] Ordner 'assets' nicht gefunden im Pfad: {asset_dir}")
         sys.exit()
 
-    images['housing'] = load_and_scale_image(os.path.join(asset_dir, 'gehaeuse.png'))
-    images['red_on'] = load_and_scale_image(os.path.join(asset_dir, 'mann_rot_an.png'))
-    images['red_off'] = load_and_scale_image(os.path.join(asset_dir, 'mann_rot_aus.png'))
-    images['green_on'] = load_and_scale_image(os.path.join(asset_dir, 'mann_gruen_an.png'))
-    images['green_off'] = load_and_scale_image(os.path.join(asset_dir, 'mann_gruen_aus.png'))
-    images['tram'] = load_and_scale_image(os.path.join(asset_dir, 'tram.png'), scale=SCALE_FACTOR * 0.7)
-
-    for i in range(1, MAX_VISUAL_PERSONS + 1):
-        filename = f"waiting_{i}.png"
-        full_path = os.path.join(asset_dir, filename)
-        if os.path.exists(full_path):
-            img = load_and_scale_image(full_path, scale=WAITING_ICON_SCALE)
-            waiting_images.append(img)
-        else:
-            waiting_images.append(None)
+    assets = AssetCache(asset_dir, log=debug_log)
+    images['housing'] = load_and_scale_image(assets, 'gehaeuse.png')
+    images['red_on'] = load_and_scale_image(assets, 'mann_rot_an.png')
+    images['red_off'] = load_and_scale_image(assets, 'mann_rot_aus.png')
+    images['green_on'] = load_and_scale_image(assets, 'mann_gruen_an.png')
+    images['green_off'] = load_and_scale_image(assets, 'mann_gruen_aus.png')
+    images['tram'] = load_and_scale_image(assets, 'tram.png', scale=SCALE_FACTOR * 0.7)
+
+    # Warte-Icons als ein gemeinsamer Atlas; fehlende Dateien bleiben None
+    waiting_images = assets.atlas([f"waiting_{i}.png" for i in range(1, MAX_VISUAL_PERSONS + 1)],
+                                  WAITING_ICON_SCALE)
 
-    global WIDTH, HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT, CENTER_X, CENTER_Y, CENTER_X_CAR, CENTER_Y_CAR, TIMER_POS_X, TIMER_POS_Y, LED_RADIUS, DOT_SIZE_BASE
+    global WIDTH, HEIGHT, WINDOW_WIDTH, WINDOW_HEIGHT, CENTER_X, CENTER_Y, CENTER_X_CAR, CENTER_Y_CAR, TIMER_POS_X, TIMER_POS_Y, LED_RADIUS, DOT_SIZE_BASE, led_ring
     
     if images['housing'] is None: sys.exit()
 
@@ -178,6 +171,8 @@ def load_images():
     
     LED_RADIUS = int(ORIGINAL_LED_RADIUS * SCALE_FACTOR)
     DOT_SIZE_BASE = max(2, int(ORIGINAL_DOT_SIZE * SCALE_FACTOR))
+    led_ring = LedRing(LED_RADIUS, DOT_SIZE_BASE, color_on=COLOR_LED_ON,
+                       color_off=COLOR_LED_OFF, color_clearance=COLOR_CLEARANCE)
     
     # Technische Schriftart (Consolas oder System-Monospace)
     try:
@@ -215,56 +210,8 @@ def draw_countdown_timer(screen, remaining_ms):
     game_font.render_to(screen, (x, y), text, (255, 255, 255))
 
 def draw_led_ring(screen, active_leds, total_leds, state, breathing_alpha=255):
-    ring_center_y = CENTER_Y + OFFSET_RING_Y
-    current_dot_size = DOT_SIZE_BASE
-    if total_leds > 60:
-        current_dot_size = max(2, int(DOT_SIZE_BASE * (60/total_leds)))
-    surf_size = (current_dot_size * 2) + 4
-    center_offset = surf_size // 2
-
-    for i in range(total_leds):
-        angle = math.radians(-90 + (360 / total_leds) * i)
-        x_int = int(CENTER_X + LED_RADIUS * math.cos(angle))
-        y_int = int(ring_center_y + LED_RADIUS * math.sin(angle))
-
-        is_lit = False
-        current_color = COLOR_LED_OFF
-
-        if state == STATE_GREEN:
-            leds_gone = total_leds - active_leds
-            shifted_i = (i - 1) % total_leds
-            if shifted_i >= leds_gone:
-                is_lit = True
-                current_color = COLOR_LED_ON
-        elif state == STATE_RED:
-            if i < active_leds:
-                is_lit = True
-                current_color = COLOR_LED_ON
-        elif state == STATE_TRAM:
-            leds_gone = total_leds - active_leds
-            shifted_i = (i - 1) % total_leds
-            if shifted_i >= leds_gone:
-                is_lit = True
-                current_color = COLOR_LED_ON
-        elif state == STATE_CLEARANCE:
-            is_lit = True
-            current_color = COLOR_CLEARANCE 
-        elif state == STATE_SAFETY_1:
-            is_lit = True
-            current_color = COLOR_LED_ON
-
-        if is_lit:
-            if state == STATE_CLEARANCE:
-                dot_surf = pygame.Surface((surf_size, surf_size), pygame.SRCALPHA)
-                pygame.draw.circle(dot_surf, current_color, (center_offset, center_offset), current_dot_size)
-                dot_surf.set_alpha(breathing_alpha)
-                screen.blit(dot_surf, (x_int - center_offset, y_int - center_offset))
-            else:
-                gfxdraw.filled_circle(screen, x_int, y_int, current_dot_size, current_color)
-                gfxdraw.aacircle(screen, x_int, y_int, current_dot_size, current_color)
-        else:
-            gfxdraw.filled_circle(screen, x_int, y_int, current_dot_size, COLOR_LED_OFF)
-            gfxdraw.aacircle(screen, x_int, y_int, current_dot_size, COLOR_LED_OFF)
+    # Vorgerenderte Sprites, ein Surface.blits-Aufruf pro Ring (siehe led_ring.py)
+    led_ring.draw(screen, CENTER_X, CENTER_Y + OFFSET_RING_Y, active_leds, total_leds, state, breathing_alpha)
 
 def draw_car_light_on_housing(screen, cx, cy, color, is_on):
     radius = 95 
@@ -293,19 +240,15 @@ def main():
 
     clock = pygame.time.Clock()
 
-    current_state = STATE_IDLE
-    timer_total_duration_red = DURATION_RED_BASE_MS
-    timer_elapsed = 0
-    green_leds_left_float = 0.0
-    
-    person_count = 0
-    slow_mode_active = False
-    visual_active_leds = 0
-    tram_active = False
+    # Zustandsautomat (crossing_engine.py); die Demo lässt Tram auch die Räumzeit abbrechen
+    engine = CrossingEngine(CrossingConfig.from_constants(globals(), retrigger_after_empty=False,
+                                                          tram_during_clearance=True))
+    esp_pulsing = False
 
     # TIMER VARIABLEN
     phase_timer_ms = 0.0 
     last_light_config = (-1, -1, -1, -1, -1)
+    last_requests = 0
     
     # SIMULATION ZEIT
     simulated_now = 0.0 
@@ -323,201 +266,63 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_g and current_state == STATE_IDLE:
-                    debug_log("Knopf gedrückt! Starte Rotphase.")
-                    current_state = STATE_RED
-                    timer_elapsed = 0
-                    timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                    if esp: esp.set_pulsing(True)
-                    phase_timer_ms = 0 
-
+                if event.key == pygame.K_g:
+                    engine.handle(EVENT_START)
                 if event.key == pygame.K_t:
-                    if current_state == STATE_GREEN:
-                        tram_active = True
-                        # FIX: Auf vollen Ring setzen
-                        green_leds_left_float = float(VISUAL_LED_COUNT)
-                        slow_mode_active = False
-                        phase_timer_ms = 0 
-                    else:
-                        current_state = STATE_TRAM
-                        timer_elapsed = 0
-                        tram_active = True
-                        phase_timer_ms = 0 
-                        
+                    engine.handle(EVENT_TRAM)
                 if event.key == pygame.K_SPACE:
-                    if current_state == STATE_GREEN:
-                        slow_mode_active = not slow_mode_active
-
+                    engine.handle(EVENT_SLOW)
                 if event.key == pygame.K_UP:
-                    person_count = min(MAX_PERSON_CAP, person_count + 1)
+                    engine.handle(EVENT_PERSON_UP)
                 if event.key == pygame.K_DOWN:
-                    person_count = max(0, person_count - 1)
-
-        # Zeit-Faktor
-        current_time_factor = 1.0
-        if current_state == STATE_RED:
-            current_time_factor = 1.0 + ((person_count / 5) * CROWD_BONUS_FACTOR)
-
-        clearance_alpha = 255
-        if current_state == STATE_CLEARANCE:
-            clearance_alpha = int(128 + 127 * math.sin(simulated_now * 0.020))
-        
-        tram_breath_alpha = 255
-        if tram_active:
-             tram_breath_alpha = int(153 + 102 * math.sin(simulated_now * 0.003))
+                    engine.handle(EVENT_PERSON_DOWN)
 
         # --- HARDWARE ---
         if esp:
             if esp.button_pressed:
                 esp.button_pressed = False
-                if current_state == STATE_IDLE:
-                    current_state = STATE_RED
-                    timer_elapsed = 0
-                    timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                    esp.set_pulsing(True)
-                    phase_timer_ms = 0
+                engine.handle(EVENT_START)
             
             if esp.button2_pressed:
                 esp.button2_pressed = False
-                slow_mode_active = not slow_mode_active
+                engine.handle(EVENT_SLOW)
 
             if len(esp.sensor_values) >= 8:
                 if esp.sensor_values[6] == 1 or esp.sensor_values[7] == 1:
-                    if not tram_active:
-                        if current_state == STATE_GREEN:
-                             tram_active = True
-                             green_leds_left_float = float(VISUAL_LED_COUNT)
-                             slow_mode_active = False
-                             phase_timer_ms = 0
-                        elif current_state != STATE_TRAM:
-                            current_state = STATE_TRAM
-                            timer_elapsed = 0
-                            tram_active = True
-                            phase_timer_ms = 0
+                    engine.handle(EVENT_TRAM_SENSOR)
 
         # --- STATE MACHINE ---
-        if current_state == STATE_IDLE:
-            if person_count > 0:
-                current_state = STATE_RED
-                timer_elapsed = 0
-                timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                phase_timer_ms = 0
-                if esp: esp.set_pulsing(True)
-
-        elif current_state == STATE_TRAM:
-            timer_elapsed += dt
-            ratio = timer_elapsed / TIME_TRAM_PRE_GREEN
-            leds_visible_ratio = 1.0 - ratio
-            if leds_visible_ratio < 0: leds_visible_ratio = 0
-            visual_active_leds = int(leds_visible_ratio * VISUAL_LED_COUNT)
-
-            if timer_elapsed >= TIME_TRAM_PRE_GREEN:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                # FIX: Vollen Ring nutzen
-                green_leds_left_float = float(VISUAL_LED_COUNT) 
-                slow_mode_active = False
-
-        elif current_state == STATE_RED:
-            timer_elapsed += dt * current_time_factor
-            ratio = timer_elapsed / timer_total_duration_red
-            if ratio > 1: ratio = 1
-            visual_active_leds = int(ratio * VISUAL_LED_COUNT)
-
-            if timer_elapsed >= timer_total_duration_red:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                if esp: esp.set_pulsing(False)
-                
-                # FIX: Hier wird nun VISUAL_LED_COUNT als Basis genommen
-                # Damit startet der Ring immer VOLL (plus Bonus)
-                bonus_leds = person_count * ADD_LEDS_PER_PERSON
-                green_leds_left_float = float(VISUAL_LED_COUNT + bonus_leds)
-                
-                if green_leds_left_float > MAX_LEDS_LIMIT:
-                    green_leds_left_float = float(MAX_LEDS_LIMIT)
-                slow_mode_active = False
-
-        elif current_state == STATE_SAFETY_1:
-            timer_elapsed += dt
-            visual_active_leds = VISUAL_LED_COUNT
-            if timer_elapsed >= TIME_SAFETY_PRE_GREEN:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                if esp: esp.set_pulsing(False)
-                # FIX: Auch hier saubere Initialisierung
-                bonus_leds = person_count * ADD_LEDS_PER_PERSON
-                green_leds_left_float = float(VISUAL_LED_COUNT + bonus_leds)
-
-        elif current_state == STATE_GREEN:
-            if tram_active:
-                seconds_per_led = TIME_TRAM_GREEN_DURATION / 1000.0 / VISUAL_LED_COUNT
-            else:
-                seconds_per_led = SECONDS_PER_LED_GREEN_SLOW if slow_mode_active else SECONDS_PER_LED_GREEN
-            
-            ms_per_led = seconds_per_led * 1000
-            green_leds_left_float -= (dt / ms_per_led)
-            visual_active_leds = int(green_leds_left_float)
-            
-            # Clamp visual leds
-            if visual_active_leds > VISUAL_LED_COUNT: visual_active_leds = VISUAL_LED_COUNT
-            if visual_active_leds < 0: visual_active_leds = 0
-
-            if green_leds_left_float <= 0:
-                current_state = STATE_CLEARANCE
-                timer_elapsed = 0 
-                visual_active_leds = VISUAL_LED_COUNT
-
-        elif current_state == STATE_CLEARANCE:
-            timer_elapsed += dt 
-            if timer_elapsed > TIME_CLEARANCE:
-                current_state = STATE_IDLE
-                timer_elapsed = 0
-                person_count = 0
-                slow_mode_active = False
-                tram_active = False
-                if esp: esp.set_pulsing(False)
-
-        # --- AMPEL LOGIK ---
-        p_red, p_green = 1, 0
-        c_red, c_yellow, c_green = 0, 0, 1 
-
-        if current_state == STATE_IDLE:
-            pass 
-        elif current_state == STATE_RED:
-            time_left = timer_total_duration_red - timer_elapsed
-            if time_left <= TIME_SAFETY_PRE_GREEN:
-                c_red, c_yellow, c_green = 1, 0, 0 
-            elif time_left <= (TIME_SAFETY_PRE_GREEN + TIME_CAR_YELLOW):
-                c_red, c_yellow, c_green = 0, 1, 0 
-            else:
-                c_red, c_yellow, c_green = 0, 0, 1 
-        elif current_state == STATE_SAFETY_1:
-            c_red, c_yellow, c_green = 1, 0, 0
-        elif current_state == STATE_GREEN:
-            p_red, p_green = 0, 1
-            c_red, c_yellow, c_green = 1, 0, 0
-        elif current_state == STATE_CLEARANCE:
-            p_red, p_green = 1, 0
-            time_left_clearance = TIME_CLEARANCE - timer_elapsed
-            if time_left_clearance < TIME_CAR_RED_YELLOW:
-                c_red, c_yellow, c_green = 1, 1, 0 
-            else:
-                c_red, c_yellow, c_green = 1, 0, 0 
-        elif current_state == STATE_TRAM:
-            if timer_elapsed < TIME_TRAM_YELLOW:
-                c_red, c_yellow, c_green = 0, 1, 0
-            else:
-                c_red, c_yellow, c_green = 1, 0, 0
-            p_red, p_green = 1, 0
+        p_red, p_green, c_red, c_yellow, c_green = engine.step(dt)
 
         if ESP_AVAILABLE and esp:
+            if engine.pulsing != esp_pulsing:
+                esp.set_pulsing(engine.pulsing)
+                esp_pulsing = engine.pulsing
             current_values = (p_red, p_green, c_red, c_yellow, c_green)
             if current_values != last_esp_values or (pygame.time.get_ticks() % 2000 < raw_dt):
                 esp.update_leds(*current_values)
                 last_esp_values = current_values
             s_val = esp.read_sensor_data()
-            if s_val is not None: person_count = min(MAX_PERSON_CAP, s_val)
+            if s_val is not None: engine.set_person_count(s_val)
+
+        current_state = engine.state
+        visual_active_leds = engine.visual_active_leds
+        person_count = engine.person_count
+        slow_mode_active = engine.slow_mode_active
+        tram_active = engine.tram_active
+
+        clearance_alpha = 255
+        if current_state == STATE_CLEARANCE:
+            clearance_alpha = int(128 + 127 * math.sin(simulated_now * 0.020))
+        
+        tram_breath_alpha = 255
+        if tram_active:
+             tram_breath_alpha = int(153 + 102 * math.sin(simulated_now * 0.003))
+
+        # Neue Anforderung (Taste, Tram) startet den Phasen-Timer neu
+        if engine.requests != last_requests:
+            phase_timer_ms = 0
+            last_requests = engine.requests
 
         # --- TIMER RESET (PHASENWECHSEL) ---
         current_light_config = (p_red, p_green, c_red, c_yellow, c_green)
@@ -567,8 +372,7 @@ def main():
             draw_led_ring(screen, visual_active_leds, VISUAL_LED_COUNT, STATE_TRAM, 255)
         elif current_state == STATE_CLEARANCE:
             draw_led_ring(screen, VISUAL_LED_COUNT, VISUAL_LED_COUNT, STATE_CLEARANCE, clearance_alpha)
-            time_left = TIME_CLEARANCE - timer_elapsed
-            draw_countdown_timer(screen, time_left)
+            draw_countdown_timer(screen, engine.clearance_remaining_ms())
         elif current_state == STATE_GREEN:
             if tram_active:
                 tram_surf = images['tram'].copy()
@@ -0,0 +1,291 @@
+"""
+Vorskalierte Assets auf der Platte
+==================================
+Bisher wurde bei jedem Start jedes PNG aus `Interface/assets` in voller
+Auflösung dekodiert und per `smoothscale` verkleinert (Gehäuse, vier
+Figuren, Tram, acht Warte-Icons) – der Großteil davon für Pixel, die nie
+angezeigt werden.
+
+Der Cache legt das fertig skalierte Bild als rohes RGBA (kleiner Header +
+Pixel, kein PNG-Dekodieren) ab. Der Schlüssel besteht aus Name, Datei-Hash
+und Zielgröße – ändert sich ein Asset oder SCALE_FACTOR, passt der
+Schlüssel nicht mehr und das Bild wird einmal neu erzeugt. Die Warte-Icons
+liegen gemeinsam in einem Atlas (eine Datei, ein Surface, Teilflächen).
+
+Zwischengrößen (Fenster wird gerade gezogen) müssen nicht auf die Platte:
+mit `persist=False` bleibt das skalierte Bild nur im Speicher (je Asset
+das letzte), `flush()` schreibt es später – z. B. wenn sich die
+Panel-Größe eine Weile nicht mehr geändert hat.
+
+Gespeichert wird gerades (nicht vormultipliziertes) Alpha: alle Blits im
+Projekt und die SDL-Texturen (BLENDMODE_BLEND) erwarten genau das.
+
+Nutzung:
+    assets = AssetCache(ASSET_DIR, log=debug_log)
+    housing = assets.image("gehaeuse.png", SCALE_FACTOR)
+    waiting = assets.atlas(["waiting_1.png", ...], WAITING_ICON_SCALE)
+    housing = assets.image("gehaeuse.png", scale, persist=False)   # während Resize
+    assets.flush()                                                  # Größe steht
+"""
+
+import hashlib
+import os
+import struct
+import tempfile
+
+import pygame
+
+CACHE_SUBDIR = "cache"
+MAX_VARIANTS = 4         # Je Asset so viele Größen behalten (z. B. Fenster + Vollbild)
+
+_MAGIC = b"TOWLIMG1"     # Bei Formatänderung hochzählen – alte Dateien gelten dann als fehlend
+_HEADER = struct.Struct("<8sIII")   # Magic, Breite, Höhe, Anzahl Teilflächen
+_RECT = struct.Struct("<iiii")
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def file_hash(path, length=12):
+    """Kurzer SHA-256 über den Dateiinhalt."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def scaled_size(size, scale):
+    """Zielgröße eines Bildes – überall dieselbe Rundung, sonst weicht sie um 1 px ab."""
+    return max(1, int(size[0] * scale)), max(1, int(size[1] * scale))
+
+
+class AssetCache:
+    """Lädt skalierte Assets aus dem Platten-Cache oder erzeugt sie einmal."""
+
+    def __init__(self, asset_dir, cache_dir=None, log=print):
+        """
+        Args:
+            asset_dir (str): Verzeichnis mit den PNG-Originalen
+            cache_dir (str): Ablage der skalierten Bilder (Standard: <asset_dir>/cache)
+        """
+        self.asset_dir = asset_dir
+        self.cache_dir = cache_dir or os.path.join(asset_dir, CACHE_SUBDIR)
+        self.log = log
+        self.writable = True
+        self._hashes = {}
+        self._sizes = {}
+        self._sources = {}   # Dekodierte Originale – nur nach einem Cache-Fehlschlag
+        self._pending = {}   # Name -> (Schlüssel, Surface, Rects, Hash): noch nicht geschrieben (flush)
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, filename):
+        return os.path.join(self.asset_dir, filename)
+
+    def exists(self, filename):
+        return os.path.exists(self.path(filename))
+
+    def _hash(self, filename):
+        digest = self._hashes.get(filename)
+        if digest is None:
+            digest = self._hashes[filename] = file_hash(self.path(filename))
+        return digest
+
+    def source_size(self, filename):
+        """Originalgröße (Breite, Höhe), bei PNG direkt aus dem Header gelesen."""
+        size = self._sizes.get(filename)
+        if size is None:
+            with open(self.path(filename), "rb") as f:
+                head = f.read(24)
+            if head[:8] == _PNG_SIGNATURE and head[12:16] == b"IHDR":
+                size = struct.unpack(">II", head[16:24])
+            else:
+                size = self._source(filename).get_size()
+            self._sizes[filename] = size
+        return size
+
+    def _source(self, filename):
+        img = self._sources.get(filename)
+        if img is None:
+            img = pygame.image.load(self.path(filename))
+            self._sources[filename] = img
+        return img
+
+    @staticmethod
+    def _finish(img):
+        # convert_alpha() braucht ein pygame.display-Fenster (fehlt beim Textur-Backend)
+        return img.convert_alpha() if pygame.display.get_surface() else img
+
+    def _render(self, filename, size):
+        """Original dekodieren und auf `size` skalieren (der langsame Weg)."""
+        return pygame.transform.smoothscale(self._finish(self._source(filename)), size)
+
+    # --- Öffentliche Schnittstelle ---
+
+    def image(self, filename, scale, optional=False, persist=True):
+        """
+        Skaliertes Bild laden.
+
+        Args:
+            persist (bool): False = neu skaliertes Bild nur im Speicher halten (bis flush())
+
+        Returns:
+            pygame.Surface oder None (nur bei optional=True und fehlender Datei)
+
+        Raises:
+            FileNotFoundError: Pflicht-Asset fehlt
+        """
+        if not self.exists(filename):
+            if optional:
+                return None
+            raise FileNotFoundError(f"Datei fehlt: {self.path(filename)}")
+        size = scaled_size(self.source_size(filename), scale)
+        stem = os.path.splitext(filename)[0]
+        key = f"{stem}-{self._hash(filename)}-{size[0]}x{size[1]}"
+        cached = self._lookup(key, stem)
+        if cached is not None:
+            return cached[0]
+        img = self._render(filename, size)
+        self._store(key, img, [img.get_rect()], stem, self._hash(filename), persist)
+        return img
+
+    def atlas(self, filenames, scale, persist=True):
+        """
+        Mehrere Bilder gleicher Skalierung aus einem gemeinsamen Atlas laden.
+        Fehlende Dateien ergeben None an ihrer Stelle.
+
+        Returns:
+            list: Teilflächen (Subsurfaces) des Atlas bzw. None
+        """
+        present = [name for name in filenames if self.exists(name)]
+        if not present:
+            return [None] * len(filenames)
+        sizes = [scaled_size(self.source_size(name), scale) if name in present else None for name in filenames]
+        # Hash über alle Quellen (und welche fehlen), Größe wie bei Einzelbildern im Namen
+        digest = hashlib.sha256()
+        for name, size in zip(filenames, sizes):
+            digest.update(f"{name}:{self._hash(name) if size else '-'}|".encode())
+        stem = "atlas-" + os.path.splitext(filenames[0])[0]
+        atlas_hash = digest.hexdigest()[:12]
+        width = sum(size[0] for size in sizes if size)
+        height = max(size[1] for size in sizes if size)
+        key = f"{stem}-{atlas_hash}-{width}x{height}"
+
+        cached = self._lookup(key, stem)
+        if cached is None:
+            # Nebeneinander packen – Subsurfaces bluten beim Blit nicht über
+            surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            surface = self._finish(surface)
+            surface.fill((0, 0, 0, 0))
+            rects = []
+            x = 0
+            for name, size in zip(filenames, sizes):
+                if size is None:
+                    rects.append(pygame.Rect(0, 0, 0, 0))
+                    continue
+                surface.blit(self._render(name, size), (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+                rects.append(pygame.Rect(x, 0, *size))
+                x += size[0]
+            self._store(key, surface, rects, stem, atlas_hash, persist)
+        else:
+            surface, rects = cached
+        return [surface.subsurface(rect) if rect.w else None for rect in rects]
+
+    def flush(self):
+        """
+        Nur im Speicher gehaltene Bilder (persist=False) auf die Platte schreiben.
+
+        Returns:
+            int: Anzahl geschriebener Einträge
+        """
+        pending, self._pending = self._pending, {}
+        for stem, (key, surface, rects, digest) in pending.items():
+            self._write(key, surface, rects, stem, digest)
+        return len(pending)
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cache_dir": self.cache_dir}
+
+    def _lookup(self, key, stem):
+        """Noch nicht geschriebenes Bild gleicher Größe oder Cache-Datei."""
+        pending = self._pending.get(stem)
+        if pending is not None and pending[0] == key:
+            self.hits += 1
+            return pending[1], pending[2]
+        return self._read(key)
+
+    def _store(self, key, surface, rects, stem, digest, persist):
+        if persist:
+            self._pending.pop(stem, None)
+            self._write(key, surface, rects, stem, digest)
+        else:
+            # Je Asset nur die letzte Zwischengröße merken
+            self._pending[stem] = (key, surface, rects, digest)
+
+    # --- Dateiformat ---
+
+    def _file(self, key):
+        return os.path.join(self.cache_dir, key + ".rgba")
+
+    def _read(self, key):
+        """(Surface, [Rect, ...]) aus dem Cache oder None."""
+        try:
+            with open(self._file(key), "rb") as f:
+                magic, width, height, count = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC:
+                    raise ValueError("falsches Format")
+                rects = [pygame.Rect(_RECT.unpack(f.read(_RECT.size))) for _ in range(count)]
+                # bytearray statt bytes: das Surface teilt sich den Puffer und muss beschreibbar sein
+                pixels = bytearray(width * height * 4)
+                if f.readinto(pixels) != len(pixels):
+                    raise ValueError("Datei unvollständig")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, struct.error) as e:
+            self.log(f"Asset-Cache: {key} unbrauchbar ({e}), wird neu erzeugt.")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._finish(pygame.image.frombuffer(pixels, (width, height), "RGBA")), rects
+
+    def _write(self, key, surface, rects, stem, digest):
+        """Atomar schreiben (Temp-Datei + rename); Fehler nur loggen – der Cache ist optional."""
+        if not self.writable:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=key, suffix=".tmp", dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_HEADER.pack(_MAGIC, surface.get_width(), surface.get_height(), len(rects)))
+                    for rect in rects:
+                        f.write(_RECT.pack(*rect))
+                    f.write(pygame.image.tobytes(surface, "RGBA"))
+                os.replace(tmp, self._file(key))
+            except BaseException:
+                os.remove(tmp)
+                raise
+            self._remove_stale(stem, digest)
+        except OSError as e:
+            self.log(f"Asset-Cache nicht beschreibbar ({self.cache_dir}): {e}")
+            self.writable = False
+
+    def _remove_stale(self, stem, digest):
+        """Einträge mit anderem Hash entfernen, von gleichem Hash nur die MAX_VARIANTS neuesten behalten."""
+        prefix = stem + "-"
+        variants = []
+        for name in os.listdir(self.cache_dir):
+            if not (name.startswith(prefix) and name.endswith(".rgba")):
+                continue
+            # Nach dem Namen folgt immer der 12-stellige Hash – so trifft "tram-" nicht auf "tram-x-"
+            entry_hash = name[len(prefix):-len(".rgba")].split("-")[0]
+            if len(entry_hash) != 12:
+                continue
+            path = os.path.join(self.cache_dir, name)
+            if entry_hash == digest:
+                variants.append(path)
+            else:
+                os.remove(path)
+        variants.sort(key=os.path.getmtime, reverse=True)
+        for path in variants[MAX_VARIANTS:]:
+            os.remove(path)
@@ -0,0 +1,528 @@
+"""
+Ampel-Zustandsautomat ohne UI
+=============================
+Die Logik IDLE -> RED -> GREEN -> CLEARANCE (plus TRAM und SAFETY_1) stand
+bisher als lokale Variablen in den Hauptschleifen von integrated_main.py,
+Interface/main.py und Demo_Schaltungs_Logic.py – dreimal fast gleich,
+verwoben mit pygame-Events und Zeichnen.
+
+`CrossingEngine` hält diesen Zustand allein und wird nur über explizite
+Eingaben getrieben: verstrichene Zeit (`step(dt)`), Personenzahl
+(`set_person_count`) und Ereignisse (`handle`: Start-Taste, Tram,
+Slow-Modus). `step()` liefert die Lampen (p_red, p_green, c_red, c_yellow,
+c_green) wie sie an den ESP gehen.
+
+Die Lampen werden nicht in jedem Schritt neu hergeleitet: beim Eintritt in
+eine Phase entsteht ein Fahrplan (traffic_logic.PhaseSchedule), danach
+wird nur ein Cursor vorgeschoben. `next_lamp_change_ms()` sagt, wann sich
+die Lampen bei gleichbleibenden Eingaben das nächste Mal ändern – die
+Steuerung kann den ESP so genau zum Wechsel bedienen statt erst im
+nächsten Takt.
+
+Die Uhr des Automaten ist die Summe der übergebenen dt – es gibt keinen
+Zugriff auf pygame oder time. Wer schneller als Echtzeit rechnen will
+(Simulation, Timing-Experimente), ruft step() einfach in einer Schleife auf.
+
+Die Unterschiede der drei Apps (Zeiten, Wieder-Auslösen erst nach leerer
+Wartefläche, Tram während der Räumzeit) stecken in `CrossingConfig`.
+Optimierte Zeiten (timing_optimizer.py) liegen als JSON-Datei vor und
+werden mit `load_timing_file` übernommen – nur die Werte aus
+`TIMING_FILE_KEYS` und nur wenn sie gültig sind und die harten
+Sicherheits-Untergrenzen (`SAFETY_MINIMUMS`) einhalten.
+
+Nutzung:
+    engine = CrossingEngine(CrossingConfig.from_constants(globals()), log=debug_log)
+    engine.handle(EVENT_START)
+    engine.set_person_count(3)
+    lights = engine.step(16)
+"""
+
+import json
+import math
+import os
+
+from traffic_logic import (LAMP_CAR_GREEN, LAMP_CAR_RED, LAMP_CAR_YELLOW, LAMP_MAIN_GREEN, LAMP_MAIN_RED,
+                           PhaseSchedule, pack_lights, unpack_lights)
+
+# --- Zustände ---
+STATE_IDLE = "IDLE"            # Alles ruhig, Auto Grün
+STATE_RED = "RED"              # Wartezeit füllt sich
+STATE_SAFETY_1 = "SAFETY_1"    # Puffer, Alle Rot
+STATE_GREEN = "GREEN"          # Gehen
+STATE_CLEARANCE = "CLEARANCE"  # Räumen
+STATE_TRAM = "TRAM"            # Tram kündigt sich an (Autos Gelb -> Rot)
+
+# --- Ereignisse ---
+EVENT_START = "start"              # Taste / ESP-Button 1: Rotphase anfordern
+EVENT_TRAM = "tram"                # Taste: startet oder verlängert einen Tram-Zyklus
+EVENT_TRAM_SENSOR = "tram_sensor"  # Sensor: nur wenn noch kein Tram-Zyklus läuft
+EVENT_SLOW = "slow"                # Taste / ESP-Button 2: Slow-Modus während Grün umschalten
+EVENT_PERSON_UP = "person_up"
+EVENT_PERSON_DOWN = "person_down"
+EVENTS = (EVENT_START, EVENT_TRAM, EVENT_TRAM_SENSOR, EVENT_SLOW, EVENT_PERSON_UP, EVENT_PERSON_DOWN)
+
+# Lampen (p_red, p_green, c_red, c_yellow, c_green) im Ruhezustand: Mensch Rot, Auto Grün
+LIGHTS_IDLE = (1, 0, 0, 0, 1)
+
+# Grün-Tank gilt ab hier als leer – Rundungsreste (z. B. 3e-15) sollen kein Extra-Schritt sein
+_TANK_EMPTY = 1e-9
+
+# --- Sicherheits-Untergrenzen (ms, echte Zeit) ---
+# Die Rotphase läuft bei voller Wartefläche bis zu (1 + cap/5 * crowd_bonus_factor)-mal
+# schneller – Gelb und Alles-Rot am Ende der Rotphase werden dabei mit verkürzt.
+SAFETY_MINIMUMS = {
+    "car_yellow": 2000,         # Auto-Gelb vor Rot, auch bei voller Wartefläche
+    "all_red": 2000,            # Alles-Rot vor Fußgänger-Grün, auch bei voller Wartefläche
+    "car_red_yellow": 1000,
+    "clearance": 5000,          # Räumzeit nach Fußgänger-Grün
+    "pedestrian_green": 5000,   # Kürzestes Fußgänger-Grün (Tank ohne Bonus bzw. Tram)
+    "tram_yellow": 3000,
+    "tram_all_red": 2000,       # Alles-Rot zwischen Tram-Gelb und Grün
+}
+
+# Nur diese Werte darf eine Timing-Datei setzen (Suchraum von timing_optimizer.py).
+# LED-Zahlen, Slow-Modus und Varianten-Schalter bleiben Sache der App.
+TIMING_FILE_KEYS = (
+    "seconds_per_led_red",
+    "seconds_per_led_green",
+    "crowd_bonus_factor",
+    "add_leds_per_person",
+    "time_clearance",
+    "time_tram_pre_green",
+    "time_tram_green_duration",
+)
+
+
+class CrossingConfig:
+    """Zeiten und Varianten-Schalter des Automaten (Standard: integrated_main.py)."""
+
+    DEFAULTS = {
+        # Personen
+        "max_person_cap": 8,
+        "add_leds_per_person": 1,
+        "crowd_bonus_factor": 0.3,
+        # LEDs
+        "base_leds_green": 25,
+        "visual_led_count": 25,
+        "total_leds_red": 25,
+        "max_leds_limit": 30,
+        # Geschwindigkeiten
+        "seconds_per_led_red": 0.40,
+        "seconds_per_led_green": 0.66,
+        "seconds_per_led_green_slow": 1.0,
+        # Feste Phasen (ms)
+        "time_safety_pre_green": 3000,
+        "time_clearance": 6000,
+        "time_car_yellow": 3000,
+        "time_car_red_yellow": 1500,
+        "time_tram_pre_green": 5000,
+        "time_tram_green_duration": 25000,
+        "time_tram_yellow": 3000,
+        # Varianten
+        "retrigger_after_empty": True,    # Neuer Zyklus erst, wenn vorher niemand wartete
+        "tram_during_clearance": False,   # Tram darf die Räumzeit abbrechen (Demo)
+    }
+
+    # Wertebereiche (value_errors): Zählwerte ganzzahlig, alles Übrige außer den
+    # Schaltern ist eine Zeit/Geschwindigkeit und muss > 0 sein – der Automat teilt dadurch
+    COUNT_KEYS = ("max_person_cap", "base_leds_green", "visual_led_count", "total_leds_red", "max_leds_limit")
+    NON_NEGATIVE_KEYS = ("add_leds_per_person", "crowd_bonus_factor")   # 0 = kein Zuschlag
+    INT_KEYS = COUNT_KEYS + ("add_leds_per_person",)
+    FLAG_KEYS = ("retrigger_after_empty", "tram_during_clearance")
+
+    def __init__(self, **values):
+        for key, value in self.DEFAULTS.items():
+            setattr(self, key, value)
+        self.update(values)
+
+    @classmethod
+    def from_constants(cls, namespace, **overrides):
+        """Config aus den Modul-Konstanten einer App (z. B. SECONDS_PER_LED_RED) bauen."""
+        values = {key: namespace[key.upper()] for key in cls.DEFAULTS if key.upper() in namespace}
+        values.update(overrides)
+        return cls(**values)
+
+    def update(self, values):
+        for key, value in values.items():
+            if key not in self.DEFAULTS:
+                raise ValueError(f"Unbekannter Config-Wert: {key} (erlaubt: {', '.join(self.DEFAULTS)})")
+            setattr(self, key, value)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+    @property
+    def duration_red_ms(self):
+        """Basis-Dauer der Rotphase (ohne Sicherheits-Puffer)."""
+        return int(self.total_leds_red * self.seconds_per_led_red * 1000)
+
+    @property
+    def max_time_factor(self):
+        """So viel schneller läuft die Rotphase höchstens (volle Wartefläche)."""
+        return 1.0 + (self.max_person_cap / 5) * self.crowd_bonus_factor
+
+    def value_errors(self):
+        """Werte mit falschem Typ oder außerhalb des Wertebereichs als Liste von Meldungen (leer = gültig)."""
+        errors = []
+        for key in self.DEFAULTS:
+            value = getattr(self, key)
+            if key in self.FLAG_KEYS:
+                if not isinstance(value, bool):
+                    errors.append(f"{key}: {value!r} ist kein bool")
+                continue
+            expected = int if key in self.INT_KEYS else (int, float)
+            # bool ist in Python ein int – als Zahl aber sicher ein Tippfehler
+            if isinstance(value, bool) or not isinstance(value, expected) or not math.isfinite(value):
+                errors.append(f"{key}: {value!r} ist keine {'ganze ' if key in self.INT_KEYS else ''}Zahl")
+            elif key in self.NON_NEGATIVE_KEYS:
+                if value < 0:
+                    errors.append(f"{key}: {value} < 0")
+            elif value <= 0:
+                errors.append(f"{key}: {value} <= 0")
+        return errors
+
+    def safety_violations(self):
+        """
+        Verstöße gegen SAFETY_MINIMUMS als Liste von Meldungen (leer = sicher).
+        Setzt gültige Werte voraus (value_errors).
+        """
+        factor = self.max_time_factor
+        # Gelb beginnt erst, wenn weniger als Alles-Rot + Gelb übrig ist – bei kurzer Rotphase sofort
+        car_yellow = min(self.time_car_yellow, self.duration_red_ms) / factor
+        checks = [
+            ("car_yellow", car_yellow),
+            ("all_red", self.time_safety_pre_green / factor),
+            ("car_red_yellow", self.time_car_red_yellow),
+            ("clearance", self.time_clearance),
+            ("pedestrian_green", min(self.base_leds_green * self.seconds_per_led_green * 1000,
+                                     self.time_tram_green_duration)),
+            ("tram_yellow", self.time_tram_yellow),
+            ("tram_all_red", self.time_tram_pre_green - self.time_tram_yellow),
+        ]
+        return [f"{name}: {value:.0f} ms < {SAFETY_MINIMUMS[name]} ms"
+                for name, value in checks if value < SAFETY_MINIMUMS[name]]
+
+    def validate(self):
+        """
+        Raises:
+            ValueError: Ungültiger Wert oder Sicherheits-Untergrenze unterschritten
+        """
+        errors = self.value_errors()
+        if errors:
+            raise ValueError("Ungültige Ampel-Werte: " + "; ".join(errors))
+        violations = self.safety_violations()
+        if violations:
+            raise ValueError("Unsichere Ampel-Zeiten: " + "; ".join(violations))
+
+    def copy(self):
+        return CrossingConfig(**self.as_dict())
+
+    def __repr__(self):
+        return f"CrossingConfig({self.as_dict()})"
+
+
+def save_timing_file(path, values, **meta):
+    """
+    Zeiten als JSON schreiben (atomar). `values` sind Config-Werte aus
+    TIMING_FILE_KEYS, `meta` landet daneben (z. B. Szenario und Kennzahlen
+    des Optimierers).
+    """
+    _check_timing_keys(values)
+    CrossingConfig(**values).validate()
+    data = dict(meta)
+    data["config"] = dict(values)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _check_timing_keys(values):
+    if not isinstance(values, dict):
+        raise TypeError(f"config muss ein Objekt sein, nicht {type(values).__name__}")
+    extra = [key for key in values if key not in TIMING_FILE_KEYS]
+    if extra:
+        raise ValueError(f"Nicht erlaubt in Timing-Datei: {', '.join(extra)} "
+                         f"(erlaubt: {', '.join(TIMING_FILE_KEYS)})")
+
+
+def load_timing_file(config, path, log=print):
+    """
+    Zeiten aus einer Datei von save_timing_file in `config` übernehmen.
+    Fehlt die Datei oder ist sie unbrauchbar/unsicher oder setzt sie Werte
+    außerhalb von TIMING_FILE_KEYS, bleibt `config` unverändert.
+
+    Returns:
+        bool: True, wenn die Datei übernommen wurde
+    """
+    if not path or not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            values = json.load(f)["config"]
+        _check_timing_keys(values)
+        candidate = config.copy()
+        candidate.update(values)
+        candidate.validate()
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log(f"Timing-Datei {path} ignoriert: {e}")
+        return False
+    config.update(values)
+    log(f"Timing-Datei geladen: {path} ({', '.join(f'{k}={v}' for k, v in values.items())})")
+    return True
+
+
+class CrossingEngine:
+    """Zustandsautomat einer Fußgängerampel mit Auto- und Tram-Phasen."""
+
+    def __init__(self, config=None, log=None):
+        """
+        Args:
+            config (CrossingConfig): Zeiten/Varianten (Standard: Werte von integrated_main)
+            log (callable): Meldungen zu Zustandswechseln (None = still, z. B. in Simulationen)
+        """
+        self.config = config or CrossingConfig()
+        self.log = log
+        self.reset()
+
+    def reset(self):
+        """Zurück in den Ruhezustand, Uhr auf 0."""
+        self.now = 0                       # Automaten-Uhr in ms (Summe aller dt)
+        self.state = STATE_IDLE
+        self.timer_total_duration_red = self.config.duration_red_ms
+        self.timer_elapsed = 0
+        self.green_leds_left_float = 0.0   # "Tank" der Grünphase in LED-Punkten
+        self.clearance_start_time = 0
+        self.person_count = 0
+        self.slow_mode_active = False
+        self.visual_active_leds = 0
+        self.tram_active = False           # Laufender Tram-Zyklus (längeres Grün + Icon)
+        self.cycle_was_zero = True         # Trigger-Logik: erster Erkennungsfall löst aus
+        self.pulsing = False               # ESP-Taster pulsiert: Anforderung angenommen, bis Grün
+        self.requests = 0                  # Angenommene Anforderungen (Rotphase, Tram)
+        self.cycles = 0
+        self._enter_phase()
+        self.lights = LIGHTS_IDLE
+
+    def _log(self, message):
+        if self.log:
+            self.log(message)
+
+    # --- Abgeleitete Werte ---
+
+    @property
+    def p_green(self):
+        return self.lights[1]
+
+    def clearance_remaining_ms(self):
+        return self.config.time_clearance - (self.now - self.clearance_start_time)
+
+    def _time_factor(self):
+        """Rot läuft schneller, je mehr Leute warten."""
+        return 1.0 + ((self.person_count / 5) * self.config.crowd_bonus_factor)
+
+    def _seconds_per_led_green(self):
+        cfg = self.config
+        if self.tram_active:
+            # Fester Ablauf: ganzer Ring in TIME_TRAM_GREEN_DURATION
+            return cfg.time_tram_green_duration / 1000.0 / cfg.visual_led_count
+        return cfg.seconds_per_led_green_slow if self.slow_mode_active else cfg.seconds_per_led_green
+
+    def _phase_clock(self):
+        """Uhr des Fahrplans: Phasen-Timer (RED läuft mit dem Crowd-Faktor) bzw. Zeit seit Räumbeginn."""
+        if self.state == STATE_CLEARANCE:
+            return self.now - self.clearance_start_time
+        return self.timer_elapsed
+
+    def next_lamp_change_ms(self):
+        """
+        Automaten-ms bis zum nächsten Lampenwechsel (inkl. Phasenende), wenn
+        Personenzahl und Slow-Modus so bleiben. None = wartet auf Eingaben (IDLE).
+        """
+        if pack_lights(*self.lights) != self.schedule.current:
+            return 0.0   # Ereignis hat eine neue Phase begonnen – Lampen wechseln im nächsten Schritt
+        if self.state == STATE_GREEN:
+            return max(0.0, (self.green_leds_left_float - _TANK_EMPTY) * self._seconds_per_led_green() * 1000)
+        t = self.schedule.next_change()
+        if t is None:
+            return None
+        remaining = t - self._phase_clock()
+        if self.state == STATE_RED:
+            remaining /= self._time_factor()
+        return max(0.0, remaining)
+
+    # --- Eingaben ---
+
+    def set_person_count(self, count):
+        self.person_count = max(0, min(self.config.max_person_cap, count))
+
+    def handle(self, event):
+        """Ein Ereignis (EVENT_*) verarbeiten; Zeit vergeht dabei nicht."""
+        state = self.state
+        if event == EVENT_START:
+            if state == STATE_IDLE:
+                self._log("Anforderung: Starte Rotphase.")
+                self._start_red()
+        elif event == EVENT_TRAM:
+            if state == STATE_CLEARANCE and not self.config.tram_during_clearance:
+                self._log("Tram ignoriert: Räumzeit läuft.")
+            else:
+                self._log("Tram!")
+                self._start_tram()
+        elif event == EVENT_TRAM_SENSOR:
+            # Sensoren melden sich evtl. jeden Takt – nur den ersten Kontakt eines Zyklus auswerten
+            if self.tram_active or state == STATE_TRAM:
+                return
+            if state != STATE_CLEARANCE or self.config.tram_during_clearance:
+                self._log("Tram erkannt (Sensor)!")
+                self._start_tram()
+        elif event == EVENT_SLOW:
+            if state == STATE_GREEN:
+                self.slow_mode_active = not self.slow_mode_active
+                self._log(f"Slow Mode: {self.slow_mode_active}")
+        elif event == EVENT_PERSON_UP:
+            self.set_person_count(self.person_count + 1)
+        elif event == EVENT_PERSON_DOWN:
+            self.set_person_count(self.person_count - 1)
+        else:
+            raise ValueError(f"Unbekanntes Ereignis: {event} (erlaubt: {', '.join(EVENTS)})")
+
+    def _start_red(self):
+        self.requests += 1
+        self.state = STATE_RED
+        self.timer_elapsed = 0
+        self.timer_total_duration_red = self.config.duration_red_ms + self.config.time_safety_pre_green
+        self.pulsing = True
+        self._enter_phase()
+
+    def _start_tram(self):
+        self.requests += 1
+        if self.state == STATE_GREEN:
+            # Schon Grün: Tram-Modus aktivieren und Tank neu füllen (Verlängerung)
+            self.tram_active = True
+            self.green_leds_left_float = float(self.config.visual_led_count)
+            self.slow_mode_active = False
+        else:
+            self.state = STATE_TRAM
+            self.timer_elapsed = 0
+            self.tram_active = True
+            self._enter_phase()
+
+    def _start_green(self):
+        cfg = self.config
+        self.state = STATE_GREEN
+        self.timer_elapsed = 0
+        # Tank: Basis + Bonus pro wartender Person, gedeckelt
+        bonus_leds = self.person_count * cfg.add_leds_per_person
+        self.green_leds_left_float = float(min(cfg.base_leds_green + bonus_leds, cfg.max_leds_limit))
+        self.slow_mode_active = False
+        self.pulsing = False
+        self._enter_phase()
+
+    def _enter_phase(self):
+        """Fahrplan der Lampen für die gerade begonnene Phase (Phasen-Uhr siehe _phase_clock)."""
+        cfg = self.config
+        state = self.state
+        if state == STATE_RED:
+            # Auto fährt noch, am Ende Gelb -> Rot -> Safety-Rot
+            total = self.timer_total_duration_red
+            transitions = [
+                (0, LAMP_MAIN_RED | LAMP_CAR_GREEN),
+                (total - cfg.time_safety_pre_green - cfg.time_car_yellow, LAMP_MAIN_RED | LAMP_CAR_YELLOW),
+                (total - cfg.time_safety_pre_green, LAMP_MAIN_RED | LAMP_CAR_RED),
+            ]
+            end = total
+        elif state == STATE_SAFETY_1:
+            transitions, end = [(0, LAMP_MAIN_RED | LAMP_CAR_RED)], cfg.time_safety_pre_green
+        elif state == STATE_GREEN:
+            transitions, end = [(0, LAMP_MAIN_GREEN | LAMP_CAR_RED)], None   # Ende hängt am Tank
+        elif state == STATE_CLEARANCE:
+            # Letzte TIME_CAR_RED_YELLOW: Auto Rot+Gelb
+            transitions = [
+                (0, LAMP_MAIN_RED | LAMP_CAR_RED),
+                (cfg.time_clearance - cfg.time_car_red_yellow, LAMP_MAIN_RED | LAMP_CAR_RED | LAMP_CAR_YELLOW),
+            ]
+            end = cfg.time_clearance
+        elif state == STATE_TRAM:
+            # Erst Gelb, dann Rot ("Buffer") bis zum Fußgänger-Grün
+            transitions = [(0, LAMP_MAIN_RED | LAMP_CAR_YELLOW), (cfg.time_tram_yellow, LAMP_MAIN_RED | LAMP_CAR_RED)]
+            end = cfg.time_tram_pre_green
+        else:
+            transitions, end = [(0, pack_lights(*LIGHTS_IDLE))], None
+        self.schedule = PhaseSchedule(transitions, end)
+
+    # --- Takt ---
+
+    def step(self, dt):
+        """
+        Automat um `dt` ms weiterschalten.
+
+        Returns:
+            tuple: Lampen (p_red, p_green, c_red, c_yellow, c_green)
+        """
+        cfg = self.config
+        self.now += dt
+        now = self.now
+        person_count = self.person_count
+
+        if person_count == 0:
+            self.cycle_was_zero = True
+
+        state = self.state
+        if state == STATE_IDLE:
+            if person_count > 0 and (self.cycle_was_zero or not cfg.retrigger_after_empty):
+                self._log(f"Person(en) erkannt ({person_count})! Starte Rotphase.")
+                self.cycle_was_zero = False
+                self._start_red()
+
+        elif state == STATE_TRAM:
+            # Ring leert sich bis zum Grün (Countdown)
+            self.timer_elapsed += dt
+            ratio = self.timer_elapsed / cfg.time_tram_pre_green
+            self.visual_active_leds = int(max(0.0, 1.0 - ratio) * cfg.visual_led_count)
+            if self.timer_elapsed >= cfg.time_tram_pre_green:
+                # Grün mit vollem Ring, Tram-Modus bleibt aktiv
+                self.state = STATE_GREEN
+                self.timer_elapsed = 0
+                self.green_leds_left_float = float(cfg.visual_led_count)
+                self.slow_mode_active = False
+                self._enter_phase()
+
+        elif state == STATE_RED:
+            self.timer_elapsed += dt * self._time_factor()
+            ratio = min(1.0, self.timer_elapsed / self.timer_total_duration_red)
+            self.visual_active_leds = int(ratio * cfg.visual_led_count)
+            if self.timer_elapsed >= self.timer_total_duration_red:
+                # Direkt zu GRÜN (Safety ist logisch Teil der Rot-Dauer)
+                self._start_green()
+
+        elif state == STATE_SAFETY_1:
+            self.timer_elapsed += dt
+            self.visual_active_leds = cfg.visual_led_count
+            if self.timer_elapsed >= cfg.time_safety_pre_green:
+                self._start_green()
+
+        elif state == STATE_GREEN:
+            self.green_leds_left_float -= dt / (self._seconds_per_led_green() * 1000)
+            self.visual_active_leds = max(0, min(cfg.visual_led_count, int(self.green_leds_left_float)))
+            if self.green_leds_left_float <= _TANK_EMPTY:
+                self.state = STATE_CLEARANCE
+                self.clearance_start_time = now
+                self.timer_elapsed = 0
+                self.visual_active_leds = cfg.visual_led_count  # Für Blinken voll machen
+                self._enter_phase()
+
+        elif state == STATE_CLEARANCE:
+            if now - self.clearance_start_time >= cfg.time_clearance:
+                self.state = STATE_IDLE
+                self.timer_elapsed = 0
+                self.person_count = 0
+                self.slow_mode_active = False
+                self.tram_active = False
+                self.pulsing = False
+                self.cycles += 1
+                self._enter_phase()
+                self._log("Zyklus beendet.")
+
+        self.lights = unpack_lights(self.schedule.advance(self._phase_clock()))
+        return self.lights
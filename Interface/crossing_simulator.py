@@ -0,0 +1,354 @@
+"""
+Ampel-Simulator (schneller als Echtzeit)
+========================================
+Die Demo kann den Ablauf nur mit gedrückter S-Taste verdoppeln. Dieser
+Simulator treibt den Zustandsautomaten (crossing_engine.py) ohne Fenster
+mit synthetischem Verkehr und spielt so Tage Betrieb in Sekunden durch:
+
+  - Fußgänger kommen als Poisson-Prozess, wahlweise mit Tagesprofil
+    (PROFILES: Faktor je Stunde); ein Teil drückt zusätzlich den Taster
+  - Trams kommen ebenfalls als Poisson-Prozess und lösen den Tram-Sensor aus
+  - Die Kamera "sieht" alle Wartenden (Personenzahl = Länge der Schlange)
+  - Statt synthetischer Ankünfte kann eine Aufzeichnung abgespielt werden
+    (JSON: {"pedestrians": [s, ...], "trams": [s, ...]}, Sekunden ab Start)
+
+Ausgewertet werden Wartezeit der Fußgänger (Mittel, p50, p95, max),
+Auslastung des Fußgänger-Grüns (Anteil der Grünzeit, in der jemand die
+Straße quert), Grün-Anteil der Autos und Anzahl der Zyklen.
+
+Alle Zufallszahlen hängen nur vom Seed ab – gleicher Seed, gleiches
+Ergebnis. Mehrere Seeds laufen parallel auf allen Kernen.
+
+Start:  python crossing_simulator.py --days 7 --profile weekday --seeds 16
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from crossing_engine import CrossingConfig, CrossingEngine, EVENT_START, EVENT_TRAM_SENSOR, STATE_GREEN, STATE_IDLE
+
+HOUR_MS = 3600 * 1000
+DAY_MS = 24 * HOUR_MS
+
+# Relative Fußgänger-Aufkommen je Stunde (0-23 Uhr); werden auf Mittelwert 1 normiert
+PROFILES = {
+    "flat": [1.0] * 24,
+    "weekday": [0.1, 0.05, 0.05, 0.05, 0.1, 0.3, 0.8, 1.8, 2.0, 1.2, 1.0, 1.1,
+                1.4, 1.3, 1.1, 1.3, 1.8, 2.0, 1.5, 1.0, 0.7, 0.5, 0.3, 0.2],
+    "weekend": [0.2, 0.15, 0.1, 0.05, 0.05, 0.1, 0.2, 0.4, 0.7, 1.0, 1.4, 1.6,
+                1.7, 1.7, 1.6, 1.6, 1.5, 1.4, 1.2, 1.0, 0.8, 0.6, 0.4, 0.3],
+}
+
+
+class Scenario:
+    """Verkehrsaufkommen und Auflösung eines Simulationslaufs."""
+
+    DEFAULTS = {
+        "days": 1.0,
+        "peds_per_hour": 60.0,      # Mittel über den Tag
+        "profile": "flat",          # Name aus PROFILES oder Liste mit 24 Faktoren
+        "trams_per_hour": 4.0,
+        "button_share": 0.3,        # Anteil der Fußgänger, die zusätzlich den Taster drücken
+        "crossing_time_s": 8.0,     # So lange belegt ein Fußgänger die Straße
+        "step_ms": 100,             # Takt der Simulation (Steuerung: 10 ms)
+        "start_hour": 0.0,
+        "pedestrian_times_s": None,  # Aufgezeichnete Ankünfte statt Poisson (siehe load_recording)
+        "tram_times_s": None,
+    }
+
+    def __init__(self, **values):
+        for key, value in self.DEFAULTS.items():
+            setattr(self, key, value)
+        for key, value in values.items():
+            if key not in self.DEFAULTS:
+                raise ValueError(f"Unbekannter Szenario-Wert: {key} (erlaubt: {', '.join(self.DEFAULTS)})")
+            setattr(self, key, value)
+        # Kennzahlen sind Anteile/Raten über die Dauer – ohne Dauer nichts zu simulieren
+        if self.duration_ms <= 0:
+            raise ValueError(f"Simulationsdauer muss > 0 sein (days={self.days!r})")
+
+    @property
+    def duration_ms(self):
+        return int(self.days * DAY_MS)
+
+    def hourly_rates(self, per_hour):
+        """Rate je Stunde (0-23 Uhr) bei mittlerer Rate `per_hour`."""
+        factors = PROFILES[self.profile] if isinstance(self.profile, str) else list(self.profile)
+        if len(factors) != 24:
+            raise ValueError("Tagesprofil braucht 24 Werte (eine pro Stunde).")
+        mean = sum(factors) / 24
+        return [per_hour * f / mean if mean else 0.0 for f in factors]
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.DEFAULTS}
+
+
+def load_recording(path):
+    """
+    Aufgezeichnete Ankünfte laden.
+
+    Returns:
+        dict: Szenario-Werte (pedestrian_times_s, tram_times_s, days)
+
+    Raises:
+        ValueError: Aufzeichnung ohne Dauer (keine Ankünfte nach 0 s und kein "days")
+    """
+    with open(path) as f:
+        data = json.load(f)
+    peds = sorted(float(t) for t in data.get("pedestrians", []))
+    trams = sorted(float(t) for t in data.get("trams", []))
+    last = max(peds[-1:] + trams[-1:] + [0.0])
+    days = float(data.get("days", 0)) or math.ceil(last / 3600) / 24
+    if days <= 0:
+        raise ValueError(f"Aufzeichnung {path} hat keine Dauer: keine Ankünfte nach 0 s und kein \"days\"")
+    return {"pedestrian_times_s": peds, "tram_times_s": trams, "days": days}
+
+
+def arrival_times(rng, scenario, per_hour):
+    """Ankunftszeiten (ms) eines Poisson-Prozesses mit Tagesprofil (Thinning)."""
+    rates = scenario.hourly_rates(per_hour)
+    max_rate = max(rates)
+    if max_rate <= 0:
+        return []
+    mean_gap_ms = HOUR_MS / max_rate
+    duration = scenario.duration_ms
+    times = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(1.0) * mean_gap_ms
+        if t >= duration:
+            return times
+        hour = int(scenario.start_hour + t / HOUR_MS) % 24
+        if rng.random() * max_rate < rates[hour]:
+            times.append(t)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(len(sorted_values) * p / 100.0) - 1))
+    return sorted_values[idx]
+
+
+def simulate(scenario, config=None, seed=0):
+    """
+    Einen Lauf simulieren.
+
+    Args:
+        scenario (Scenario): Verkehr und Dauer
+        config (CrossingConfig): Ampel-Zeiten (Standard: integrated_main)
+        seed (int): Startwert aller Zufallsströme
+
+    Returns:
+        dict: Kennzahlen des Laufs
+    """
+    started = time.perf_counter()
+    # Getrennte Ströme: mehr Trams ändern nicht die Fußgänger-Ankünfte
+    if scenario.pedestrian_times_s is not None:
+        peds = [t * 1000 for t in scenario.pedestrian_times_s]
+    else:
+        peds = arrival_times(random.Random(f"{seed}-peds"), scenario, scenario.peds_per_hour)
+    if scenario.tram_times_s is not None:
+        trams = [t * 1000 for t in scenario.tram_times_s]
+    else:
+        trams = arrival_times(random.Random(f"{seed}-trams"), scenario, scenario.trams_per_hour)
+    button_rng = random.Random(f"{seed}-buttons")
+    presses = [button_rng.random() < scenario.button_share for _ in peds]
+
+    engine = CrossingEngine(config)
+    step_ms = scenario.step_ms
+    crossing_ms = scenario.crossing_time_s * 1000
+    duration = scenario.duration_ms
+
+    waiting = deque()
+    waits = []
+    busy_until = 0.0               # Bis wann quert noch jemand
+    ped_green_ms = used_green_ms = car_green_ms = 0.0
+    green_phases = served_phases = tram_count = 0
+    pi = ti = 0
+    now = 0
+
+    while now < duration:
+        # --- Ankünfte bis jetzt ---
+        while pi < len(peds) and peds[pi] <= now:
+            if engine.state == STATE_GREEN:
+                # Grün: sofort losgehen
+                waits.append(0.0)
+                busy_until = max(busy_until, now + crossing_ms)
+            else:
+                waiting.append(peds[pi])
+                if presses[pi]:
+                    engine.handle(EVENT_START)
+            pi += 1
+        while ti < len(trams) and trams[ti] <= now:
+            engine.handle(EVENT_TRAM_SENSOR)
+            tram_count += 1
+            ti += 1
+        engine.set_person_count(len(waiting))
+
+        # --- Ruhe überspringen: ohne Wartende passiert bis zur nächsten Ankunft nichts ---
+        dt = step_ms
+        if engine.state == STATE_IDLE and not waiting:
+            next_event = min(peds[pi] if pi < len(peds) else duration,
+                             trams[ti] if ti < len(trams) else duration, duration)
+            dt = max(step_ms, math.ceil((next_event - now) / step_ms) * step_ms)
+
+        was_green = engine.state == STATE_GREEN
+        p_red, p_green, c_red, c_yellow, c_green = engine.step(dt)
+        if p_green:
+            ped_green_ms += dt
+            used_green_ms += min(dt, max(0.0, busy_until - now))
+        if c_green:
+            car_green_ms += dt
+        now += dt
+
+        # --- Grün beginnt: alle Wartenden gehen los ---
+        if engine.state == STATE_GREEN and not was_green:
+            green_phases += 1
+            if waiting:
+                served_phases += 1
+                busy_until = now + crossing_ms
+            for arrived in waiting:
+                waits.append(now - arrived)
+            waiting.clear()
+
+    runtime = time.perf_counter() - started
+    waits_s = sorted(w / 1000.0 for w in waits)
+    return {
+        "seed": seed,
+        "simulated_h": duration / HOUR_MS,
+        "pedestrians": len(peds),
+        "served": len(waits),
+        "still_waiting": len(waiting),
+        "wait_mean_s": sum(waits_s) / len(waits_s) if waits_s else 0.0,
+        "wait_p50_s": percentile(waits_s, 50),
+        "wait_p95_s": percentile(waits_s, 95),
+        "wait_max_s": waits_s[-1] if waits_s else 0.0,
+        "green_utilization": used_green_ms / ped_green_ms if ped_green_ms else 0.0,
+        "ped_green_share": ped_green_ms / duration,
+        "car_green_share": car_green_ms / duration,
+        "cycles": engine.cycles,
+        "green_phases": green_phases,
+        "empty_green_phases": green_phases - served_phases,
+        "trams": tram_count,
+        "runtime_s": runtime,
+        "speedup": duration / 1000.0 / runtime if runtime else 0.0,
+    }
+
+
+def _simulate_job(job):
+    scenario, config, seed = job
+    return simulate(scenario, config, seed)
+
+
+def sweep(scenario, seeds, config=None, processes=None):
+    """
+    Mehrere Seeds simulieren, parallel auf `processes` Prozessen (Standard: alle Kerne).
+
+    Returns:
+        list: Kennzahlen je Seed (in Reihenfolge von `seeds`)
+    """
+    jobs = [(scenario, config, seed) for seed in seeds]
+    if processes == 1 or len(jobs) == 1:
+        return [_simulate_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_simulate_job, jobs))
+
+
+def summarize(results):
+    """Mittelwert je Kennzahl über alle Seeds; Maxima für die Worst-Case-Werte."""
+    keys = [key for key in results[0] if key != "seed"]
+    summary = {key: sum(r[key] for r in results) / len(results) for key in keys}
+    summary["wait_p95_s_worst"] = max(r["wait_p95_s"] for r in results)
+    summary["wait_max_s"] = max(r["wait_max_s"] for r in results)
+    summary["seeds"] = len(results)
+    return summary
+
+
+def format_table(results, summary):
+    lines = [f"{'Seed':>6}{'Fußg.':>8}{'Ø Warten':>10}{'p95':>8}{'max':>8}{'Grün gen.':>11}"
+             f"{'Auto Grün':>11}{'Zyklen':>8}{'Tempo':>10}"]
+
+    def row(label, r):
+        return (f"{label:>6}{r['pedestrians']:>8.0f}{r['wait_mean_s']:>9.1f}s{r['wait_p95_s']:>7.1f}s"
+                f"{r['wait_max_s']:>7.1f}s{r['green_utilization'] * 100:>10.1f}%"
+                f"{r['car_green_share'] * 100:>10.1f}%{r['cycles']:>8.0f}{r['speedup']:>9.0f}x")
+    for r in results:
+        lines.append(row(r["seed"], r))
+    lines.append(row("Ø", summary))
+    return lines
+
+
+def parse_overrides(pairs):
+    """--set key=value (Zahlen werden als int/float gelesen)."""
+    values = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep:
+            raise ValueError(f"--set erwartet key=value, nicht '{pair}'")
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw
+        values[key.strip()] = value
+    return values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ampel-Simulator mit synthetischem Verkehr")
+    parser.add_argument("--days", type=float, default=Scenario.DEFAULTS["days"], help="Simulierte Tage pro Seed")
+    parser.add_argument("--peds-per-hour", type=float, default=Scenario.DEFAULTS["peds_per_hour"])
+    parser.add_argument("--profile", default=Scenario.DEFAULTS["profile"], choices=sorted(PROFILES),
+                        help="Tagesprofil der Ankünfte")
+    parser.add_argument("--trams-per-hour", type=float, default=Scenario.DEFAULTS["trams_per_hour"])
+    parser.add_argument("--button-share", type=float, default=Scenario.DEFAULTS["button_share"])
+    parser.add_argument("--recording", help="Aufgezeichnete Ankünfte (JSON) statt synthetischer")
+    parser.add_argument("--step-ms", type=int, default=Scenario.DEFAULTS["step_ms"])
+    parser.add_argument("--seeds", type=int, default=os.cpu_count() or 1, help="Anzahl Seeds (Standard: Kerne)")
+    parser.add_argument("--seed-base", type=int, default=0, help="Erster Seed")
+    parser.add_argument("--processes", type=int, default=None, help="Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="Ampel-Config überschreiben, z. B. --set time_clearance=8000")
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON schreiben")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = Scenario(days=args.days, peds_per_hour=args.peds_per_hour, profile=args.profile,
+                            trams_per_hour=args.trams_per_hour, button_share=args.button_share,
+                            step_ms=args.step_ms)
+        if args.recording:
+            scenario = Scenario(**dict(scenario.as_dict(), **load_recording(args.recording)))
+            args.days = scenario.days
+        config = CrossingConfig(**parse_overrides(args.set))
+        # Unsichere Zeiten sind hier erlaubt (Experimente), Nullen/Tippfehler nicht
+        errors = config.value_errors()
+        if errors:
+            raise ValueError("Ungültige Ampel-Werte: " + "; ".join(errors))
+    except ValueError as e:
+        parser.error(str(e))
+    seeds = list(range(args.seed_base, args.seed_base + args.seeds))
+
+    print(f"Simuliere {len(seeds)} x {args.days:g} Tage ({args.profile}, {args.peds_per_hour:g} Fußgänger/h, "
+          f"{args.trams_per_hour:g} Trams/h)...")
+    started = time.perf_counter()
+    results = sweep(scenario, seeds, config, args.processes)
+    summary = summarize(results)
+    print("\n".join(format_table(results, summary)))
+    print(f"{len(seeds) * args.days:g} simulierte Tage in {time.perf_counter() - started:.1f} s")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"scenario": scenario.as_dict(), "config": config.as_dict(),
+                       "results": results, "summary": summary}, f, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
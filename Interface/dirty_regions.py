@@ -0,0 +1,87 @@
+"""
+Dirty-Rectangle-Aktualisierung des Fensters
+===========================================
+Bisher wurde jedes Frame das ganze Fenster gefüllt, neu gezeichnet und per
+`pygame.display.flip()` übertragen – auf 4K-Kiosk-Displays mehr als 30 MB
+pro Frame, obwohl sich meist nur der LED-Ring oder ein Statuswert ändert.
+
+Jede Fläche (Kamerabild, Ampel-Panel, Status-Leiste, ...) meldet pro Frame
+eine "Signatur" – ein Tupel aller Werte, die ihr Aussehen bestimmen. Nur
+wenn sich die Signatur ändert, wird die Fläche neu gezeichnet und ihr
+Rechteck an `pygame.display.update(rects)` übergeben.
+
+Nach Größenänderung, Vollbild-Wechsel oder wenn das Fenster wieder
+sichtbar wird, erzwingt `invalidate()` ein komplettes Neuzeichnen mit
+`pygame.display.flip()`.
+
+Nutzung:
+    dirty = DirtyRegions()
+    if dirty.changed("ampel", signatur, rect):
+        ... Fläche neu zeichnen ...
+    dirty.present()
+"""
+
+import pygame
+
+
+class DirtyRegions:
+    """Merkt sich Signaturen pro Fläche und sammelt die geänderten Rechtecke eines Frames."""
+
+    def __init__(self, enabled=True):
+        """
+        Args:
+            enabled (bool): False = jedes Frame komplett neu zeichnen und flip() (alter Modus)
+        """
+        self.enabled = enabled
+        self._signatures = {}
+        self._rects = []
+        self._full = True
+        self.full_redraws = 0
+        self.partial_updates = 0
+        self.skipped_frames = 0
+
+    @property
+    def full(self):
+        """True, wenn in diesem Frame das ganze Fenster neu gezeichnet werden muss."""
+        return self._full or not self.enabled
+
+    def invalidate(self):
+        """Alles verwerfen: nächstes Frame zeichnet alle Flächen und macht flip()."""
+        self._signatures.clear()
+        self._full = True
+
+    def changed(self, name, signature, rect):
+        """
+        Prüft, ob sich Fläche `name` geändert hat, und merkt sich ggf. ihr Rechteck.
+        Gibt True zurück, wenn der Aufrufer die Fläche neu zeichnen muss.
+        """
+        if not self.full and self._signatures.get(name) == signature:
+            return False
+        self._signatures[name] = signature
+        self.mark(rect)
+        return True
+
+    def mark(self, rect):
+        """Rechteck unabhängig von Signaturen als geändert markieren (z. B. Overlays)."""
+        if not self.full:
+            self._rects.append(pygame.Rect(rect))
+
+    def present(self):
+        """Geänderte Bereiche auf den Bildschirm bringen."""
+        if self.full:
+            pygame.display.flip()
+            self.full_redraws += 1
+        elif self._rects:
+            pygame.display.update(self._rects)
+            self.partial_updates += 1
+        else:
+            self.skipped_frames += 1
+        self._rects = []
+        self._full = False
+
+    def get_stats(self):
+        return {
+            "full_redraws": self.full_redraws,
+            "partial_updates": self.partial_updates,
+            "skipped_frames": self.skipped_frames,
+        }
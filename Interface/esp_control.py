@@ -2,6 +2,12 @@ import serial
 import time
 import sys
 
+# Optional: Latenz-Messung (Span "leds")
+try:
+    from latency_stats import LATENCY
+except ImportError:
+    LATENCY = None
+
 
 class ESPController:
     def __init__(self, port="COM3", baudrate=115200):
@@ -42,9 +48,12 @@ class ESPController:
     def update_leds(self, main_red, main_green, car_red, car_yellow, car_green):
         """Sendet den Status aller 5 LEDs an den ESP."""
         # Konvertiere bool in int (0/1)
+        start = time.perf_counter()
         vals = [int(main_red), int(main_green), int(car_red), int(car_yellow), int(car_green)]
         cmd = f"L {' '.join(map(str, vals))}"
         self.send_command(cmd)
+        if LATENCY is not None:
+            LATENCY.record("leds", (time.perf_counter() - start) * 1000.0)
 
     def set_pulsing(self, active):
         """Sendet Befehl zum Pulsieren der LED (Button-Feedback)."""
@@ -0,0 +1,191 @@
+"""
+Latenz-Messung der Pipeline (Kamera -> Inferenz -> Annotation -> Render -> LEDs)
+================================================================================
+Jede Stufe meldet ihre Dauer als "Span". Die Werte landen in
+logarithmisch eingeteilten Histogrammen (HDR-Prinzip: konstante relative
+Genauigkeit von ~3 % von 10 µs bis 100 s), aus denen p50/p95/p99/max
+gelesen werden. Ein Eintrag kostet nur ein log(), einen Zähler-Inkrement
+und einen kurzen Lock – vernachlässigbar gegenüber den gemessenen Stufen.
+
+Angezeigt wird ein gleitendes Fenster (aktuelles + voriges Intervall),
+die Datei-Ausgabe beim Beenden enthält zusätzlich die Gesamtlaufzeit.
+
+Nutzung:
+    from latency_stats import LATENCY
+    with LATENCY.span("render"):
+        ...
+    LATENCY.record("inference", elapsed_ms)
+"""
+
+import json
+import math
+import os
+import threading
+import time
+
+MIN_MS = 0.01          # Kleinster unterschiedener Wert
+MAX_MS = 100000.0      # Größere Werte landen im letzten Bucket
+GROWTH = 1.03          # Bucket-Breite relativ (~3 % Genauigkeit)
+WINDOW_S = 30.0        # Länge eines Rolling-Intervalls
+
+_LOG_GROWTH = math.log(GROWTH)
+BUCKET_COUNT = int(math.log(MAX_MS / MIN_MS) / _LOG_GROWTH) + 2
+
+# Reihenfolge der Stufen in Overlay und Bericht
+PIPELINE_STAGES = ("capture", "inference", "smoothing", "annotate", "pipeline", "handoff", "render", "control", "leds")
+
+
+def _bucket(ms):
+    if ms <= MIN_MS:
+        return 0
+    return min(BUCKET_COUNT - 1, int(math.log(ms / MIN_MS) / _LOG_GROWTH) + 1)
+
+
+def _bucket_value(idx):
+    """Obere Grenze eines Buckets in ms (konservative Schätzung)."""
+    return MIN_MS * GROWTH ** idx
+
+
+class LatencyHistogram:
+    """Log-lineares Histogramm mit fester Bucket-Anzahl."""
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.counts[_bucket(ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for idx, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(_bucket_value(idx), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+        }
+
+
+class _Span:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class LatencyRecorder:
+    """Sammelt Spans aller Threads, je Stufe ein Rolling- und ein Gesamt-Histogramm."""
+
+    def __init__(self, window_s=WINDOW_S):
+        self.window_s = window_s
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._current = {}
+        self._previous = {}
+        self._lifetime = {}
+        self._window_start = time.monotonic()
+        self.started_at = time.time()
+
+    def span(self, name):
+        """Context-Manager, misst die Dauer des Blocks."""
+        return _Span(self, name)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_start >= self.window_s:
+                self._previous = self._current
+                self._current = {}
+                self._window_start = now
+            hist = self._current.get(name)
+            if hist is None:
+                hist = self._current[name] = LatencyHistogram()
+            hist.record(ms)
+            total = self._lifetime.get(name)
+            if total is None:
+                total = self._lifetime[name] = LatencyHistogram()
+            total.record(ms)
+
+    def _ordered(self, names):
+        known = [n for n in PIPELINE_STAGES if n in names]
+        return known + sorted(n for n in names if n not in PIPELINE_STAGES)
+
+    def rolling_summary(self):
+        """p50/p95/p99/max je Stufe über die letzten ein bis zwei Intervalle."""
+        with self._lock:
+            merged = {}
+            for source in (self._previous, self._current):
+                for name, hist in source.items():
+                    merged.setdefault(name, LatencyHistogram()).merge(hist)
+        return {name: merged[name].summary() for name in self._ordered(merged)}
+
+    def lifetime_summary(self):
+        with self._lock:
+            hists = dict(self._lifetime)
+            return {name: hists[name].summary() for name in self._ordered(hists)}
+
+    def format_lines(self):
+        """Textzeilen für ein Overlay (rolling)."""
+        lines = [f"{'Stufe':<10}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}"]
+        for name, s in self.rolling_summary().items():
+            lines.append(f"{name:<10}{s['p50_ms']:>8.1f}{s['p95_ms']:>8.1f}{s['p99_ms']:>8.1f}{s['max_ms']:>8.1f}")
+        return lines
+
+    def dump(self, path, extra=None):
+        """Schreibt Gesamt- und Rolling-Werte als JSON nach `path`."""
+        report = {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started_at)),
+            "duration_s": time.time() - self.started_at,
+            "unit": "ms",
+            "lifetime": self.lifetime_summary(),
+            "rolling": self.rolling_summary(),
+        }
+        if extra:
+            report.update(extra)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return path
+
+
+# Prozessweite Instanz – Kamera-Thread, UI-Loop und ESP-Ansteuerung melden hierhin
+LATENCY = LatencyRecorder()
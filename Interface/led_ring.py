@@ -0,0 +1,142 @@
+"""
+LED-Ring mit vorgerenderten Sprites
+===================================
+Der Fortschrittsring wurde pro Frame komplett neu gezeichnet: für jede
+leuchtende LED zwei neue SRCALPHA-Surfaces (Glow + Punkt) und für alle
+Positionen erneut cos/sin. Bei 25 LEDs und 60 FPS sind das bis zu 50
+Surface-Allokationen pro Frame.
+
+Hier werden Punkt-Sprites einmal pro (Punktgröße, Farbe, Alpha-Stufe)
+erzeugt und gecacht, die Positionen einmal pro LED-Anzahl berechnet.
+Gezeichnet wird der ganze Ring mit einem einzigen `Surface.blits`.
+Das "Atmen" der Räumzeit wird auf ALPHA_LEVELS Stufen quantisiert.
+
+Genutzt von integrated_main.py, Interface/main.py und Demo_Schaltungs_Logic.py.
+"""
+
+import math
+
+import pygame
+
+ALPHA_LEVELS = 16
+SUPERSAMPLE = 4  # Kantenglättung der Sprites: groß zeichnen, dann herunterskalieren
+
+COLOR_LED_ON = (255, 255, 255)
+COLOR_LED_OFF = (40, 40, 40)
+COLOR_CLEARANCE = (255, 50, 50)
+
+
+def lit_flags(state, active_leds, total_leds):
+    """Welche LEDs leuchten – gleiche Regeln wie bisher in draw_led_ring()."""
+    if state in ("GREEN", "TRAM"):
+        # Weiß leert sich im Uhrzeigersinn (Index 0 zuletzt)
+        leds_gone = total_leds - active_leds
+        return [(i - 1) % total_leds >= leds_gone for i in range(total_leds)]
+    if state == "RED":
+        # Weiß füllt sich auf
+        return [i < active_leds for i in range(total_leds)]
+    if state in ("CLEARANCE", "SAFETY_1"):
+        return [True] * total_leds
+    return [False] * total_leds
+
+
+def _disc_sprite(size, discs):
+    """SRCALPHA-Sprite mit geglätteten Kreisen: discs = [(radius, (r, g, b, a)), ...] um die Mitte."""
+    big = pygame.Surface((size * SUPERSAMPLE, size * SUPERSAMPLE), pygame.SRCALPHA)
+    # Transparenter Rand in Punktfarbe, sonst dunkelt das Herunterskalieren die Kante ab
+    big.fill((*discs[0][1][:3], 0))
+    center = size * SUPERSAMPLE // 2
+    for radius, rgba in discs:
+        pygame.draw.circle(big, rgba, (center, center), (radius + 0.5) * SUPERSAMPLE)
+    return pygame.transform.smoothscale(big, (size, size))
+
+
+def quantize_alpha(alpha):
+    """Alpha (0-255) auf eine der ALPHA_LEVELS Stufen runden."""
+    step = 255 / (ALPHA_LEVELS - 1)
+    return int(round(round(max(0, min(255, alpha)) / step) * step))
+
+
+class LedRing:
+    """Zeichnet den LED-Ring aus gecachten Sprites."""
+
+    def __init__(self, led_radius, dot_size_base, glow=False,
+                 color_on=COLOR_LED_ON, color_off=COLOR_LED_OFF, color_clearance=COLOR_CLEARANCE):
+        """
+        Args:
+            led_radius (int): Radius des Rings in Pixeln
+            dot_size_base (int): Radius eines Punktes bei bis zu 60 LEDs
+            glow (bool): Dezenten Glow hinter leuchtenden Punkten zeichnen (integrated_main)
+        """
+        self.led_radius = led_radius
+        self.dot_size_base = dot_size_base
+        self.glow = glow
+        self.color_on = color_on
+        self.color_off = color_off
+        self.color_clearance = color_clearance
+        self._sprites = {}
+        self._offsets = {}
+
+    def dot_size(self, total_leds):
+        if total_leds > 60:
+            return max(2, int(self.dot_size_base * (60 / total_leds)))
+        return self.dot_size_base
+
+    def positions(self, total_leds, center_x, center_y):
+        """Pixelpositionen aller LEDs (12 Uhr = Index 0, im Uhrzeigersinn)."""
+        key = (total_leds, center_x, center_y)
+        table = self._offsets.get(key)
+        if table is None:
+            table = []
+            for i in range(total_leds):
+                angle = math.radians(-90 + (360 / total_leds) * i)
+                table.append((int(center_x + self.led_radius * math.cos(angle)),
+                              int(center_y + self.led_radius * math.sin(angle))))
+            self._offsets[key] = table
+        return table
+
+    def _sprite(self, dot_size, color, alpha, glow):
+        """Sprite eines Punktes samt Zeichen-Offset (Mittelpunkt -> linke obere Ecke)."""
+        key = (dot_size, color, alpha, glow)
+        cached = self._sprites.get(key)
+        if cached is not None:
+            return cached
+
+        radius = dot_size + 2 if glow else dot_size
+        # Ungerade Kantenlänge, damit der Punkt genau auf dem Pixel der LED-Position sitzt
+        size = radius * 2 + 5
+        discs = [(dot_size, (*color, alpha))]
+        if glow:
+            # Dezenter Glow-Effekt hinter dem Punkt
+            discs.insert(0, (radius, (*color, max(10, alpha // 8))))
+        sprite = _disc_sprite(size, discs)
+        center = size // 2
+
+        cached = (sprite, center)
+        self._sprites[key] = cached
+        return cached
+
+    def draw(self, surface, center_x, center_y, active_leds, total_leds, state, breathing_alpha=255,
+             draw_off=True):
+        """
+        Zeichnet den Ring um (center_x, center_y) auf `surface`.
+        draw_off=False zeichnet nur die leuchtenden LEDs – für Aufrufer, deren
+        Hintergrund den unbeleuchteten Ring bereits enthält.
+        """
+        dot_size = self.dot_size(total_leds)
+        if state == "CLEARANCE":
+            lit_sprite, lit_center = self._sprite(dot_size, self.color_clearance,
+                                                  quantize_alpha(breathing_alpha), self.glow)
+        else:
+            lit_sprite, lit_center = self._sprite(dot_size, self.color_on, 255, self.glow)
+        # Inaktive Dots – dezent ohne Glow
+        off_sprite, off_center = self._sprite(dot_size, self.color_off, 255, False)
+
+        blits = []
+        for (x, y), lit in zip(self.positions(total_leds, center_x, center_y),
+                               lit_flags(state, active_leds, total_leds)):
+            if lit:
+                blits.append((lit_sprite, (x - lit_center, y - lit_center)))
+            elif draw_off:
+                blits.append((off_sprite, (x - off_center, y - off_center)))
+        surface.blits(blits, doreturn=False)
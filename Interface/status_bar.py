@@ -0,0 +1,170 @@
+"""
+Status-Leiste des integrierten Fensters
+=======================================
+Bisher wurden pro Frame zwei Fonts per `pygame.font.SysFont` gesucht
+(Systemfont-Lookup!) und jedes Label, jeder Wert und die unveränderliche
+Tastenkürzel-Zeile neu gerendert.
+
+Die Leiste hier lädt ihre Fonts einmal, cacht gerenderte Texte nach
+(Text, Farbe, fett) und hält ein eigenes Surface in Fensterbreite. Pro
+Frame werden nur die Segmente neu gezeichnet, deren Inhalt oder Position
+sich geändert hat; `update()` liefert genau diese Rechtecke zurück, damit
+der Aufrufer sie per Dirty-Rect überträgt (siehe dirty_regions.py).
+"""
+
+import pygame
+
+BAR_HEIGHT = 36
+FONT_NAME = "Helvetica"
+FONT_SIZE = 13
+MAX_CACHED_TEXTS = 256   # Messwerte ändern sich ständig – Cache dann einfach leeren
+
+COLOR_WINDOW_BG = (12, 12, 14)
+COLOR_BAR_BG = (18, 18, 22, 240)
+COLOR_TOP_LINE = (40, 40, 48)
+COLOR_SEPARATOR = (50, 50, 55)
+COLOR_LABEL = (90, 90, 100)
+COLOR_KEYS = (60, 60, 68)
+
+KEY_HINTS = "[F] Vollbild   [K] Kamera   [L] Latenz   [G] Start   [T] Tram   [SPACE] Slow   [ESC] Beenden"
+
+TEXT_Y = 10
+DOT_X = 16
+
+
+class StatusBar:
+    """Status-Punkt, Zustand, Info-Segmente (Label + Wert) und Tastenkürzel."""
+
+    def __init__(self, height=BAR_HEIGHT, key_hints=KEY_HINTS):
+        self.height = height
+        self.font = pygame.font.SysFont(FONT_NAME, FONT_SIZE)
+        self.font_bold = pygame.font.SysFont(FONT_NAME, FONT_SIZE, bold=True)
+        self._texts = {}
+        self._glows = {}
+        self._keys_surf = self.font.render(key_hints, True, COLOR_KEYS)
+        self.surface = None
+        self._background = None
+        self._items = []   # [(Inhalt, Rechteck)] des zuletzt gezeichneten Stands
+
+    def text(self, text, color, bold=False):
+        """Gerenderten Text aus dem Cache holen (oder einmal rendern)."""
+        key = (text, color, bold)
+        surf = self._texts.get(key)
+        if surf is None:
+            if len(self._texts) >= MAX_CACHED_TEXTS:
+                self._texts.clear()
+            surf = (self.font_bold if bold else self.font).render(text, True, color)
+            self._texts[key] = surf
+        return surf
+
+    def _glow(self, color):
+        glow = self._glows.get(color)
+        if glow is None:
+            glow = pygame.Surface((18, 18), pygame.SRCALPHA)
+            pygame.draw.circle(glow, (*color, 30), (9, 9), 9)
+            self._glows[color] = glow
+        return glow
+
+    def _resize(self, width):
+        """Hintergrund (halbtransparente Leiste über Fensterfarbe + obere Linie) einmal vorberechnen."""
+        self._background = pygame.Surface((width, self.height))
+        self._background.fill(COLOR_WINDOW_BG)
+        bar = pygame.Surface((width, self.height), pygame.SRCALPHA)
+        bar.fill(COLOR_BAR_BG)
+        self._background.blit(bar, (0, 0))
+        pygame.draw.line(self._background, COLOR_TOP_LINE, (0, 0), (width, 0), 1)
+        self.surface = self._background.copy()
+        self._items = []
+
+    def _layout(self, state_text, state_color, segments):
+        """Inhalt und Rechteck jedes Elements berechnen (ohne zu zeichnen)."""
+        items = []
+        state_w = self.text(state_text, state_color, bold=True).get_width()
+        items.append((("state", state_text, state_color),
+                      pygame.Rect(0, 1, DOT_X + 12 + state_w, self.height - 1)))
+        x = DOT_X + 12 + state_w + 20
+        for label_text, value_text, val_color in segments:
+            w = 12 + self.text(value_text, val_color, bold=True).get_width()
+            if label_text:
+                w += self.text(f"{label_text} ", COLOR_LABEL).get_width()
+            items.append((("segment", label_text, value_text, val_color), pygame.Rect(x, 1, w, self.height - 1)))
+            x += w + 16
+        return items
+
+    def _draw_item(self, content, rect):
+        surface = self.surface
+        if content[0] == "state":
+            _, state_text, state_color = content
+            dot_y = self.height // 2
+            pygame.draw.circle(surface, state_color, (DOT_X, dot_y), 5)
+            # Mini-Glow
+            surface.blit(self._glow(state_color), (DOT_X - 9, dot_y - 9))
+            surface.blit(self.text(state_text, state_color, bold=True), (DOT_X + 12, TEXT_Y))
+            return
+        _, label_text, value_text, val_color = content
+        x = rect.x
+        # Trennstrich
+        pygame.draw.line(surface, COLOR_SEPARATOR, (x, 8), (x, self.height - 8), 1)
+        x += 12
+        if label_text:
+            lbl = self.text(f"{label_text} ", COLOR_LABEL)
+            surface.blit(lbl, (x, TEXT_Y))
+            x += lbl.get_width()
+        surface.blit(self.text(value_text, val_color, bold=True), (x, TEXT_Y))
+
+    def update(self, width, state_text, state_color, segments):
+        """
+        Leiste auf den neuen Stand bringen.
+
+        Args:
+            width (int): Fensterbreite
+            state_text (str): Zustand (links neben dem Status-Punkt)
+            state_color (tuple): Farbe von Punkt und Zustand
+            segments (list): [(Label, Wert, Wertfarbe), ...], Label darf leer sein
+
+        Returns:
+            list: Geänderte Rechtecke in Leisten-Koordinaten (leer = nichts zu tun)
+        """
+        full = self.surface is None or self.surface.get_width() != width
+        if full:
+            self._resize(width)
+
+        items = self._layout(state_text, state_color, segments)
+        old_items = self._items
+        changed = []
+        dirty = []
+        for i, (content, rect) in enumerate(items):
+            old = old_items[i] if i < len(old_items) else None
+            if old != (content, rect):
+                changed.append((content, rect))
+                dirty.append(rect)
+                if old is not None:
+                    dirty.append(old[1])
+        # Weggefallene Segmente am Ende
+        dirty.extend(rect for _, rect in old_items[len(items):])
+        self._items = items
+
+        if full:
+            dirty = [self.surface.get_rect()]
+        if not dirty:
+            return []
+
+        # Rechte Seite: Tastenkürzel liegen über den Segmenten (schmale Fenster) –
+        # wird ihr Bereich berührt, werden sie und alle Segmente darunter neu gezeichnet
+        keys_rect = self._keys_surf.get_rect(topleft=(width - self._keys_surf.get_width() - 12, TEXT_Y))
+        redraw_keys = keys_rect.collidelist(dirty) != -1
+        if redraw_keys:
+            dirty.append(keys_rect)
+            for content, rect in items:
+                if rect.colliderect(keys_rect) and (content, rect) not in changed:
+                    changed.append((content, rect))
+                    dirty.append(rect)
+
+        # Erst alle betroffenen Flächen auf den Hintergrund zurücksetzen, dann neu zeichnen
+        for rect in dirty:
+            self.surface.blit(self._background, rect, rect)
+        for content, rect in changed:
+            self._draw_item(content, rect)
+        if redraw_keys:
+            self.surface.blit(self._keys_surf, keys_rect)
+        return dirty
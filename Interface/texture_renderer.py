@@ -0,0 +1,172 @@
+"""
+Textur-Backend (pygame._sdl2.video) für das integrierte Fenster
+===============================================================
+Statt alles per Software-Blit in das Fenster-Surface zu kopieren, werden
+die fertigen Flächen (Kamerabild, Ampel, Status-Leiste, Overlays) als
+SDL-Texturen gehalten. Eine Textur wird nur neu befüllt, wenn sich ihr
+Inhalt ändert – das Kamerabild direkt aus dem RGB-Puffer des Detektors,
+ohne Umweg über ein Zwischen-Surface. Zusammensetzen und Skalieren
+übernimmt der SDL-Renderer.
+
+Es wird zuerst ein beschleunigter Renderer versucht, sonst der
+Software-Renderer von SDL. Fehlt pygame._sdl2 ganz, liefert `create()`
+None und der Aufrufer bleibt beim bisherigen Software-Pfad.
+
+Pro Frame werden nur Zeichenbefehle gesammelt (`begin`, `fill_rect`,
+`draw_line`, `draw`); sind sie identisch zum vorigen Frame und wurde
+keine Textur neu befüllt, entfällt das Rendern komplett.
+
+Hinweis: Ein Fenster mit Renderer hat kein `pygame.display`-Surface –
+`pygame.display.set_mode/flip` dürfen dann nicht benutzt werden.
+"""
+
+import os
+
+import pygame
+
+try:
+    from pygame._sdl2.video import Renderer, Texture, Window
+    SDL2_VIDEO_AVAILABLE = True
+except ImportError:
+    SDL2_VIDEO_AVAILABLE = False
+
+BLEND_MODE_BLEND = 1  # SDL_BLENDMODE_BLEND
+
+
+class TextureRenderer:
+    """Fenster + SDL-Renderer mit benannten Streaming-Texturen."""
+
+    def __init__(self, window, renderer, accelerated):
+        self.window = window
+        self.renderer = renderer
+        self.accelerated = accelerated
+        self.fullscreen = False
+        self._textures = {}
+        self._ops = []
+        self._last_ops = None
+        self._changed = True     # Seit dem letzten present() neue Texturinhalte?
+        self._invalid = True
+        self.uploads = 0
+        self.presented_frames = 0
+        self.skipped_frames = 0
+
+    @classmethod
+    def create(cls, title, size, log=print):
+        """Fenster und Renderer anlegen; None, wenn kein Renderer verfügbar ist."""
+        if not SDL2_VIDEO_AVAILABLE:
+            log("pygame._sdl2.video nicht verfügbar – Software-Rendering.")
+            return None
+        # Skalieren mit bilinearer Filterung (Kamerabild beim Fenster-Resize)
+        os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "linear")
+        window = Window(title, size=size, resizable=True)
+        for accelerated in (1, 0):
+            try:
+                renderer = Renderer(window, accelerated=accelerated)
+            except Exception as e:  # pygame._sdl2.sdl2.error ist keine Unterklasse von pygame.error
+                log(f"SDL-Renderer ({'beschleunigt' if accelerated else 'Software'}) nicht verfügbar: {e}")
+                continue
+            log(f"Textur-Backend aktiv ({'beschleunigt' if accelerated else 'Software-Renderer'}).")
+            return cls(window, renderer, bool(accelerated))
+        window.destroy()
+        return None
+
+    @property
+    def size(self):
+        return self.window.size
+
+    def set_fullscreen(self, fullscreen, windowed_size=None):
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            if windowed_size:
+                self.window.size = windowed_size
+        self.fullscreen = fullscreen
+
+    def upload(self, name, surface, areas=None):
+        """
+        Surface in die Textur `name` laden.
+
+        Args:
+            areas: None = ganzes Surface; Liste von Rects = nur diese Bereiche;
+                   leere Liste = nur wenn die Textur fehlt oder die Größe nicht passt
+        """
+        size = surface.get_size()
+        texture = self._textures.get(name)
+        if texture is None or (texture.width, texture.height) != size:
+            texture = Texture(self.renderer, size, streaming=True)
+            if surface.get_flags() & pygame.SRCALPHA:
+                texture.blend_mode = BLEND_MODE_BLEND
+            self._textures[name] = texture
+            areas = None
+        if areas is None:
+            texture.update(surface)
+            self.uploads += 1
+            self._changed = True
+            return
+        for rect in areas:
+            rect = pygame.Rect(rect).clip(surface.get_rect())
+            if rect.w and rect.h:
+                texture.update(surface.subsurface(rect), rect)
+                self.uploads += 1
+                self._changed = True
+
+    def invalidate(self):
+        """Nächstes present() zeichnet auf jeden Fall (z. B. nach Freilegen des Fensters)."""
+        self._invalid = True
+
+    def begin(self, color):
+        """Neues Frame beginnen: Hintergrundfarbe; danach fill_rect/draw_line/draw in Zeichenreihenfolge."""
+        self._ops = [("clear", tuple(color))]
+
+    def fill_rect(self, color, rect):
+        self._ops.append(("fill", tuple(color), tuple(rect)))
+
+    def draw_line(self, color, p1, p2):
+        self._ops.append(("line", tuple(color), tuple(p1), tuple(p2)))
+
+    def draw(self, name, dstrect):
+        """Textur in `dstrect` (x, y, w, h) zeichnen; der Renderer skaliert bei Bedarf."""
+        self._ops.append(("texture", name, tuple(dstrect)))
+
+    def present(self):
+        """
+        Frame ausgeben. Gleicht es dem vorigen (gleiche Zeichenbefehle, keine
+        neuen Texturinhalte), wird gar nichts gerendert – das Fenster zeigt
+        weiterhin das letzte Bild.
+        """
+        ops = self._ops
+        if not self._changed and not self._invalid and ops == self._last_ops:
+            self.skipped_frames += 1
+            return
+        renderer = self.renderer
+        for op in ops:
+            kind = op[0]
+            if kind == "texture":
+                texture = self._textures.get(op[1])
+                if texture is not None:
+                    texture.draw(dstrect=op[2])
+                continue
+            renderer.draw_color = (*op[1], 255)
+            if kind == "clear":
+                renderer.clear()
+            elif kind == "fill":
+                renderer.fill_rect(op[2])
+            elif kind == "line":
+                renderer.draw_line(op[2], op[3])
+        renderer.present()
+        self.presented_frames += 1
+        self._last_ops = ops
+        self._changed = False
+        self._invalid = False
+
+    def get_stats(self):
+        return {
+            "uploads": self.uploads,
+            "presented_frames": self.presented_frames,
+            "skipped_frames": self.skipped_frames,
+        }
+
+    def destroy(self):
+        self._textures.clear()
+        self.window.destroy()
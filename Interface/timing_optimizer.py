@@ -0,0 +1,253 @@
+"""
+Timing-Optimierer für die Ampel-Zeiten
+======================================
+Die Zeiten oben in integrated_main.py (SECONDS_PER_LED_RED/GREEN,
+CROWD_BONUS_FACTOR, ADD_LEDS_PER_PERSON, TIME_CLEARANCE, Tram-Zeiten)
+sind von Hand eingestellt. Dieses Skript sucht im Raster SEARCH_SPACE
+nach besseren Werten und bewertet jeden Kandidaten mit dem Simulator
+(crossing_simulator.py) über mehrere Seeds – alle Läufe verteilt auf
+einen Prozess-Pool.
+
+Ablauf:
+  1. Ausgangswerte + zufällige Stichprobe aus dem Raster
+  2. Verfeinern: Nachbarn (eine Rasterstufe) des bisher Besten, bis sich
+     nichts mehr verbessert oder die Runden aufgebraucht sind
+  Kandidaten, die SAFETY_MINIMUMS (crossing_engine.py) verletzen, werden
+  gar nicht erst simuliert.
+
+Ziel (kleiner ist besser), verlorene Personen-Sekunden pro Stunde:
+  - Fußgänger: Summe der Wartezeiten
+  - Autos: gleichmäßige Ankunft, Verzögerung je Rotphase q * R² / 2
+    (q = Autos/s, R = mittlere Rotdauer), mal Personen pro Auto
+  - Strafaufschlag, wenn das p95 der Fußgänger-Wartezeit MAX_WAIT_P95_S übersteigt
+
+Das Ergebnis landet als Timing-Datei (Standard: crossing_timing.json im
+Projektordner), die integrated_main.py beim Start lädt.
+
+Start:  python timing_optimizer.py --days 2 --seeds 8 --profile weekday
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from crossing_engine import CrossingConfig, save_timing_file
+from crossing_simulator import PROFILES, Scenario, load_recording, simulate
+
+# --- KONFIGURATION ---
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "crossing_timing.json")
+
+# Raster je Parameter (die Ausgangswerte aus integrated_main.py müssen enthalten sein,
+# nur Werte aus TIMING_FILE_KEYS in crossing_engine.py – andere nimmt die Timing-Datei nicht an)
+SEARCH_SPACE = {
+    "seconds_per_led_red": [0.2, 0.25, 0.3, 0.35, 0.4, 0.5, 0.6],
+    "seconds_per_led_green": [0.4, 0.5, 0.58, 0.66, 0.75, 0.85],
+    "crowd_bonus_factor": [0.0, 0.1, 0.2, 0.3, 0.4, 0.5],
+    "add_leds_per_person": [0, 1, 2, 3],
+    "time_clearance": [5000, 6000, 7000, 8000],
+    "time_tram_pre_green": [5000, 6000, 7000],
+    "time_tram_green_duration": [15000, 20000, 25000, 30000],
+}
+
+CARS_PER_HOUR = 600
+PERSONS_PER_CAR = 1.3
+MAX_WAIT_P95_S = 45.0
+P95_PENALTY = 100.0     # Personen-Sekunden pro Stunde je Sekunde über MAX_WAIT_P95_S
+
+
+class Objective:
+    """Gewichtung Fußgänger-Wartezeit gegen Auto-Durchsatz."""
+
+    def __init__(self, cars_per_hour=CARS_PER_HOUR, persons_per_car=PERSONS_PER_CAR,
+                 max_wait_p95_s=MAX_WAIT_P95_S, p95_penalty=P95_PENALTY):
+        self.cars_per_hour = cars_per_hour
+        self.persons_per_car = persons_per_car
+        self.max_wait_p95_s = max_wait_p95_s
+        self.p95_penalty = p95_penalty
+
+    def cost(self, metrics):
+        """Verlorene Personen-Sekunden pro Stunde (inkl. Strafaufschlag)."""
+        hours = metrics["simulated_h"]
+        pedestrian = metrics["wait_mean_s"] * metrics["served"] / hours
+        red_s_per_h = (1.0 - metrics["car_green_share"]) * 3600
+        cycles_per_h = metrics["cycles"] / hours
+        car = 0.0
+        if cycles_per_h:
+            mean_red_s = red_s_per_h / cycles_per_h
+            car = cycles_per_h * (self.cars_per_hour / 3600) * mean_red_s ** 2 / 2 * self.persons_per_car
+        penalty = max(0.0, metrics["wait_p95_s"] - self.max_wait_p95_s) * self.p95_penalty
+        return pedestrian + car + penalty
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _simulate_job(job):
+    scenario, values, seed = job
+    return simulate(scenario, CrossingConfig(**values), seed)
+
+
+def _key(values):
+    return tuple(sorted(values.items()))
+
+
+def baseline_values():
+    """Ausgangswerte (integrated_main.py) der gesuchten Parameter."""
+    defaults = CrossingConfig()
+    return {key: getattr(defaults, key) for key in SEARCH_SPACE}
+
+
+def is_safe(values):
+    config = CrossingConfig(**values)
+    return not config.value_errors() and not config.safety_violations()
+
+
+def sample(rng, count, seen):
+    """Bis zu `count` neue, sichere Zufallskandidaten aus dem Raster."""
+    candidates = []
+    for _ in range(count * 20):
+        if len(candidates) >= count:
+            break
+        values = {key: rng.choice(options) for key, options in SEARCH_SPACE.items()}
+        if _key(values) not in seen and is_safe(values):
+            seen.add(_key(values))
+            candidates.append(values)
+    return candidates
+
+
+def neighbors(values, seen):
+    """Neue, sichere Kandidaten eine Rasterstufe neben `values`."""
+    candidates = []
+    for key, options in SEARCH_SPACE.items():
+        idx = options.index(values[key])
+        for j in (idx - 1, idx + 1):
+            if 0 <= j < len(options):
+                candidate = dict(values, **{key: options[j]})
+                if _key(candidate) not in seen and is_safe(candidate):
+                    seen.add(_key(candidate))
+                    candidates.append(candidate)
+    return candidates
+
+
+class Optimizer:
+    """Raster-Suche über CrossingConfig-Werte, Bewertung per Simulator im Prozess-Pool."""
+
+    def __init__(self, scenario, seeds, objective=None, processes=None, log=print):
+        self.scenario = scenario
+        self.seeds = list(seeds)
+        self.objective = objective or Objective()
+        self.processes = processes
+        self.log = log
+        self.results = []   # (Kosten, Werte, gemittelte Kennzahlen) aller Kandidaten
+
+    def evaluate(self, pool, candidates):
+        """Alle Kandidaten x Seeds auf einmal verteilen, je Kandidat mitteln."""
+        jobs = [(self.scenario, values, seed) for values in candidates for seed in self.seeds]
+        chunksize = max(1, len(jobs) // (4 * (self.processes or os.cpu_count() or 1)))
+        metrics = list(pool.map(_simulate_job, jobs, chunksize=chunksize))
+        n = len(self.seeds)
+        evaluated = []
+        for i, values in enumerate(candidates):
+            runs = metrics[i * n:(i + 1) * n]
+            cost = sum(self.objective.cost(m) for m in runs) / n
+            mean = {key: sum(m[key] for m in runs) / n for key in runs[0] if key != "seed"}
+            evaluated.append((cost, values, mean))
+        self.results.extend(evaluated)
+        return evaluated
+
+    def run(self, samples=32, rounds=3, rng_seed=0):
+        """
+        Returns:
+            tuple: (bester Eintrag, Eintrag der Ausgangswerte) als (Kosten, Werte, Kennzahlen)
+        """
+        rng = random.Random(rng_seed)
+        base = baseline_values()
+        seen = {_key(base)}
+        with ProcessPoolExecutor(max_workers=self.processes) as pool:
+            started = time.perf_counter()
+            evaluated = self.evaluate(pool, [base] + sample(rng, samples, seen))
+            baseline = evaluated[0]
+            best = min(evaluated, key=lambda entry: entry[0])
+            self.log(f"Stichprobe: {len(evaluated)} Kandidaten, bestes Ziel {best[0]:.0f} "
+                     f"(Ausgang {baseline[0]:.0f}) – {time.perf_counter() - started:.1f} s")
+            for round_no in range(1, rounds + 1):
+                candidates = neighbors(best[1], seen)
+                if not candidates:
+                    break
+                evaluated = self.evaluate(pool, candidates)
+                round_best = min(evaluated, key=lambda entry: entry[0])
+                self.log(f"Runde {round_no}: {len(candidates)} Nachbarn, bestes Ziel {round_best[0]:.0f}")
+                if round_best[0] >= best[0]:
+                    break
+                best = round_best
+        return best, baseline
+
+
+def format_entry(label, entry):
+    cost, values, m = entry
+    return (f"{label:<10}{cost:>9.0f}{m['wait_mean_s']:>9.1f}s{m['wait_p95_s']:>7.1f}s"
+            f"{m['car_green_share'] * 100:>9.1f}%{m['cycles'] / m['simulated_h']:>9.1f}  "
+            + " ".join(f"{key}={value}" for key, value in values.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ampel-Zeiten per Simulation optimieren")
+    parser.add_argument("--days", type=float, default=1.0, help="Simulierte Tage pro Seed und Kandidat")
+    parser.add_argument("--seeds", type=int, default=4, help="Seeds pro Kandidat")
+    parser.add_argument("--profile", default="weekday", choices=sorted(PROFILES), help="Tagesprofil der Ankünfte")
+    parser.add_argument("--peds-per-hour", type=float, default=Scenario.DEFAULTS["peds_per_hour"])
+    parser.add_argument("--trams-per-hour", type=float, default=Scenario.DEFAULTS["trams_per_hour"])
+    parser.add_argument("--recording", help="Aufgezeichnete Ankünfte (JSON, siehe crossing_simulator.py)")
+    parser.add_argument("--cars-per-hour", type=float, default=CARS_PER_HOUR)
+    parser.add_argument("--persons-per-car", type=float, default=PERSONS_PER_CAR)
+    parser.add_argument("--max-wait-p95", type=float, default=MAX_WAIT_P95_S,
+                        help="Fußgänger-Wartezeit (p95, s), ab der ein Strafaufschlag gilt")
+    parser.add_argument("--samples", type=int, default=32, help="Zufallskandidaten in der ersten Runde")
+    parser.add_argument("--rounds", type=int, default=3, help="Max. Verfeinerungs-Runden")
+    parser.add_argument("--search-seed", type=int, default=0, help="Seed der Kandidaten-Auswahl")
+    parser.add_argument("--processes", type=int, default=None, help="Prozesse (Standard: alle Kerne)")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Timing-Datei (Standard: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        scenario = Scenario(days=args.days, profile=args.profile, peds_per_hour=args.peds_per_hour,
+                            trams_per_hour=args.trams_per_hour)
+        if args.recording:
+            scenario = Scenario(**dict(scenario.as_dict(), **load_recording(args.recording)))
+    except ValueError as e:
+        parser.error(str(e))
+    objective = Objective(args.cars_per_hour, args.persons_per_car, args.max_wait_p95)
+    optimizer = Optimizer(scenario, range(args.seeds), objective, args.processes)
+
+    print(f"Optimiere {len(SEARCH_SPACE)} Parameter: {args.seeds} Seeds x {scenario.days:g} Tage "
+          f"({args.recording or args.profile}), {args.processes or os.cpu_count()} Prozesse")
+    started = time.perf_counter()
+    best, baseline = optimizer.run(args.samples, args.rounds, args.search_seed)
+
+    print(f"\n{'':<10}{'Ziel':>9}{'Ø Warten':>10}{'p95':>8}{'Auto Grün':>10}{'Zyklen/h':>9}")
+    for i, entry in enumerate(sorted(optimizer.results, key=lambda entry: entry[0])[:5]):
+        print(format_entry(f"#{i + 1}", entry))
+    print(format_entry("Ausgang", baseline))
+    print(f"{len(optimizer.results)} Kandidaten in {time.perf_counter() - started:.1f} s")
+
+    if best[0] >= baseline[0]:
+        print("Keine Verbesserung gegenüber den Ausgangswerten – keine Timing-Datei geschrieben.")
+        return True
+    meta_scenario = {key: value for key, value in scenario.as_dict().items() if not key.endswith("_times_s")}
+    save_timing_file(args.output, best[1],
+                     generated=time.strftime("%Y-%m-%d %H:%M:%S"),
+                     recording=args.recording,
+                     scenario=meta_scenario,
+                     seeds=args.seeds,
+                     objective=objective.as_dict(),
+                     cost={"best": best[0], "baseline": baseline[0]},
+                     metrics={"best": best[2], "baseline": baseline[2]})
+    print(f"Timing-Datei geschrieben: {args.output}")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,3 +1,100 @@
+"""
+Zeitbasierte Lampen-Logik (Fußgänger- und Autoampel)
+====================================================
+`calculate_lights` wertet einen Zeitpunkt aus und liefert ein Dict.
+`calculate_lights_batch` wertet ganze Arrays von Zeitpunkten in einem
+vektorisierten Durchlauf aus und liefert je Zeitpunkt eine uint8-Bitmaske
+der fünf Lampen (LAMP_*), z. B. für Simulation, Plots, Verifikation oder
+eine vorberechnete Tabelle, in der die Laufzeit nur noch nachschlägt.
+`PhaseSchedule` hält die Lampen einer Phase als kurzen Fahrplan aus
+(Zeitpunkt, Bitmaske)-Übergängen – die Laufzeit schiebt nur einen Cursor
+weiter und kennt den nächsten Wechsel ohne Neuberechnung.
+
+Bit-Reihenfolge wie die ESP-Befehle: (p_red, p_green, c_red, c_yellow, c_green).
+"""
+
+import numpy as np
+
+# --- Lampen-Bits ---
+LAMP_MAIN_RED = 1 << 0
+LAMP_MAIN_GREEN = 1 << 1
+LAMP_CAR_RED = 1 << 2
+LAMP_CAR_YELLOW = 1 << 3
+LAMP_CAR_GREEN = 1 << 4
+LAMP_KEYS = ("main_red", "main_green", "car_red", "car_yellow", "car_green")
+
+
+def lights_to_mask(lights):
+    """Dict von calculate_lights -> Bitmaske."""
+    return sum(1 << i for i, key in enumerate(LAMP_KEYS) if lights[key])
+
+
+def mask_to_lights(mask):
+    """Bitmaske -> Dict wie von calculate_lights."""
+    return {key: bool(int(mask) >> i & 1) for i, key in enumerate(LAMP_KEYS)}
+
+
+def pack_lights(p_red, p_green, c_red, c_yellow, c_green):
+    """ESP-Tupel (0/1) -> Bitmaske."""
+    return p_red | p_green << 1 | c_red << 2 | c_yellow << 3 | c_green << 4
+
+
+def unpack_lights(mask):
+    """Bitmaske -> ESP-Tupel (p_red, p_green, c_red, c_yellow, c_green)."""
+    mask = int(mask)
+    return mask & 1, mask >> 1 & 1, mask >> 2 & 1, mask >> 3 & 1, mask >> 4 & 1
+
+
+class PhaseSchedule:
+    """
+    Lampen-Fahrplan einer Phase auf der Phasen-Uhr (ms ab Phasenbeginn).
+    Ein Übergang (t, mask) gilt ab einschließlich t bis zum nächsten.
+    """
+
+    def __init__(self, transitions, end=None):
+        """
+        Args:
+            transitions: (Zeitpunkt, Bitmaske) in zeitlicher Reihenfolge; Zeitpunkte < 0
+                fallen auf den Phasenbeginn, bei gleichem Zeitpunkt gilt der letzte Eintrag
+            end: Phasen-Uhr, zu der die Phase endet (None = offen)
+        """
+        self.times = []
+        self.masks = []
+        for t, mask in sorted(((max(0, t), mask) for t, mask in transitions), key=lambda entry: entry[0]):
+            if self.times and self.times[-1] == t:
+                self.times.pop()
+                self.masks.pop()
+            if not self.masks or self.masks[-1] != mask:
+                self.times.append(t)
+                self.masks.append(mask)
+        self.end = end
+        self.cursor = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        return iter(zip(self.times, self.masks))
+
+    @property
+    def current(self):
+        return self.masks[self.cursor]
+
+    def advance(self, t):
+        """Cursor bis zur Phasen-Uhr `t` vorschieben (t steigt nur); liefert die gültige Bitmaske."""
+        times = self.times
+        cursor = self.cursor
+        while cursor + 1 < len(times) and times[cursor + 1] <= t:
+            cursor += 1
+        self.cursor = cursor
+        return self.masks[cursor]
+
+    def next_change(self):
+        """Phasen-Uhr des nächsten Wechsels (Übergang oder Phasenende), None = keiner absehbar."""
+        if self.cursor + 1 < len(self.times):
+            return self.times[self.cursor + 1]
+        return self.end
+
 
 class TrafficLightLogic:
     def __init__(self):
@@ -89,3 +186,74 @@ class TrafficLightLogic:
             res["car_red"] = True
 
         return res
+
+    def calculate_lights_batch(self, ped_state, elapsed_time_ms, total_red_duration_ms):
+        """
+        Wie calculate_lights, aber für viele Zeitpunkte auf einmal.
+
+        Args:
+            ped_state (str): "GREEN", "RED", "CLEARANCE", "TRAM"
+            elapsed_time_ms (array-like): Vergangene Zeiten in der Phase
+            total_red_duration_ms (float oder array-like): Dauer der Rot-Phase
+                (wird mit elapsed_time_ms gebroadcastet)
+
+        Returns:
+            np.ndarray: uint8-Bitmasken (LAMP_*) in der Form von elapsed_time_ms
+        """
+        t = np.asarray(elapsed_time_ms, dtype=np.float64)
+        main = LAMP_MAIN_GREEN if ped_state == "GREEN" else LAMP_MAIN_RED
+
+        if ped_state in ("GREEN", "CLEARANCE", "TRAM"):
+            return np.full(t.shape, main | LAMP_CAR_RED, dtype=np.uint8)
+        if ped_state != "RED":
+            return np.full(t.shape, main, dtype=np.uint8)
+
+        total = np.asarray(total_red_duration_ms, dtype=np.float64)
+        t, total = np.broadcast_arrays(t, total)
+        t_green_start = self.t_start_buffer + self.t_red_yellow
+        t_yellow_start = total - (self.t_yellow + self.t_end_buffer)
+        t_red_exit_start = total - self.t_end_buffer
+
+        # Gleiche Reihenfolge wie calculate_lights: die erste zutreffende Bedingung gewinnt
+        car = np.select(
+            [t < self.t_start_buffer, t < t_green_start, t < t_yellow_start, t < t_red_exit_start],
+            [LAMP_CAR_RED, LAMP_CAR_RED | LAMP_CAR_YELLOW, LAMP_CAR_GREEN, LAMP_CAR_YELLOW],
+            default=LAMP_CAR_RED,
+        )
+        # Phase zu kurz für Grün: durchgehend Rot
+        car = np.where(t_green_start > t_yellow_start, LAMP_CAR_RED, car)
+        return (car | main).astype(np.uint8)
+
+    def lights_table(self, ped_state, duration_ms, total_red_duration_ms, step_ms=10):
+        """
+        Vorberechnete Tabelle einer Phase: Eintrag i gilt ab i * step_ms.
+        Nachschlagen: table[min(int(elapsed // step_ms), len(table) - 1)]
+        """
+        return self.calculate_lights_batch(ped_state, np.arange(0, duration_ms, step_ms), total_red_duration_ms)
+
+    def schedule(self, ped_state, total_red_duration_ms):
+        """
+        Fahrplan einer Phase – dieselben Lampen wie calculate_lights, aber als
+        Übergänge, einmal bei Phasenbeginn berechnet.
+
+        Returns:
+            PhaseSchedule (bei "RED" mit Ende total_red_duration_ms)
+        """
+        main = LAMP_MAIN_GREEN if ped_state == "GREEN" else LAMP_MAIN_RED
+        if ped_state in ("GREEN", "CLEARANCE", "TRAM"):
+            return PhaseSchedule([(0, main | LAMP_CAR_RED)])
+        if ped_state != "RED":
+            return PhaseSchedule([(0, main)])
+
+        total = total_red_duration_ms
+        t_green_start = self.t_start_buffer + self.t_red_yellow
+        t_yellow_start = total - (self.t_yellow + self.t_end_buffer)
+        if t_green_start > t_yellow_start:
+            return PhaseSchedule([(0, main | LAMP_CAR_RED)], end=total)
+        return PhaseSchedule([
+            (0, main | LAMP_CAR_RED),
+            (self.t_start_buffer, main | LAMP_CAR_RED | LAMP_CAR_YELLOW),
+            (t_green_start, main | LAMP_CAR_GREEN),
+            (t_yellow_start, main | LAMP_CAR_YELLOW),
+            (total - self.t_end_buffer, main | LAMP_CAR_RED),
+        ], end=total)
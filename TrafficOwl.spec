@@ -36,10 +36,38 @@ a = Analysis(
         # === Python-Module die per sys.path importiert werden ===
         ('Interface/esp_control.py', 'Interface'),
         ('Interface/traffic_logic.py', 'Interface'),
+        ('Interface/crossing_engine.py', 'Interface'),
+        ('Interface/latency_stats.py', 'Interface'),
+        ('Interface/led_ring.py', 'Interface'),
+        ('Interface/asset_cache.py', 'Interface'),
+        ('Interface/dirty_regions.py', 'Interface'),
+        ('Interface/status_bar.py', 'Interface'),
+        ('Interface/texture_renderer.py', 'Interface'),
+        ('image-detection/motion_gate.py', 'image-detection'),
+        ('image-detection/model_backends.py', 'image-detection'),
+        ('image-detection/int8_quantization.py', 'image-detection'),
+        ('image-detection/detection_profile.py', 'image-detection'),
+        ('image-detection/mask_compositor.py', 'image-detection'),
+        ('image-detection/buffer_pool.py', 'image-detection'),
+        ('image-detection/track_palette.py', 'image-detection'),
     ] + ultralytics_datas,
     hiddenimports=[
         'esp_control',
         'traffic_logic',
+        'crossing_engine',
+        'latency_stats',
+        'led_ring',
+        'asset_cache',
+        'dirty_regions',
+        'status_bar',
+        'texture_renderer',
+        'motion_gate',
+        'model_backends',
+        'int8_quantization',
+        'detection_profile',
+        'mask_compositor',
+        'buffer_pool',
+        'track_palette',
         'serial',
         'serial.tools',
         'serial.tools.list_ports',
@@ -0,0 +1,107 @@
+"""
+Puffer-Pool für die Annotations-Pipeline
+========================================
+Die Annotation legte bisher pro Frame mehrere neue Vollbild-Arrays an
+(Frame-Kopie, Overlays für Labels/HUD, Canvas des Dashboards). Über
+stundenlange Ausstellungsläufe erzeugt das viel Allokator-Last und
+GC-Pausen, die als Ruckler sichtbar werden.
+
+Der Pool hält zurückgegebene Arrays nach (shape, dtype) vor und gibt
+sie beim nächsten `acquire` wieder aus. Ausgeliehene Puffer sind NICHT
+initialisiert – Aufrufer überschreiben sie vollständig (`copy`, `full`).
+Thread-sicher, damit Kamera-Thread und UI-Thread denselben Pool nutzen.
+"""
+
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class BufferPool:
+    """Wiederverwendbare numpy-Puffer, gruppiert nach (shape, dtype)."""
+
+    def __init__(self, max_per_key=4, max_keys=32):
+        """
+        Args:
+            max_per_key (int): Maximal vorgehaltene Puffer pro (shape, dtype); überzählige verfallen
+            max_keys (int): Maximal vorgehaltene Formen; die am längsten unbenutzte fällt heraus
+        """
+        self.max_per_key = max_per_key
+        self.max_keys = max_keys
+        self._free = OrderedDict()
+        self._lock = threading.Lock()
+        self.allocated = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def acquire(self, shape, dtype=np.uint8):
+        """Puffer der gewünschten Form ausleihen (Inhalt undefiniert)."""
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self._free.move_to_end(key)
+                self.reused += 1
+                return free.pop()
+            self.allocated += 1
+        return np.empty(key[0], dtype=key[1])
+
+    def release(self, buf):
+        """Puffer zurückgeben. Danach darf er vom Aufrufer nicht mehr benutzt werden."""
+        if buf is None or buf.base is not None:
+            return  # Views (z. B. Ausschnitte) gehören nicht in den Pool
+        key = (buf.shape, buf.dtype)
+        with self._lock:
+            free = self._free.setdefault(key, [])
+            self._free.move_to_end(key)
+            if len(free) < self.max_per_key and not any(b is buf for b in free):
+                free.append(buf)
+            else:
+                self.discarded += 1
+            while len(self._free) > self.max_keys:
+                _, dropped = self._free.popitem(last=False)
+                self.discarded += len(dropped)
+
+    def copy(self, src):
+        """Wie `src.copy()`, aber in einen gepoolten Puffer."""
+        buf = self.acquire(src.shape, src.dtype)
+        np.copyto(buf, src)
+        return buf
+
+    def full(self, shape, value, dtype=np.uint8):
+        """Wie `np.full(shape, value)`, aber in einen gepoolten Puffer."""
+        buf = self.acquire(shape, dtype)
+        buf[...] = value
+        return buf
+
+    def get_stats(self):
+        with self._lock:
+            held = sum(len(free) for free in self._free.values())
+            held_bytes = sum(b.nbytes for free in self._free.values() for b in free)
+        return {
+            "buffers_held": held,
+            "bytes_held": held_bytes,
+            "buffers_allocated": self.allocated,
+            "buffers_reused": self.reused,
+            "buffers_discarded": self.discarded,
+        }
+
+
+def blend_rect(img, x1, y1, x2, y2, color, alpha, pool):
+    """
+    Halbtransparentes, gefülltes Rechteck – Ersatz für
+    `overlay = img.copy(); cv2.rectangle(overlay, ...); cv2.addWeighted(...)`,
+    blendet aber nur den betroffenen Ausschnitt (in-place).
+    """
+    h, w = img.shape[:2]
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(w, x2 + 1), min(h, y2 + 1)  # cv2.rectangle schließt x2/y2 ein
+    if x2 <= x1 or y2 <= y1:
+        return img
+    region = img[y1:y2, x1:x2]
+    fill = pool.full(region.shape, color, region.dtype)
+    cv2.addWeighted(fill, alpha, region, 1 - alpha, 0, region)
+    pool.release(fill)
+    return img
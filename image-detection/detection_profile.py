@@ -0,0 +1,54 @@
+"""
+Erkennungs-Profile
+==================
+Legt fest, wie viel Nachbearbeitung ein Frame bekommt:
+
+  - count-only: keine hochaufgelösten Masken, keine Annotation – nur die Anzahl
+  - boxes:      Boxen und Track-IDs, keine Masken-Overlays
+  - full:       bisheriges Verhalten mit retina_masks und Masken-Overlays
+
+retina_masks=True skaliert jede Personen-Maske auf volle Bildauflösung hoch;
+bei vollen Szenen ist das der größte Teil der Nachbearbeitung. Die Profile
+ohne Masken-Anzeige verzichten darauf und greifen auch nie auf masks.xy
+(Konturberechnung pro Person) zu.
+"""
+
+PROFILE_COUNT_ONLY = "count-only"
+PROFILE_BOXES = "boxes"
+PROFILE_FULL = "full"
+
+
+class DetectionProfile:
+    def __init__(self, name, retina_masks, draw_masks, draw_boxes):
+        self.name = name
+        self.retina_masks = retina_masks   # An model.track() durchreichen
+        self.draw_masks = draw_masks       # Segmentierungs-Overlays zeichnen
+        self.draw_boxes = draw_boxes       # HUD-Boxen, Labels und Track-IDs zeichnen
+
+    @property
+    def annotate(self):
+        return self.draw_masks or self.draw_boxes
+
+    def __repr__(self):
+        return f"DetectionProfile({self.name})"
+
+
+DETECTION_PROFILES = {
+    PROFILE_COUNT_ONLY: DetectionProfile(PROFILE_COUNT_ONLY, retina_masks=False, draw_masks=False, draw_boxes=False),
+    PROFILE_BOXES: DetectionProfile(PROFILE_BOXES, retina_masks=False, draw_masks=False, draw_boxes=True),
+    PROFILE_FULL: DetectionProfile(PROFILE_FULL, retina_masks=True, draw_masks=True, draw_boxes=True),
+}
+PROFILE_NAMES = tuple(DETECTION_PROFILES)
+
+
+def get_profile(name):
+    try:
+        return DETECTION_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unbekanntes Profil: {name} (erlaubt: {', '.join(PROFILE_NAMES)})")
+
+
+def next_profile(name):
+    """Nächstes Profil in der Reihenfolge count-only -> boxes -> full -> count-only."""
+    idx = PROFILE_NAMES.index(name)
+    return PROFILE_NAMES[(idx + 1) % len(PROFILE_NAMES)]
@@ -0,0 +1,151 @@
+"""
+Statische INT8-Quantisierung des Segmentierungsmodells
+======================================================
+Erzeugt aus dem FP32-ONNX-Export eine statisch quantisierte INT8-Variante
+(ONNX Runtime, QDQ-Format). Die Aktivierungsbereiche werden auf Frames
+aus unseren eigenen Aufnahmen kalibriert (Standard: render/input).
+
+Die Vorverarbeitung entspricht der von Ultralytics (Letterbox auf imgsz,
+Padding 114, BGR -> RGB, 0..1, NCHW), damit die Kalibrierung dieselbe
+Eingabeverteilung sieht wie später model.track().
+"""
+
+import hashlib
+import os
+
+import cv2
+import numpy as np
+
+DETECTION_DIR = os.path.dirname(os.path.abspath(__file__))
+CALIBRATION_ROOT = os.path.join(DETECTION_DIR, "render", "input")
+VIDEO_EXTENSIONS = ('.mov', '.mp4', '.avi', '.mkv')
+
+CALIBRATION_FRAMES = 200   # Frames insgesamt, gleichmäßig über alle Clips verteilt
+
+
+def find_videos(root):
+    """Alle Videos unterhalb von `root` (rekursiv, sortiert)."""
+    videos = []
+    if os.path.exists(root):
+        for dirpath, _, files in os.walk(root):
+            for file in files:
+                if file.lower().endswith(VIDEO_EXTENSIONS):
+                    videos.append(os.path.join(dirpath, file))
+    return sorted(videos)
+
+
+def calibration_videos(source):
+    """Kalibrier-Clips: Verzeichnis (rekursiv durchsucht) oder Liste von Video-Pfaden."""
+    if isinstance(source, (list, tuple)):
+        return sorted(source)
+    return find_videos(source)
+
+
+def calibration_hash(videos, max_frames):
+    """Fingerabdruck des Kalibrier-Sets (Dateien, Größen, Frame-Anzahl) für den Cache-Schlüssel."""
+    digest = hashlib.sha256(str(max_frames).encode())
+    for path in videos:
+        digest.update(os.path.basename(path).encode())
+        digest.update(str(os.path.getsize(path)).encode())
+    return digest.hexdigest()[:8]
+
+
+def sample_frames(videos, max_frames=CALIBRATION_FRAMES):
+    """Liest bis zu `max_frames` Frames, gleichmäßig über Clips und Clip-Länge verteilt."""
+    if not videos:
+        return
+    per_video = max(1, max_frames // len(videos))
+    for path in videos:
+        cap = cv2.VideoCapture(path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            cap.release()
+            continue
+        for idx in np.linspace(0, total - 1, num=min(per_video, total), dtype=int):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(idx))
+            success, frame = cap.read()
+            if success:
+                yield frame
+        cap.release()
+
+
+def letterbox(frame, imgsz):
+    """Skaliert mit erhaltenem Seitenverhältnis auf imgsz x imgsz und füllt mit Grau (114) auf."""
+    h, w = frame.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top = (imgsz - new_h) // 2
+    left = (imgsz - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return canvas
+
+
+def preprocess(frame, imgsz):
+    """BGR-Frame -> NCHW float32 (0..1, RGB), wie die Ultralytics-Vorverarbeitung."""
+    img = letterbox(frame, imgsz)[:, :, ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(img, dtype=np.float32)[None] / 255.0
+
+
+def quantize_model(fp32_path, int8_path, imgsz, calibration_root=CALIBRATION_ROOT,
+                   max_frames=CALIBRATION_FRAMES, log=print):
+    """
+    Kalibriert auf eigenen Clips und schreibt das INT8-Modell nach `int8_path`.
+    `calibration_root` ist ein Verzeichnis oder eine Liste von Clips (calibration_videos).
+    """
+    import onnx
+    import onnxruntime
+    from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod,
+                                          QuantFormat, QuantType, quantize_static)
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    videos = calibration_videos(calibration_root)
+    if not videos:
+        raise FileNotFoundError(f"Keine Kalibrier-Clips in '{calibration_root}' gefunden.")
+
+    input_name = onnxruntime.InferenceSession(
+        fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self.count = 0
+            self._frames = sample_frames(videos, max_frames)
+
+        def get_next(self):
+            frame = next(self._frames, None)
+            if frame is None:
+                return None
+            self.count += 1
+            return {input_name: preprocess(frame, imgsz)}
+
+    # Shape-Inferenz/Optimierung vorab verbessert die Quantisierung, ist aber optional
+    source = fp32_path
+    prepared = int8_path + ".prep.onnx"
+    try:
+        quant_pre_process(fp32_path, prepared)
+        source = prepared
+    except Exception as e:
+        log(f"Vorverarbeitung für Quantisierung übersprungen: {e}")
+
+    log(f"Kalibriere INT8 auf {len(videos)} Clips (max. {max_frames} Frames)...")
+    reader = FrameReader()
+    try:
+        quantize_static(source, int8_path, reader,
+                        quant_format=QuantFormat.QDQ,
+                        per_channel=True,
+                        activation_type=QuantType.QUInt8,
+                        weight_type=QuantType.QInt8,
+                        calibrate_method=CalibrationMethod.MinMax)
+    finally:
+        if os.path.exists(prepared):
+            os.remove(prepared)
+    log(f"INT8-Kalibrierung mit {reader.count} Frames abgeschlossen.")
+
+    # Ultralytics-Metadaten (Klassen, Stride, Task, imgsz) aus dem FP32-Export übernehmen
+    fp32_model = onnx.load(fp32_path, load_external_data=False)
+    int8_model = onnx.load(int8_path)
+    del int8_model.metadata_props[:]
+    int8_model.metadata_props.extend(fp32_model.metadata_props)
+    onnx.save(int8_model, int8_path)
+    return int8_path
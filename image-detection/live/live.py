@@ -2,18 +2,35 @@ import argparse
 import cv2
 import time
 import os
+import sys
 import numpy as np
-from ultralytics import YOLO
 
 # Konfiguration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODELS_DIR = os.path.join(os.path.dirname(BASE_DIR), "models")
+DETECTION_DIR = os.path.dirname(BASE_DIR)
+MODELS_DIR = os.path.join(DETECTION_DIR, "models")
 MODEL_NAME = "yolo26n-seg.pt"
 
+# Gemeinsame Erkennungs-Module aus image-detection/
+sys.path.insert(0, DETECTION_DIR)
+from motion_gate import MotionGate
+from model_backends import BACKENDS, DEFAULT_IMGSZ, load_detection_model
+from detection_profile import PROFILE_FULL, PROFILE_NAMES, get_profile, next_profile
+from mask_compositor import MaskCompositor
+from track_palette import track_color
+from buffer_pool import BufferPool
+
+# Messbereich (ROI): unterer Bildteil, 11m von 19.5m Bildhöhe
+ROI_TOP_RATIO = 1.0 - (11.0 / 19.5)
+MOTION_REFRESH_INTERVAL = 1.0  # Spätestens so oft (s) wird trotz ruhiger Szene inferiert
+
 DEBOUNCE_TIME = 0.25  # Reduziert auf 0.25 Sekunden
 MAX_VISUAL_PERSONS = 8
 waiting_images = []
 
+# Gemeinsamer Pool für Frame-Kopien, Overlays und das Dashboard-Canvas
+BUFFER_POOL = BufferPool()
+
 
 class CountSmoother:
     def __init__(self):
@@ -217,7 +234,16 @@ class UIUtils:
 
         # Check if we need transparency
         if alpha < 1.0 and thickness == -1:
-            overlay = img.copy()
+            # Nur den betroffenen Ausschnitt kopieren und blenden (Puffer aus dem Pool)
+            img_h, img_w = img.shape[:2]
+            rx1, ry1 = max(0, x1), max(0, y1)
+            rx2, ry2 = min(img_w, x2 + 1), min(img_h, y2 + 1)
+            if rx2 <= rx1 or ry2 <= ry1:
+                return
+            region = img[ry1:ry2, rx1:rx2]
+            overlay = BUFFER_POOL.copy(region)
+            # Koordinaten relativ zum Ausschnitt
+            x1, x2, y1, y2 = x1 - rx1, x2 - rx1, y1 - ry1, y2 - ry1
             # Draw standard rounded rect on overlay
             # Limitation: OpenCV doesn't have native rounded filled rect.
             # Approximation: Rectangle with circles at corners
@@ -232,7 +258,8 @@ class UIUtils:
             cv2.circle(overlay, (x1 + radius, y2 - radius), radius, color, -1)
             cv2.circle(overlay, (x2 - radius, y2 - radius), radius, color, -1)
 
-            cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+            cv2.addWeighted(overlay, alpha, region, 1 - alpha, 0, region)
+            BUFFER_POOL.release(overlay)
         else:
             # Simple version for outlines or opaque
             # Just use normal rectangle for simplicity if outline, or same logic
@@ -348,7 +375,7 @@ class UIUtils:
 
 def draw_interface(frame, person_count, width=1920, height=1080):
     # 1. Background
-    canvas = np.full((height, width, 3), Colors.BG_DARK, dtype=np.uint8)
+    canvas = BUFFER_POOL.full((height, width, 3), Colors.BG_DARK)
 
     # 2. Left Side: Camera Feed (Modern Frame)
     # Calculate margins
@@ -410,13 +437,6 @@ def draw_interface(frame, person_count, width=1920, height=1080):
     return canvas
 
 
-def get_track_color(track_id):
-    """Generates a consistent color for a track ID."""
-    np.random.seed(int(track_id))
-    color = np.random.randint(0, 255, 3).tolist()
-    return tuple(color)
-
-
 def main(args):
     # Zeige verfügbare Kameras an
     available_cams = list_available_cameras()
@@ -426,10 +446,10 @@ def main(args):
     fallback_local_source = available_cams[0] if available_cams else None
 
     # Lade das YOLOv11 Nano Segmentation Modell
-    print(f"Lade Modell ({MODEL_NAME})...")
+    print(f"Lade Modell ({MODEL_NAME}, Backend: {args.backend})...")
     try:
         model_path = os.path.join(MODELS_DIR, MODEL_NAME)
-        model = YOLO(model_path)
+        model = load_detection_model(model_path, args.backend, args.imgsz)
     except Exception as e:
         print(f"Fehler beim Laden des Modells: {e}")
         return
@@ -437,6 +457,12 @@ def main(args):
     # Initialisiere Logik-Klassen
     smoother = CountSmoother()
     speed_estimator = SpeedEstimator()
+    motion_gate = None
+    if not args.no_motion_gate:
+        motion_gate = MotionGate(roi=(0.0, ROI_TOP_RATIO, 1.0, 1.0), refresh_interval=MOTION_REFRESH_INTERVAL)
+    results = None
+    profile = get_profile(args.profile)
+    compositor = MaskCompositor(alpha=0.4)
 
     # Öffne die Webcam oder den Stream
     if isinstance(source, int) and len(available_cams) > 1 and source not in available_cams:
@@ -477,6 +503,8 @@ def main(args):
         source = new_source
         if isinstance(new_source, int):
             fallback_local_source = new_source
+        if motion_gate:
+            motion_gate.reset()
         return True
 
     # Fenster erstellen und auf Vollbild setzen
@@ -487,6 +515,7 @@ def main(args):
     print("Starte Personenerkennung mit Instance Segmentation.")
     print(" [q] Beenden")
     print(" [c] Kamera wechseln")
+    print(" [m] Erkennungs-Profil wechseln (count-only / boxes / full)")
     if iphone_source:
         print(" [i] iPhone-Stream umschalten")
 
@@ -499,42 +528,28 @@ def main(args):
             continue
 
         # Führe YOLO Tracking auf dem Frame aus (aktiviere Masken)
-        # Hinweis: retina_masks=True sorgt für bessere Maskenqualität, ist aber etwas langsamer.
-        results = model.track(frame, classes=[0, 2], persist=True, verbose=False, retina_masks=True)
+        # Hinweis: retina_masks=True (Profil "full") sorgt für bessere Maskenqualität, ist aber langsamer.
+        # Bei unveränderter Szene im Messbereich wird das letzte Ergebnis weiterverwendet.
+        if results is None or motion_gate is None or motion_gate.should_infer(frame):
+            results = model.track(frame, classes=[0, 2], persist=True, imgsz=args.imgsz,
+                                  verbose=False, retina_masks=profile.retina_masks)
 
-        # Clone frame for clean drawing
-        annotated_frame = frame.copy()
+        # Clone frame for clean drawing (Puffer aus dem Pool, nach imshow zurückgegeben)
+        annotated_frame = BUFFER_POOL.copy(frame)
 
         # 1. Zeichne Segmentation Masks (Hintergrund) bevor die Boxen kommen
-        if results[0].boxes.id is not None and results[0].masks is not None:
+        if profile.draw_masks and results[0].boxes.id is not None and results[0].masks is not None:
             track_ids = results[0].boxes.id.int().cpu().tolist()
 
-            # Die Masken-Konturen abrufen (Liste von Arrays mit Koordinaten)
-            # Verwende enumerate, da masks und boxes korrespondieren
-            for i, track_id in enumerate(track_ids):
-                try:
-                    # Zufällige, aber konsistente Farbe für jede Person
-                    color = get_track_color(track_id)
-
-                    # Kontur abrufen
-                    seg = results[0].masks.xy[i]
-
-                    if len(seg) > 0:
-                        seg = seg.astype(np.int32)
-
-                        # Overlay erstellen
-                        overlay = annotated_frame.copy()
-                        cv2.drawContours(overlay, [seg], -1, color, -1)  # Ausgefüllt
-
-                        # Transparenz anwenden (z.B. 40% Deckkraft)
-                        alpha = 0.4
-                        cv2.addWeighted(overlay, alpha, annotated_frame, 1 - alpha, 0, annotated_frame)
-
-                        # Optionale Outline um die Fläche (deckend)
-                        cv2.drawContours(annotated_frame, [seg], -1, color, 2)
-
-                except Exception:
-                    pass
+            # Die Masken-Konturen abrufen (Liste von Arrays mit Koordinaten).
+            # Masks und Boxes korrespondieren; alle Masken werden in einem
+            # Durchgang eingefärbt (40% Deckkraft) und deckend umrandet.
+            try:
+                segs = results[0].masks.xy
+                colors = [track_color(track_id) for track_id in track_ids[:len(segs)]]
+                compositor.composite(annotated_frame, segs, colors)
+            except Exception:
+                pass
 
         # Update Speed Estimation
         speeds = speed_estimator.update(results, annotated_frame.shape)
@@ -544,8 +559,7 @@ def main(args):
         # Height of ROI is 11m. Total Height is 19.5m.
         # Top Y in pixels = h - (h * (11 / 19.5))
         h_frame, w_frame = annotated_frame.shape[:2]
-        roi_height_px = int(h_frame * (11.0 / 19.5))
-        roi_top_y = h_frame - roi_height_px
+        roi_top_y = int(h_frame * ROI_TOP_RATIO)
         
         # Zeichne semi-transparentes Rechteck für den Messbereich
         # overlay = annotated_frame.copy()
@@ -558,7 +572,7 @@ def main(args):
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 100), 1, cv2.LINE_AA)
 
         # 2. Zeichne HUD Overlays (Vordergrund/Ecken)
-        for track_id, data in speeds.items():
+        for track_id, data in (speeds.items() if profile.draw_boxes else ()):
             speed = data['speed']
             category = data['category']
             direction = data.get('direction', 'UNKNOWN')
@@ -613,6 +627,8 @@ def main(args):
 
         # Zeige das Bild an (Window config should handle resize)
         cv2.imshow(window_name, ui_frame)
+        BUFFER_POOL.release(annotated_frame)
+        BUFFER_POOL.release(ui_frame)
 
         # Tastensteuerung
         key = cv2.waitKey(1) & 0xFF
@@ -631,6 +647,9 @@ def main(args):
                 switch_capture(available_cams[next_idx])
             else:
                 print("Keine Kameras in der Liste verfügbar.")
+        elif key == ord("m"):
+            profile = get_profile(next_profile(profile.name))
+            print(f"Erkennungs-Profil: {profile.name}")
         elif key == ord("i") and iphone_source:
             # Zwischen iPhone-Stream und lokaler Kamera wechseln
             target = iphone_source if source != iphone_source else fallback_local_source
@@ -645,6 +664,14 @@ def main(args):
 
             switch_capture(target)
 
+    if motion_gate:
+        gate_stats = motion_gate.get_stats()
+        print(f"Motion-Gate: {gate_stats['inferences_executed']} Inferenzen ausgeführt, "
+              f"{gate_stats['inferences_skipped']} übersprungen.")
+    pool_stats = BUFFER_POOL.get_stats()
+    print(f"Puffer-Pool: {pool_stats['buffers_held']} gehalten, {pool_stats['buffers_reused']} wiederverwendet, "
+          f"{pool_stats['buffers_allocated']} neu angelegt.")
+
     # Ressourcen freigeben
     cap.release()
     cv2.destroyAllWindows()
@@ -662,6 +689,25 @@ if __name__ == "__main__":
         default=None,
         help="HTTP/RTSP-Stream deiner iPhone-Kamera (z.B. aus der App 'IP Camera'). Hat Vorrang vor --source."
     )
+    parser.add_argument(
+        "--no-motion-gate",
+        action="store_true",
+        help="YOLO auf jedem Frame ausführen, auch wenn sich im Messbereich nichts bewegt."
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="torch",
+        help="Inferenz-Backend. onnx/openvino werden beim ersten Start exportiert und unter models/exports gecacht, "
+             "onnx-int8 wird zusätzlich auf den Clips in render/input kalibriert (INT8-Quantisierung)."
+    )
+    parser.add_argument("--imgsz", type=int, default=DEFAULT_IMGSZ, help="YOLO-Eingabegröße.")
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_NAMES,
+        default=PROFILE_FULL,
+        help="Erkennungs-Profil: count-only (nur Anzahl), boxes (Boxen + IDs) oder full (mit Masken). Umschalten mit [m]."
+    )
     cli_args = parser.parse_args()
     cli_args.source = parse_source_arg(cli_args.source)
     main(cli_args)
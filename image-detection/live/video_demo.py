@@ -9,9 +9,18 @@ import os
 
 # Konfiguration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-MODELS_DIR = os.path.join(os.path.dirname(BASE_DIR), "models")
+DETECTION_DIR = os.path.dirname(BASE_DIR)
+MODELS_DIR = os.path.join(DETECTION_DIR, "models")
 MODEL_NAME = "yolo26n-seg.pt"
 
+# Gemeinsame Erkennungs-Module aus image-detection/
+sys.path.insert(0, DETECTION_DIR)
+from detection_profile import PROFILE_FULL, get_profile, next_profile
+from mask_compositor import MaskCompositor
+from track_palette import track_color
+
+DETECTION_PROFILE = PROFILE_FULL  # Start-Profil: count-only / boxes / full (Umschalten mit [m])
+
 DEBOUNCE_TIME = 0.25  # Reduziert auf 0.25 Sekunden
 
 
@@ -323,13 +332,6 @@ def draw_interface(frame, person_count, width=1920, height=1080):
     return canvas
 
 
-def get_track_color(track_id):
-    """Generates a consistent color for a track ID."""
-    np.random.seed(int(track_id))
-    color = np.random.randint(0, 255, 3).tolist()
-    return tuple(color)
-
-
 def select_video_file():
     """Opens a file dialog to select a video file."""
     root = tk.Tk()
@@ -369,6 +371,8 @@ def main():
     # Initialisiere Logik-Klassen
     smoother = CountSmoother()
     speed_estimator = SpeedEstimator()
+    profile = get_profile(DETECTION_PROFILE)
+    compositor = MaskCompositor(alpha=0.4)
 
     cap = cv2.VideoCapture(video_path)
 
@@ -383,6 +387,7 @@ def main():
 
     print("Starte Videoanalyse.")
     print(" [q] Beenden")
+    print(" [m] Erkennungs-Profil wechseln (count-only / boxes / full)")
 
     while True:
         success, frame = cap.read()
@@ -394,48 +399,31 @@ def main():
             break
 
         # Führe YOLO Tracking auf dem Frame aus (aktiviere Masken)
-        # Hinweis: retina_masks=True sorgt für bessere Maskenqualität, ist aber etwas langsamer.
-        results = model.track(frame, classes=[0, 2], persist=True, verbose=False, retina_masks=True)
+        # Hinweis: retina_masks=True (Profil "full") sorgt für bessere Maskenqualität, ist aber langsamer.
+        results = model.track(frame, classes=[0, 2], persist=True, verbose=False, retina_masks=profile.retina_masks)
 
         # Clone frame for clean drawing
         annotated_frame = frame.copy()
 
         # 1. Zeichne Segmentation Masks (Hintergrund) bevor die Boxen kommen
-        if results[0].boxes.id is not None and results[0].masks is not None:
+        if profile.draw_masks and results[0].boxes.id is not None and results[0].masks is not None:
             track_ids = results[0].boxes.id.int().cpu().tolist()
 
-            # Die Masken-Konturen abrufen (Liste von Arrays mit Koordinaten)
-            # Verwende enumerate, da masks und boxes korrespondieren
-            for i, track_id in enumerate(track_ids):
-                try:
-                    # Zufällige, aber konsistente Farbe für jede Person
-                    color = get_track_color(track_id)
-
-                    # Kontur abrufen
-                    seg = results[0].masks.xy[i]
-
-                    if len(seg) > 0:
-                        seg = seg.astype(np.int32)
-
-                        # Overlay erstellen
-                        overlay = annotated_frame.copy()
-                        cv2.drawContours(overlay, [seg], -1, color, -1)  # Ausgefüllt
-
-                        # Transparenz anwenden (z.B. 40% Deckkraft)
-                        alpha = 0.4
-                        cv2.addWeighted(overlay, alpha, annotated_frame, 1 - alpha, 0, annotated_frame)
-
-                        # Optionale Outline um die Fläche (deckend)
-                        cv2.drawContours(annotated_frame, [seg], -1, color, 2)
-
-                except Exception:
-                    pass
+            # Die Masken-Konturen abrufen (Liste von Arrays mit Koordinaten).
+            # Masks und Boxes korrespondieren; alle Masken werden in einem
+            # Durchgang eingefärbt (40% Deckkraft) und deckend umrandet.
+            try:
+                segs = results[0].masks.xy
+                colors = [track_color(track_id) for track_id in track_ids[:len(segs)]]
+                compositor.composite(annotated_frame, segs, colors)
+            except Exception:
+                pass
 
         # Update Speed Estimation
         speeds = speed_estimator.update(results)
 
         # 2. Zeichne HUD Overlays (Vordergrund/Ecken)
-        for track_id, data in speeds.items():
+        for track_id, data in (speeds.items() if profile.draw_boxes else ()):
             speed = data['speed']
             category = data['category']
             direction = data.get('direction', 'UNKNOWN')
@@ -495,6 +483,9 @@ def main():
         key = cv2.waitKey(1) & 0xFF
         if key == ord("q"):
             break
+        elif key == ord("m"):
+            profile = get_profile(next_profile(profile.name))
+            print(f"Erkennungs-Profil: {profile.name}")
 
         # Add slight delay if processing is too fast for playback visualization
         # time.sleep(0.01)
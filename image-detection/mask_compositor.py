@@ -0,0 +1,97 @@
+"""
+Masken-Compositor: alle Personen-Masken in einem Durchgang einfärben
+====================================================================
+Bisher wurde pro Person eine Kopie des ganzen Frames erzeugt, die Maske
+hineingezeichnet und per cv2.addWeighted über das komplette Bild geblendet
+– bei 8 Personen also 8 Vollbild-Kopien und -Blends pro Frame.
+
+Der Compositor zeichnet stattdessen alle Masken als Label (1..N) in einen
+wiederverwendeten Label-Puffer und blendet die Farben anschließend in
+einer einzigen vektorisierten Operation – und zwar nur innerhalb der
+Vereinigung der Bounding-Boxen aller Masken. Die Kosten bleiben damit
+nahezu konstant, egal wie viele Personen im Bild sind.
+
+Ohne Überlappung ist das Ergebnis pixelgleich mit der alten Schleife.
+Überlappen sich Masken, weicht es bewusst ab:
+  - Der Label-Puffer kennt je Pixel nur eine Person – es gewinnt die
+    später gezeichnete, die Fläche wird einmal mit ihrer Farbe getönt.
+    Früher wurde dort mehrfach geblendet (Farben mischten sich, die
+    Tönung wurde kräftiger).
+  - Alle Umrisse werden erst nach dem Blend gezogen und liegen damit über
+    jeder Tönung. Früher überdeckte die Tönung späterer Masken die Umrisse
+    früherer.
+"""
+
+import cv2
+import numpy as np
+
+MAX_LABELS = 255  # Label-Puffer ist uint8, 0 = Hintergrund
+
+
+class MaskCompositor:
+    """Färbt Segmentierungs-Konturen halbtransparent ein und zieht die Umrisse nach."""
+
+    def __init__(self, alpha=0.4, outline_thickness=2):
+        """
+        Args:
+            alpha (float): Deckkraft der Maskenfarbe (0.0 - 1.0)
+            outline_thickness (int): Linienstärke der deckenden Umrisse, 0 = keine Umrisse
+        """
+        self.alpha = alpha
+        self.outline_thickness = outline_thickness
+        self._labels = None
+        self._lut = np.zeros((1, MAX_LABELS + 1, 3), dtype=np.uint8)
+
+    def _label_buffer(self, shape):
+        if self._labels is None or self._labels.shape != shape:
+            self._labels = np.zeros(shape, dtype=np.uint8)
+        return self._labels
+
+    def composite(self, frame, contours, colors):
+        """
+        Zeichnet alle Konturen in `frame` (in-place) und gibt `frame` zurück.
+
+        Args:
+            frame (np.ndarray): BGR-Bild (H x W x 3, uint8)
+            contours (list): Konturen als (K x 2)-Arrays in Pixelkoordinaten (z. B. masks.xy)
+            colors (list): BGR-Farbe pro Kontur
+        """
+        h, w = frame.shape[:2]
+        labels = self._label_buffer((h, w))
+
+        polys = []
+        lut = self._lut
+        x1, y1, x2, y2 = w, h, 0, 0
+        for seg, color in zip(contours, colors):
+            if len(seg) == 0 or len(polys) >= MAX_LABELS:
+                continue
+            seg = np.asarray(seg, dtype=np.int32)
+            bx, by, bw, bh = cv2.boundingRect(seg)
+            if bw == 0 or bh == 0:
+                continue
+            label = len(polys) + 1
+            cv2.fillPoly(labels, [seg], label)
+            lut[0, label] = color
+            polys.append((seg, color))
+            x1, y1 = min(x1, bx), min(y1, by)
+            x2, y2 = max(x2, bx + bw), max(y2, by + bh)
+
+        if not polys:
+            return frame
+
+        x1, y1 = max(0, x1), max(0, y1)
+        x2, y2 = min(w, x2), min(h, y2)
+        if x2 > x1 and y2 > y1:
+            region_labels = labels[y1:y2, x1:x2]
+            region = frame[y1:y2, x1:x2]
+            # Label -> Farbe per Lookup-Table, ein Blend, Rückschreiben nur unter den Masken
+            tint = cv2.LUT(cv2.merge([region_labels] * 3), lut)
+            blended = cv2.addWeighted(tint, self.alpha, region, 1 - self.alpha, 0)
+            cv2.copyTo(blended, region_labels, region)
+            # Puffer nur im benutzten Bereich zurücksetzen
+            region_labels[:] = 0
+
+        if self.outline_thickness > 0:
+            for seg, color in polys:
+                cv2.polylines(frame, [seg], True, color, self.outline_thickness)
+        return frame
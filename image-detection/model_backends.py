@@ -0,0 +1,179 @@
+"""
+CPU-Inferenz-Backends für die YOLO-Modelle
+==========================================
+Lädt ein Modell wahlweise über PyTorch (`torch`) oder als exportiertes
+ONNX-Runtime- bzw. OpenVINO-Modell. Exporte werden beim ersten Start
+erzeugt und in einem Cache-Verzeichnis neben dem Modell abgelegt.
+`onnx-int8` quantisiert den ONNX-Export zusätzlich statisch auf INT8
+(siehe int8_quantization.py).
+
+Der Cache-Schlüssel besteht aus Modell-Hash, imgsz und Version der
+Backend-Runtime – ändert sich eines davon, wird neu exportiert.
+Spätere Starts laden das Artefakt direkt, ohne PyTorch-Modell.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+BACKENDS = ("torch", "onnx", "openvino", "onnx-int8")
+DEFAULT_IMGSZ = 640
+EXPORT_SUBDIR = "exports"
+
+
+def backend_version(backend):
+    """Version der Runtime eines Backends. Wirft ImportError, wenn sie fehlt."""
+    if backend in ("onnx", "onnx-int8"):
+        import onnxruntime
+        return onnxruntime.__version__
+    if backend == "openvino":
+        import openvino
+        version = getattr(openvino, "__version__", None)
+        if version is None:
+            from openvino.runtime import get_version
+            version = get_version()
+        return version.split("-")[0]
+    if backend == "torch":
+        import torch
+        return torch.__version__
+    raise ValueError(f"Unbekanntes Backend: {backend} (erlaubt: {', '.join(BACKENDS)})")
+
+
+def file_hash(path, length=12):
+    """Kurzer SHA-256 über den Dateiinhalt."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:length]
+
+
+def model_task(model_path):
+    """Task aus dem Dateinamen ableiten (exportierte Modelle kennen ihn nicht immer)."""
+    return "segment" if "-seg" in os.path.basename(model_path) else "detect"
+
+
+def cache_key(model_path, backend, imgsz):
+    """Eindeutiger Name des Export-Artefakts, z. B. yolo26n-seg-onnx-640-<hash>-1.18.0."""
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    parts = [stem, backend, str(imgsz), file_hash(model_path), backend_version(backend)]
+    return "-".join(parts)
+
+
+def artifact_path(cache_dir, key, backend):
+    if backend in ("onnx", "onnx-int8"):
+        return os.path.join(cache_dir, key + ".onnx")
+    return os.path.join(cache_dir, key + "_openvino_model")
+
+
+def _remove_stale(cache_dir, model_path, backend, keep, log):
+    """Ältere Exporte desselben Modells/Backends entfernen (anderer Hash/imgsz/Version)."""
+    stem = os.path.splitext(os.path.basename(model_path))[0]
+    prefix = f"{stem}-{backend}-"
+    keep = os.path.basename(keep)
+    for name in os.listdir(cache_dir):
+        # Nach dem Backend folgt immer imgsz – so trifft "onnx-" nicht auf "onnx-int8-"
+        if name.startswith(prefix) and name[len(prefix):].split("-")[0].isdigit() and name != keep:
+            stale = os.path.join(cache_dir, name)
+            log(f"Entferne veralteten Export: {stale}")
+            if os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                os.remove(stale)
+
+
+def export_model(model_path, backend, imgsz, target, **export_args):
+    """Exportiert `model_path` in einem Arbeitsverzeichnis und verschiebt das Ergebnis nach `target`."""
+    from ultralytics import YOLO
+
+    work_dir = tempfile.mkdtemp(prefix="export-", dir=os.path.dirname(target))
+    try:
+        # Kopie exportieren: Ultralytics schreibt neben die Quelldatei, die evtl. schreibgeschützt ist
+        work_model = os.path.join(work_dir, os.path.basename(model_path))
+        shutil.copy2(model_path, work_model)
+        exported = YOLO(work_model).export(format=backend, imgsz=imgsz, half=False,
+                                           dynamic=False, verbose=False, **export_args)
+        shutil.move(str(exported), target)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return target
+
+
+def _resolve_int8(model_path, imgsz, cache_dir, calibration_root, log):
+    """INT8-Artefakt: Schlüssel zusätzlich mit Fingerabdruck des Kalibrier-Sets."""
+    from int8_quantization import (CALIBRATION_FRAMES, CALIBRATION_ROOT, calibration_hash,
+                                   calibration_videos, quantize_model)
+
+    if calibration_root is None:
+        calibration_root = CALIBRATION_ROOT
+    key = cache_key(model_path, "onnx-int8", imgsz)
+    videos = calibration_videos(calibration_root)
+    if not videos:
+        # Ohne Clips (z. B. gebündelte App) jede passende frühere Kalibrierung akzeptieren
+        candidates = sorted((name for name in os.listdir(cache_dir) if name.startswith(key + "-")),
+                            key=lambda name: os.path.getmtime(os.path.join(cache_dir, name)))
+        if candidates:
+            target = os.path.join(cache_dir, candidates[-1])
+            log(f"Nutze gecachten onnx-int8-Export: {target}")
+            return target
+
+    key = f"{key}-{calibration_hash(videos, CALIBRATION_FRAMES)}"
+    target = artifact_path(cache_dir, key, "onnx-int8")
+    if os.path.exists(target):
+        log(f"Nutze gecachten onnx-int8-Export: {target}")
+        return target
+
+    fp32_path = resolve_artifact(model_path, "onnx", imgsz, cache_dir, log)
+    log(f"Kein INT8-Modell im Cache – quantisiere {os.path.basename(fp32_path)}...")
+    quantize_model(fp32_path, target, imgsz, calibration_root, CALIBRATION_FRAMES, log)
+    _remove_stale(cache_dir, model_path, "onnx-int8", target, log)
+    log(f"INT8-Modell gespeichert: {target}")
+    return target
+
+
+def resolve_artifact(model_path, backend, imgsz=DEFAULT_IMGSZ, cache_dir=None, log=print,
+                     calibration_root=None):
+    """Pfad des gecachten Exports; wird beim ersten Aufruf erzeugt."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(model_path), EXPORT_SUBDIR)
+    os.makedirs(cache_dir, exist_ok=True)
+
+    if backend == "onnx-int8":
+        return _resolve_int8(model_path, imgsz, cache_dir, calibration_root, log)
+
+    key = cache_key(model_path, backend, imgsz)
+    target = artifact_path(cache_dir, key, backend)
+    if os.path.exists(target):
+        log(f"Nutze gecachten {backend}-Export: {target}")
+        return target
+
+    log(f"Kein {backend}-Export im Cache – exportiere {os.path.basename(model_path)} (imgsz={imgsz})...")
+    export_model(model_path, backend, imgsz, target)
+    _remove_stale(cache_dir, model_path, backend, target, log)
+    log(f"Export gespeichert: {target}")
+    return target
+
+
+def load_detection_model(model_path, backend="torch", imgsz=DEFAULT_IMGSZ, cache_dir=None, log=print,
+                         calibration_root=None):
+    """
+    Lädt das Modell für das gewünschte Backend.
+
+    Args:
+        model_path (str): Pfad zum .pt-Modell (Quelle für Exporte und Cache-Hash)
+        backend (str): "torch", "onnx", "openvino" oder "onnx-int8"
+        imgsz (int): Eingabegröße, mit der exportiert und später inferiert wird
+        cache_dir (str): Ablage der Exporte (Standard: <Modellordner>/exports)
+        calibration_root (str | list): Clips für die INT8-Kalibrierung – Verzeichnis oder
+            Liste von Video-Pfaden (Standard: render/input)
+    """
+    from ultralytics import YOLO
+
+    if backend == "torch":
+        return YOLO(model_path)
+    if backend not in BACKENDS:
+        raise ValueError(f"Unbekanntes Backend: {backend} (erlaubt: {', '.join(BACKENDS)})")
+
+    artifact = resolve_artifact(model_path, backend, imgsz, cache_dir, log, calibration_root)
+    return YOLO(artifact, task=model_task(model_path))
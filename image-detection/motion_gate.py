@@ -0,0 +1,80 @@
+"""
+Motion-Gate: billige Vorstufe vor der YOLO-Inferenz
+===================================================
+Vergleicht ein stark verkleinertes Graustufenbild (optional nur die
+Region of Interest) mit dem Bild der letzten ausgeführten Inferenz.
+Hat sich die Szene nicht merklich verändert, kann das vorige
+Ergebnis (Anzahl, Boxen, Masken) weiterverwendet werden.
+
+Damit eine still stehende Person nicht aus der Zählung fällt, wird
+spätestens nach `refresh_interval` Sekunden immer neu inferiert.
+"""
+
+import time
+
+import cv2
+
+
+class MotionGate:
+    """Entscheidet pro Frame, ob sich eine neue Inferenz lohnt."""
+
+    def __init__(self, roi=None, downscale_width=160, pixel_threshold=12,
+                 min_changed_ratio=0.004, refresh_interval=1.0):
+        """
+        Args:
+            roi (tuple): (x1, y1, x2, y2) als Anteile 0.0-1.0 des Bildes, None = ganzes Bild
+            downscale_width (int): Breite des Vergleichsbildes in Pixeln
+            pixel_threshold (int): Grauwert-Differenz, ab der ein Pixel als verändert gilt
+            min_changed_ratio (float): Anteil veränderter Pixel, ab dem inferiert wird
+            refresh_interval (float): Spätestens nach so vielen Sekunden wird inferiert
+        """
+        self.roi = roi
+        self.downscale_width = downscale_width
+        self.pixel_threshold = pixel_threshold
+        self.min_changed_ratio = min_changed_ratio
+        self.refresh_interval = refresh_interval
+
+        self.executed = 0
+        self.skipped = 0
+        self._reference = None
+        self._last_inference = 0.0
+
+    def _prepare(self, frame):
+        h, w = frame.shape[:2]
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            frame = frame[int(y1 * h):int(y2 * h), int(x1 * w):int(x2 * w)]
+            h, w = frame.shape[:2]
+        small_h = max(1, int(h * self.downscale_width / max(1, w)))
+        small = cv2.resize(frame, (self.downscale_width, small_h), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(gray, (5, 5), 0)
+
+    def should_infer(self, frame, now=None):
+        """True, wenn die Szene sich verändert hat oder ein Refresh fällig ist."""
+        if now is None:
+            now = time.monotonic()
+        gray = self._prepare(frame)
+
+        run = (self._reference is None
+               or self._reference.shape != gray.shape
+               or now - self._last_inference >= self.refresh_interval)
+        if not run:
+            diff = cv2.absdiff(gray, self._reference)
+            changed = cv2.countNonZero(cv2.threshold(diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1])
+            run = changed >= self.min_changed_ratio * gray.size
+
+        if run:
+            self._reference = gray
+            self._last_inference = now
+            self.executed += 1
+        else:
+            self.skipped += 1
+        return run
+
+    def reset(self):
+        """Referenzbild verwerfen, z. B. nach einem Quellenwechsel."""
+        self._reference = None
+
+    def get_stats(self):
+        return {"inferences_executed": self.executed, "inferences_skipped": self.skipped}
@@ -0,0 +1,224 @@
+"""
+FP32 vs. INT8 – Genauigkeits- und Durchsatzvergleich
+====================================================
+Lässt das FP32-ONNX-Modell und die statisch quantisierte INT8-Variante
+auf denselben Frames unserer Clips (input/) laufen und schreibt einen
+Bericht nach output/:
+
+  - Personenanzahl-Übereinstimmung (Anteil Frames mit gleicher Anzahl)
+  - Box-IoU der einander zugeordneten Personen-Boxen
+  - Frames pro Sekunde beider Modelle
+
+Kalibriert wird nur auf jedem CALIBRATION_EVERY-ten Clip, verglichen auf
+den übrigen – sonst sähe die INT8-Variante genau die Bilder, auf die ihre
+Aktivierungsbereiche zugeschnitten sind, und der Abstand zu FP32 fiele zu
+klein aus. Die Kalibrier-Clips stehen im Bericht. Die Exporte dafür liegen
+in einem eigenen Cache (REPORT_CACHE_DIR) und verdrängen so nicht das
+auf allen Clips kalibrierte INT8-Modell der App.
+
+Damit lässt sich pro Standort entscheiden, ob sich INT8 lohnt.
+
+Start:  python int8_report.py
+"""
+
+import json
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# --- KONFIGURATION ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DETECTION_DIR = os.path.dirname(BASE_DIR)
+MODELS_DIR = os.path.join(DETECTION_DIR, "models")
+
+sys.path.insert(0, DETECTION_DIR)
+from model_backends import DEFAULT_IMGSZ, load_detection_model
+from int8_quantization import find_videos
+
+MODEL_NAME = "yolo26n-seg.pt"
+INPUT_ROOT = os.path.join(BASE_DIR, "input")
+OUTPUT_ROOT = os.path.join(BASE_DIR, "output")
+REPORT_CACHE_DIR = os.path.join(MODELS_DIR, "exports", "int8_report")
+
+IMGSZ = DEFAULT_IMGSZ
+CONF_THRESHOLD = 0.25   # Mindest-Wahrscheinlichkeit (0.0 - 1.0)
+FRAME_STRIDE = 5        # Nur jedes n-te Frame auswerten
+MAX_FRAMES_PER_CLIP = 200
+CALIBRATION_EVERY = 3   # Jeder n-te Clip kalibriert (ab dem ersten), der Rest wird verglichen
+# ---------------------
+
+
+def box_iou(boxes_a, boxes_b):
+    """Paarweise IoU zweier Box-Arrays (N x 4, M x 4) im xyxy-Format."""
+    tl = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    br = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.prod(np.clip(br - tl, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def match_boxes(boxes_a, boxes_b):
+    """Ordnet Boxen gierig nach höchster IoU zu. Liefert die IoU-Werte der Paare."""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return []
+    iou = box_iou(boxes_a, boxes_b)
+    matched = []
+    for _ in range(min(len(boxes_a), len(boxes_b))):
+        i, j = np.unravel_index(np.argmax(iou), iou.shape)
+        if iou[i, j] <= 0:
+            break
+        matched.append(float(iou[i, j]))
+        iou[i, :] = -1
+        iou[:, j] = -1
+    return matched
+
+
+def detect_persons(model, frame):
+    """Personen-Boxen eines Frames und die Inferenzzeit in Sekunden."""
+    start = time.perf_counter()
+    results = model.predict(frame, classes=[0], imgsz=IMGSZ, conf=CONF_THRESHOLD, verbose=False)
+    elapsed = time.perf_counter() - start
+    return results[0].boxes.xyxy.cpu().numpy(), elapsed
+
+
+def split_clips(videos):
+    """Teilt die Clips in (Kalibrierung, Vergleich) – disjunkt, beide nicht leer."""
+    calibration = videos[::CALIBRATION_EVERY]
+    evaluation = [video for video in videos if video not in calibration]
+    return calibration, evaluation
+
+
+def compare_clip(fp32_model, int8_model, video_path):
+    stats = {
+        "clip": os.path.relpath(video_path, INPUT_ROOT),
+        "frames": 0, "count_equal": 0, "count_abs_diff": 0,
+        "ious": [], "unmatched": 0, "time_fp32": 0.0, "time_int8": 0.0,
+    }
+    cap = cv2.VideoCapture(video_path)
+    frame_idx = 0
+    try:
+        while cap.isOpened() and stats["frames"] < MAX_FRAMES_PER_CLIP:
+            success, frame = cap.read()
+            if not success:
+                break
+            frame_idx += 1
+            if frame_idx % FRAME_STRIDE:
+                continue
+
+            boxes_fp32, t_fp32 = detect_persons(fp32_model, frame)
+            boxes_int8, t_int8 = detect_persons(int8_model, frame)
+            ious = match_boxes(boxes_fp32, boxes_int8)
+
+            stats["frames"] += 1
+            stats["count_equal"] += int(len(boxes_fp32) == len(boxes_int8))
+            stats["count_abs_diff"] += abs(len(boxes_fp32) - len(boxes_int8))
+            stats["ious"].extend(ious)
+            stats["unmatched"] += len(boxes_fp32) + len(boxes_int8) - 2 * len(ious)
+            stats["time_fp32"] += t_fp32
+            stats["time_int8"] += t_int8
+    finally:
+        cap.release()
+    return stats
+
+
+def summarize(stats):
+    frames = max(1, stats["frames"])
+    fps_fp32 = stats["frames"] / stats["time_fp32"] if stats["time_fp32"] else 0.0
+    fps_int8 = stats["frames"] / stats["time_int8"] if stats["time_int8"] else 0.0
+    return {
+        "clip": stats["clip"],
+        "frames": stats["frames"],
+        "count_agreement": stats["count_equal"] / frames,
+        "mean_abs_count_diff": stats["count_abs_diff"] / frames,
+        "mean_box_iou": float(np.mean(stats["ious"])) if stats["ious"] else None,
+        "matched_boxes": len(stats["ious"]),
+        "unmatched_boxes": stats["unmatched"],
+        "fps_fp32": fps_fp32,
+        "fps_int8": fps_int8,
+        "speedup": fps_int8 / fps_fp32 if fps_fp32 else None,
+    }
+
+
+def write_report(rows, calibration_clips, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    stem = f"int8_report_{MODEL_NAME.replace('.pt', '')}_{IMGSZ}"
+    json_path = os.path.join(output_dir, stem + ".json")
+    md_path = os.path.join(output_dir, stem + ".md")
+
+    with open(json_path, "w") as f:
+        json.dump({"model": MODEL_NAME, "imgsz": IMGSZ, "frame_stride": FRAME_STRIDE,
+                   "calibration_clips": calibration_clips, "clips": rows}, f, indent=2)
+
+    def fmt(value, pattern):
+        return "–" if value is None else pattern.format(value)
+
+    lines = [
+        f"# INT8 vs. FP32 – {MODEL_NAME} (imgsz {IMGSZ})",
+        "",
+        f"Kalibriert auf: {', '.join(calibration_clips)} (nicht im Vergleich)",
+        "",
+        "| Clip | Frames | Anzahl gleich | Ø Anzahl-Diff | Ø Box-IoU | Ungepaart | FPS FP32 | FPS INT8 | Speedup |",
+        "|---|---|---|---|---|---|---|---|---|",
+    ]
+    for row in rows:
+        lines.append(
+            f"| {row['clip']} | {row['frames']} | {row['count_agreement'] * 100:.1f} % "
+            f"| {row['mean_abs_count_diff']:.2f} | {fmt(row['mean_box_iou'], '{:.3f}')} "
+            f"| {row['unmatched_boxes']} | {row['fps_fp32']:.1f} | {row['fps_int8']:.1f} "
+            f"| {fmt(row['speedup'], '{:.2f}x')} |"
+        )
+    with open(md_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
+    return md_path
+
+
+# --- MAIN ---
+if __name__ == "__main__":
+    model_path = os.path.join(MODELS_DIR, MODEL_NAME)
+    video_files = find_videos(INPUT_ROOT)
+    if len(video_files) < 2:
+        print(f"Mindestens 2 Videos in '{INPUT_ROOT}' (Unterordner eingeschlossen) nötig: "
+              f"einer zum Kalibrieren, einer zum Vergleichen – gefunden: {len(video_files)}.")
+        sys.exit(1)
+    calibration_files, video_files = split_clips(video_files)
+    calibration_clips = [os.path.relpath(video, INPUT_ROOT) for video in calibration_files]
+    print(f"Kalibrier-Clips: {', '.join(calibration_clips)}")
+
+    print(f"Lade FP32- und INT8-Modell ({MODEL_NAME}, imgsz={IMGSZ})...")
+    fp32 = load_detection_model(model_path, "onnx", IMGSZ, cache_dir=REPORT_CACHE_DIR)
+    int8 = load_detection_model(model_path, "onnx-int8", IMGSZ, cache_dir=REPORT_CACHE_DIR,
+                                calibration_root=calibration_files)
+
+    # Aufwärmen, damit Session-Initialisierung nicht in die FPS eingeht
+    warmup_cap = cv2.VideoCapture(video_files[0])
+    try:
+        _, warmup_frame = warmup_cap.read()
+    finally:
+        warmup_cap.release()
+    if warmup_frame is not None:
+        detect_persons(fp32, warmup_frame)
+        detect_persons(int8, warmup_frame)
+
+    clip_stats = []
+    for video in video_files:
+        print(f"Vergleiche: {video}")
+        try:
+            clip_stats.append(compare_clip(fp32, int8, video))
+        except Exception as e:
+            print(f"Fehler bei {video}: {e}")
+
+    if clip_stats:
+        total = {"clip": "GESAMT", "frames": 0, "count_equal": 0, "count_abs_diff": 0,
+                 "ious": [], "unmatched": 0, "time_fp32": 0.0, "time_int8": 0.0}
+        for stats in clip_stats:
+            for key in total:
+                if key != "clip":
+                    total[key] += stats[key]
+        rows = [summarize(s) for s in clip_stats] + [summarize(total)]
+        report = write_report(rows, calibration_clips, OUTPUT_ROOT)
+        print(f"Bericht gespeichert unter: {report}")
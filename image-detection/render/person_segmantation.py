@@ -1,5 +1,6 @@
 import cv2
 import os
+import sys
 from ultralytics import YOLO
 from collections import defaultdict
 import numpy as np
@@ -10,6 +11,11 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 MODELS_DIR = os.path.join(os.path.dirname(BASE_DIR), "models")
 MODEL_NAME = "yolo12m-seg.pt" 
 
+# Gemeinsame Erkennungs-Module aus image-detection/
+sys.path.insert(0, os.path.dirname(BASE_DIR))
+from detection_profile import PROFILE_FULL, get_profile
+from track_palette import track_color
+
 INPUT_ROOT = os.path.join(BASE_DIR, "input")
 OUTPUT_ROOT = os.path.join(BASE_DIR, "output")
 
@@ -18,20 +24,13 @@ CONF_THRESHOLD = 0.25   # Mindest-Wahrscheinlichkeit (0.0 - 1.0)
 IOU_THRESHOLD = 0.5     # Overlap Threshold für NMS (0.0 - 1.0)
 CLASSES = [0]           # Klassen-Filter: 0 = Person. None für alle Klassen.
 PERSIST = True          # IDs über Frames behalten
+DETECTION_PROFILE = PROFILE_FULL  # count-only / boxes / full (Masken nur bei full)
 
 TRACK_HISTORY = defaultdict(lambda: [])
 MAX_TRAIL_LENGTH = 30
 # ---------------------
 
 
-def get_id_color(id):
-    """Generiert eine eindeutige Farbe basierend auf der Track-ID."""
-    np.random.seed(int(id))
-    # Zufällige Farbe (B, G, R)
-    color = np.random.randint(0, 255, 3).tolist()
-    return tuple(color)
-
-
 def get_next_output_folder(base_output_dir):
     """Ermittelt den nächsten numerischen Ordner (1, 2, 3...) im Output-Verzeichnis mit Modell-Suffix."""
     # .pt Endung entfernen für schöneren Ordnernamen
@@ -94,6 +93,7 @@ def process_video(video_path, output_folder):
     out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
 
     print(f"Verarbeite Video: {video_path}")
+    profile = get_profile(DETECTION_PROFILE)
 
     while cap.isOpened():
         success, frame = cap.read()
@@ -108,7 +108,7 @@ def process_video(video_path, output_folder):
             iou=IOU_THRESHOLD,
             classes=CLASSES,
             verbose=False,
-            retina_masks=True  # Hochauflösende Masken
+            retina_masks=profile.retina_masks  # Hochauflösende Masken (Profil "full")
         )
 
         # Frame kopieren für Annotationen
@@ -117,14 +117,14 @@ def process_video(video_path, output_folder):
         # Overlay für Transparenz erstellen
         overlay = frame.copy()
 
-        if results[0].boxes.id is not None and results[0].masks is not None:
+        if profile.annotate and results[0].boxes.id is not None and results[0].masks is not None:
             # IDs und Masken holen
             track_ids = results[0].boxes.id.int().cpu().tolist()
-            masks = results[0].masks.xy
+            masks = results[0].masks.xy if profile.draw_masks else []
             boxes_xywh = results[0].boxes.xywh.cpu()
 
             for i, track_id in enumerate(track_ids):
-                color = get_id_color(track_id)
+                color = track_color(track_id)
 
                 # 1. Maske zeichnen (wenn vorhanden)
                 if i < len(masks):
@@ -150,8 +150,8 @@ def process_video(video_path, output_folder):
             cv2.addWeighted(overlay, alpha, annotated_frame, 1 - alpha, 0, annotated_frame)
 
         # Fallback falls keine Masken da sind, aber Boxen
-        elif results[0].boxes.id is not None:
-            annotated_frame = results[0].plot()
+        elif profile.annotate and results[0].boxes.id is not None:
+            annotated_frame = results[0].plot(masks=profile.draw_masks)
 
         out.write(annotated_frame)
 
@@ -0,0 +1,45 @@
+"""
+Track-Palette: feste Farbe pro Track-ID
+=======================================
+Bisher wurde für jede Farbabfrage `np.random.seed(track_id)` gesetzt und
+neu gewürfelt – mehrfach pro Person und Frame. Das kostet Zeit und
+überschreibt nebenbei den globalen NumPy-Zufallszustand für alle anderen
+Nutzer im Prozess.
+
+Die Palette wird einmal beim Import berechnet: Farbtöne im Goldenen
+Winkel verteilt (aufeinanderfolgende IDs liegen weit auseinander),
+Sättigung und Helligkeit wechseln in kleinen Stufen. Abfragen sind
+ein Tabellenzugriff (Track-ID modulo Palettengröße), ohne Zufall.
+"""
+
+import colorsys
+
+PALETTE_SIZE = 64
+BRIGHT_BOOST = 40   # Aufhellung der HUD-Variante (Linien, Labels)
+
+_GOLDEN_RATIO = 0.618033988749895
+_SATURATIONS = (0.85, 0.65, 0.95)
+_VALUES = (0.95, 0.80, 0.70, 0.88)
+
+
+def _build_palette(size):
+    palette = []
+    for i in range(size):
+        hue = (i * _GOLDEN_RATIO) % 1.0
+        r, g, b = colorsys.hsv_to_rgb(hue, _SATURATIONS[i % len(_SATURATIONS)], _VALUES[i % len(_VALUES)])
+        palette.append((int(b * 255), int(g * 255), int(r * 255)))  # OpenCV: BGR
+    return tuple(palette)
+
+
+TRACK_COLORS = _build_palette(PALETTE_SIZE)
+TRACK_COLORS_BRIGHT = tuple(tuple(min(255, c + BRIGHT_BOOST) for c in color) for color in TRACK_COLORS)
+
+
+def track_color(track_id):
+    """BGR-Farbe (Tupel) für eine Track-ID."""
+    return TRACK_COLORS[int(track_id) % PALETTE_SIZE]
+
+
+def track_color_bright(track_id):
+    """Aufgehellte BGR-Farbe für HUD-Linien und Labels."""
+    return TRACK_COLORS_BRIGHT[int(track_id) % PALETTE_SIZE]
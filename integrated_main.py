@@ -19,9 +19,7 @@ Start:  python integrated_main.py
 
 import pygame
 import pygame.freetype
-from pygame import gfxdraw
 import cv2
-import numpy as np
 import math
 import sys
 import os
@@ -40,9 +38,18 @@ if getattr(sys, 'frozen', False):
     os.makedirs(_user_data, exist_ok=True)
     os.environ['YOLO_CONFIG_DIR'] = _user_data
     os.environ['ULTRALYTICS_CONFIG_DIR'] = _user_data
+    # Modell-Exporte (ONNX/OpenVINO) können nicht ins Bundle geschrieben werden
+    EXPORT_CACHE_DIR = os.path.join(_user_data, "exports")
+    ASSET_CACHE_DIR = os.path.join(_user_data, "asset_cache")
+    LOG_DIR = os.path.join(_user_data, "logs")
+    TIMING_FILE = os.path.join(_user_data, "crossing_timing.json")
 else:
     # Normaler Python-Aufruf
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+    EXPORT_CACHE_DIR = None  # Standard: image-detection/models/exports
+    ASSET_CACHE_DIR = None   # Standard: Interface/assets/cache
+    LOG_DIR = os.path.join(BASE_DIR, "logs")
+    TIMING_FILE = os.path.join(BASE_DIR, "crossing_timing.json")  # Von Interface/timing_optimizer.py
 
 SCRIPT_DIR = BASE_DIR
 INTERFACE_DIR = os.path.join(BASE_DIR, "Interface")
@@ -52,6 +59,23 @@ ASSET_DIR = os.path.join(INTERFACE_DIR, "assets")
 
 # Interface-Verzeichnis zum Python-Pfad hinzufügen (für esp_control Import)
 sys.path.insert(0, INTERFACE_DIR)
+# image-detection für gemeinsame Erkennungs-Module (motion_gate, ...)
+sys.path.insert(0, DETECTION_DIR)
+
+from motion_gate import MotionGate
+from model_backends import BACKENDS, DEFAULT_IMGSZ, load_detection_model
+from detection_profile import PROFILE_COUNT_ONLY, PROFILE_FULL, PROFILE_NAMES, get_profile
+from mask_compositor import MaskCompositor
+from buffer_pool import BufferPool, blend_rect
+from track_palette import track_color, track_color_bright
+from latency_stats import LATENCY
+from led_ring import LedRing, quantize_alpha
+from asset_cache import AssetCache, scaled_size
+from dirty_regions import DirtyRegions
+from status_bar import StatusBar
+from texture_renderer import TextureRenderer
+from crossing_engine import (CrossingConfig, CrossingEngine, EVENT_SLOW, EVENT_START, EVENT_TRAM_SENSOR,
+                             load_timing_file, STATE_CLEARANCE, STATE_GREEN, STATE_IDLE, STATE_RED, STATE_SAFETY_1, STATE_TRAM)
 
 # === Hardware-Module laden ===
 try:
@@ -82,6 +106,12 @@ except ImportError:
 MODEL_NAME = "yolo26n-seg.pt"
 DEBOUNCE_TIME = 0.25
 
+# --- Inferenz-Takt (Governor) ---
+INFERENCE_CPU_BUDGET = 0.5     # Anteil eines CPU-Kerns, den YOLO im Mittel belegen darf
+INFERENCE_MAX_HZ = 15.0        # Volle Rate: Personen im Bild oder laufender Ampelzyklus
+INFERENCE_IDLE_HZ = 2.0        # Ruhe-Rate: IDLE und niemand im Bild
+MOTION_REFRESH_INTERVAL = 1.0  # Spätestens so oft (s) wird trotz ruhiger Szene inferiert
+
 # --- Ampel-Zeiten ---
 SCALE_FACTOR = 0.3
 MAX_PERSON_CAP = 8
@@ -108,13 +138,24 @@ TIME_TRAM_GREEN_DURATION = 25000
 TIME_TRAM_YELLOW = 3000
 TIME_TRAM_SAFETY = 2000
 
-DURATION_RED_BASE_MS = int(TOTAL_LEDS_RED * SECONDS_PER_LED_RED * 1000)
+# --- Steuerungs-Takt ---
+CONTROL_HZ = 100                         # Fester Takt von Zustandsautomat, Entprellung und LED-Ausgabe
+CONTROL_STEP_MS = 1000 // CONTROL_HZ
+CONTROL_MAX_CATCHUP = 50                 # Mehr fehlende Schritte werden nicht nachgeholt (0,5 s)
+ESP_SENSOR_DEBOUNCE_TIME = 0.3           # 300ms Debounce für Sensoren
+
+# --- UI-Bildrate ---
+UI_FPS_ACTIVE = 60
+UI_FPS_IDLE = 8               # IDLE ohne Änderungen (z. B. nachts)
+UI_IDLE_AFTER_S = 3.0         # So lange muss alles ruhig sein, bevor gedrosselt wird
+UI_IDLE_POLL_S = 0.01         # Gedrosselt: so oft auf Events/Zustandswechsel prüfen
 
 # --- Optik ---
 TIMER_FONT_SIZE = 280
 ORIGINAL_LED_RADIUS = 235
 ORIGINAL_DOT_SIZE = 20
 WAITING_ICON_SCALE = 0.22
+ASSET_CACHE_SETTLE_S = 1.0    # So lange muss die Panel-Größe stehen, bevor skalierte Assets auf die Platte gehen
 
 OFFSET_ROT_Y = -230
 OFFSET_GRUEN_Y = 230
@@ -126,13 +167,6 @@ COLOR_LED_OFF = (40, 40, 40)
 COLOR_CLEARANCE = (255, 50, 50)
 COLOR_WALKER = (255, 255, 255)
 
-# --- Zustände ---
-STATE_IDLE = "IDLE"
-STATE_RED = "RED"
-STATE_SAFETY_1 = "SAFETY_1"
-STATE_GREEN = "GREEN"
-STATE_CLEARANCE = "CLEARANCE"
-STATE_TRAM = "TRAM"
 
 
 def debug_log(message):
@@ -173,24 +207,147 @@ class CountSmoother:
         return self.display_count
 
 
+class InferenceGovernor:
+    """
+    Wählt zur Laufzeit das Intervall zwischen zwei YOLO-Inferenzen.
+
+    Grundlage sind die gemessene Inferenzzeit (gleitender Mittelwert),
+    ein CPU-Budget (Anteil eines Kerns) und der aktuelle Ampelzustand:
+    Im IDLE ohne Personen im Bild reicht die Ruhe-Rate, sonst wird mit
+    voller Rate gearbeitet. Das Budget deckelt die Rate in jedem Fall.
+    Zwischen zwei Inferenzen bleiben die letzten Detektionen gültig; das
+    Kamerabild läuft in voller Kamera-Rate weiter und zeigt sie an.
+    """
+
+    def __init__(self, cpu_budget=INFERENCE_CPU_BUDGET, max_hz=INFERENCE_MAX_HZ, idle_hz=INFERENCE_IDLE_HZ):
+        self.cpu_budget = max(0.05, min(1.0, cpu_budget))
+        self.max_hz = max_hz
+        self.idle_hz = idle_hz
+        self.inference_s = 0.0       # Geglättete Dauer einer Inferenz
+        self.rate_hz = max_hz        # Zuletzt gewählte Rate
+        self.mode = "FULL"
+        self._state = STATE_IDLE
+        self._persons_waiting = 0
+        self._persons_in_view = 0
+        self._last_run = 0.0
+
+    def set_context(self, state, persons_waiting):
+        """Vom Main-Thread: aktueller Ampelzustand und (kombinierte) Personenanzahl."""
+        self._state = state
+        self._persons_waiting = persons_waiting
+
+    def record_inference(self, duration_s, persons_in_view):
+        """Vom Kamera-Thread: Dauer der letzten Inferenz und roh erkannte Personen."""
+        if self.inference_s == 0.0:
+            self.inference_s = duration_s
+        else:
+            self.inference_s = 0.8 * self.inference_s + 0.2 * duration_s
+        self._persons_in_view = persons_in_view
+
+    def interval(self):
+        """Aktuelles Soll-Intervall zwischen zwei Inferenzen in Sekunden."""
+        idle = (self._state == STATE_IDLE and self._persons_in_view == 0
+                and self._persons_waiting == 0)
+        target_hz = self.idle_hz if idle else self.max_hz
+        self.mode = "IDLE" if idle else "FULL"
+        if self.inference_s > 0:
+            budget_hz = self.cpu_budget / self.inference_s
+            if budget_hz < target_hz:
+                target_hz = budget_hz
+                self.mode = "BUDGET"
+        self.rate_hz = target_hz
+        return 1.0 / target_hz
+
+    def is_due(self, now):
+        """True, wenn seit der letzten Inferenz mindestens ein Intervall vergangen ist."""
+        if now - self._last_run >= self.interval():
+            self._last_run = now
+            return True
+        return False
+
+    def get_status(self):
+        return {
+            "rate_hz": self.rate_hz,
+            "cpu_budget": self.cpu_budget,
+            "inference_ms": self.inference_s * 1000.0,
+            "mode": self.mode,
+        }
+
+
+class LatestFrameSlot:
+    """
+    Ein-Platz-Puffer zwischen Aufnahme und Inferenz.
+    Hält immer nur das neueste Kamerabild samt Aufnahme-Zeitstempel.
+    Wird ein Frame überschrieben, bevor die Inferenz es abgeholt hat,
+    gilt es als verworfen und wird gezählt.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._timestamp = 0.0
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, frame, timestamp):
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._timestamp = timestamp
+            self.published += 1
+            self._cond.notify()
+
+    def take(self, timeout=0.1):
+        """Wartet auf ein neues Frame und entnimmt es. Liefert (None, 0.0) bei Timeout."""
+        with self._cond:
+            if self._frame is None:
+                self._cond.wait(timeout)
+            frame, timestamp = self._frame, self._timestamp
+            self._frame = None
+            return frame, timestamp
+
+
 class CameraDetector:
     """
     Führt YOLO-Personenerkennung in einem eigenen Thread aus.
     Stellt das annotierte Frame und die Personenanzahl bereit.
+
+    Aufnahme und Inferenz laufen getrennt: Der Capture-Thread leert den
+    Kamera-Puffer fortlaufend und legt nur das neueste Frame in einen
+    LatestFrameSlot. Der Inferenz-Thread arbeitet so immer auf dem
+    aktuellsten Bild statt auf veralteten Frames aus dem OpenCV-Puffer.
     """
 
-    def __init__(self, source=0, model_name=MODEL_NAME):
+    def __init__(self, source=0, model_name=MODEL_NAME, cpu_budget=INFERENCE_CPU_BUDGET, motion_gate=True,
+                 backend="torch", imgsz=DEFAULT_IMGSZ, profile=PROFILE_FULL):
         self.source = source
         self.model_name = model_name
+        self.backend = backend
+        self.imgsz = imgsz
         self.model = None
         self.cap = None
 
         self.lock = threading.Lock()
-        self._frame = None           # Aktuelles annotiertes Frame (BGR, numpy)
+        self._frame = None           # Aktuelles Anzeige-Frame (RGB, auf Panel-Größe skaliert, numpy)
+        self._frame_seq = 0          # Laufende Nummer des Anzeige-Frames (ändert sich nur bei neuem Bild)
+        self._display_size = None    # (w, h) des Kamera-Panels; None = Originalgröße
+        self._display_enabled = True # False: Kamerabild nicht sichtbar, kein Anzeige-Frame aufbereiten
         self._person_count = 0       # Geglättete Personenanzahl
         self._raw_count = 0
         self._running = False
         self._thread = None
+        self._capture_thread = None
+
+        self.frame_slot = LatestFrameSlot()
+        self._latency_ms = 0.0       # Aufnahme -> Ergebnis des zuletzt verarbeiteten Frames
+        self.governor = InferenceGovernor(cpu_budget=cpu_budget)
+        self.motion_gate = MotionGate(refresh_interval=MOTION_REFRESH_INTERVAL) if motion_gate else None
+        self._last_results = None    # Letztes YOLO-Ergebnis (wird bei ruhiger Szene weiterverwendet)
+        self.profile = get_profile(profile)
+        self.compositor = MaskCompositor(alpha=0.35)
+        self.pool = BufferPool()
+        self._consumer_frame = None  # Frame, das der UI-Thread gerade anzeigt (nicht zurückgeben!)
 
         self.smoother = CountSmoother()
 
@@ -199,7 +356,7 @@ class CameraDetector:
         Startet Kamera und YOLO.
         WICHTIG: Kamera wird im Main-Thread geöffnet (macOS-Anforderung
         für gebündelte .app – Kamera-Zugriff muss vom Main-Thread kommen).
-        Nur die YOLO-Verarbeitung läuft im Hintergrund-Thread.
+        Nur Aufnahme-Loop und YOLO-Verarbeitung laufen im Hintergrund.
         """
         if not YOLO_AVAILABLE:
             debug_log("YOLO nicht verfügbar - Kamera-Thread wird nicht gestartet.")
@@ -217,13 +374,22 @@ class CameraDetector:
                 debug_log(f"  MODELS_DIR existiert nicht!")
             return False
 
-        debug_log(f"Lade YOLO-Modell: {self.model_name}...")
+        debug_log(f"Lade YOLO-Modell: {self.model_name} (Backend: {self.backend})...")
         try:
-            self.model = YOLO(model_path)
+            self.model = load_detection_model(model_path, self.backend, self.imgsz,
+                                              cache_dir=EXPORT_CACHE_DIR, log=debug_log)
             debug_log("YOLO-Modell erfolgreich geladen.")
         except Exception as e:
-            debug_log(f"YOLO-Modell konnte nicht geladen werden: {e}")
-            return False
+            if self.backend == "torch":
+                debug_log(f"YOLO-Modell konnte nicht geladen werden: {e}")
+                return False
+            debug_log(f"Backend '{self.backend}' nicht nutzbar ({e}) – Fallback auf PyTorch.")
+            self.backend = "torch"
+            try:
+                self.model = YOLO(model_path)
+            except Exception as e:
+                debug_log(f"YOLO-Modell konnte nicht geladen werden: {e}")
+                return False
 
         # Kamera im Main-Thread öffnen (macOS erfordert das bei .app-Bundles)
         debug_log(f"Öffne Kamera {self.source} (Main-Thread)...")
@@ -231,6 +397,8 @@ class CameraDetector:
         if not self.cap.isOpened():
             debug_log(f"Kamera {self.source} konnte nicht geöffnet werden.")
             return False
+        # Interner OpenCV-Puffer so klein wie möglich (nicht jedes Backend unterstützt das)
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         # Test-Frame lesen um sicherzustellen dass die Kamera wirklich liefert
         test_ok, test_frame = self.cap.read()
@@ -240,67 +408,94 @@ class CameraDetector:
 
         debug_log(f"Kamera {self.source} geöffnet und liefert Frames ({test_frame.shape}).")
         self._running = True
+        self._capture_thread = threading.Thread(target=self._capture_run, daemon=True)
+        self._capture_thread.start()
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
         return True
 
-    def _get_track_color(self, track_id):
-        np.random.seed(int(track_id))
-        color = np.random.randint(0, 255, 3).tolist()
-        return tuple(color)
-
-    def _run(self):
-        """Haupt-Loop des Kamera-Threads."""
-        debug_log("Kamera-Thread gestartet.")
+    def _capture_run(self):
+        """Aufnahme-Loop: liest die Kamera so schnell sie liefert und veröffentlicht nur das neueste Frame."""
+        debug_log("Capture-Thread gestartet.")
         consecutive_failures = 0
-        try:
-          while self._running:
+        while self._running:
+            read_start = time.perf_counter()
             success, frame = self.cap.read()
+            LATENCY.record("capture", (time.perf_counter() - read_start) * 1000.0)
             if not success:
                 consecutive_failures += 1
                 if consecutive_failures > 100:
-                    debug_log("Kamera liefert dauerhaft keine Frames – Thread wird beendet.")
+                    debug_log("Kamera liefert dauerhaft keine Frames – Capture-Thread wird beendet.")
                     break
                 time.sleep(0.05)
                 continue
             consecutive_failures = 0
+            self.frame_slot.publish(frame, time.monotonic())
+        debug_log("Capture-Thread beendet.")
+
+    def _run(self):
+        """Haupt-Loop des Kamera-Threads."""
+        debug_log("Kamera-Thread gestartet.")
+        try:
+          while self._running:
+            frame, captured_at = self.frame_slot.take()
+            if frame is None:
+                if not self._capture_thread.is_alive():
+                    debug_log("Capture-Thread nicht mehr aktiv – Kamera-Thread wird beendet.")
+                    break
+                continue
+
+            # Governor: zwischen zwei fälligen Inferenzen bleiben die letzten Detektionen
+            # gültig – die Frames laufen trotzdem weiter in die Anzeige, nur ohne YOLO.
+            # Bei ausgeblendetem Kamerabild braucht sie niemand.
+            due = self.governor.is_due(time.monotonic())
+            if not due and not self._display_enabled and self._last_results is not None:
+                continue
 
             # Bild spiegeln (Spiegel-Modus für Ausstellung)
             frame = cv2.flip(frame, 1)
+            profile = self.profile
+
+            # Motion-Gate: bei unveränderter Szene das letzte Ergebnis weiterverwenden
+            inferred = ((due and (self.motion_gate is None or self.motion_gate.should_infer(frame)))
+                        or self._last_results is None)
+            if inferred:
+                # YOLO Tracking (hochaufgelöste Masken nur im Profil "full")
+                inference_start = time.perf_counter()
+                results = self.model.track(
+                    frame, classes=[0], persist=True, imgsz=self.imgsz,
+                    verbose=False, retina_masks=profile.retina_masks
+                )
+                inference_s = time.perf_counter() - inference_start
+                LATENCY.record("inference", inference_s * 1000.0)
+                self._last_results = results
+            else:
+                results = self._last_results
 
-            # YOLO Tracking mit Segmentierung
-            results = self.model.track(
-                frame, classes=[0], persist=True,
-                verbose=False, retina_masks=True
-            )
-
-            annotated = frame.copy()
+            # Profil "count-only": keine Annotation, Frame wird unverändert weitergegeben
+            annotate_start = time.perf_counter()
+            annotated = self.pool.copy(frame) if profile.annotate else frame
             h_frame, w_frame = annotated.shape[:2]
 
-            # Segmentierungs-Masken zeichnen
-            if results[0].boxes.id is not None and results[0].masks is not None:
+            if profile.annotate and results[0].boxes.id is not None:
                 track_ids = results[0].boxes.id.int().cpu().tolist()
 
-                for i, track_id in enumerate(track_ids):
-                    try:
-                        color = self._get_track_color(track_id)
-                        seg = results[0].masks.xy[i]
-                        if len(seg) > 0:
-                            seg = seg.astype(np.int32)
-                            overlay = annotated.copy()
-                            cv2.drawContours(overlay, [seg], -1, color, -1)
-                            cv2.addWeighted(overlay, 0.35, annotated, 0.65, 0, annotated)
-                            cv2.drawContours(annotated, [seg], -1, color, 2)
-                    except Exception:
-                        pass
-
-                # HUD-Boxen zeichnen (modernes Design)
+            # Segmentierungs-Masken zeichnen (alle Personen in einem Blend-Durchgang)
+            if profile.draw_masks and results[0].boxes.id is not None and results[0].masks is not None:
+                try:
+                    segs = results[0].masks.xy
+                    colors = [track_color(track_id) for track_id in track_ids[:len(segs)]]
+                    self.compositor.composite(annotated, segs, colors)
+                except Exception:
+                    pass
+
+            # HUD-Boxen zeichnen (modernes Design)
+            if profile.draw_boxes and results[0].boxes.id is not None:
                 boxes = results[0].boxes.xyxy.cpu().tolist()
                 for track_id, box in zip(track_ids, boxes):
                     x1, y1, x2, y2 = map(int, box)
-                    color = self._get_track_color(track_id)
-                    # Farbe aufhellen für bessere Sichtbarkeit
-                    bright = tuple(min(255, c + 40) for c in color)
+                    # Aufgehellte Palettenfarbe für bessere Sichtbarkeit
+                    bright = track_color_bright(track_id)
                     w = x2 - x1
                     h = y2 - y1
                     line_len = min(w, h) // 4
@@ -320,47 +515,139 @@ class CameraDetector:
                     label = f"Person #{track_id}"
                     font = cv2.FONT_HERSHEY_SIMPLEX
                     (lw, lh), baseline = cv2.getTextSize(label, font, 0.5, 1)
-                    label_bg = annotated.copy()
-                    cv2.rectangle(label_bg, (x1, y1 - 28), (x1 + lw + 14, y1 - 2), (20, 20, 20), -1)
-                    cv2.addWeighted(label_bg, 0.7, annotated, 0.3, 0, annotated)
+                    blend_rect(annotated, x1, y1 - 28, x1 + lw + 14, y1 - 2, (20, 20, 20), 0.7, self.pool)
                     cv2.putText(annotated, label, (x1 + 7, y1 - 10), font, 0.5,
                                 bright, 1, cv2.LINE_AA)
 
             # Personen zählen (nur class 0 = Person)
             boxes_cls = results[0].boxes.cls.int().cpu().tolist() if results[0].boxes.cls is not None else []
             raw_count = boxes_cls.count(0)
-            smooth_count = self.smoother.update(raw_count)
+            with LATENCY.span("smoothing"):
+                smooth_count = self.smoother.update(raw_count)
+            if inferred:
+                self.governor.record_inference(inference_s, raw_count)
 
             # ─── Dezentes Personen-HUD oben links ───
-            hud_w, hud_h = 200, 50
-            hud_overlay = annotated.copy()
-            cv2.rectangle(hud_overlay, (12, 12), (12 + hud_w, 12 + hud_h), (15, 15, 15), -1)
-            cv2.addWeighted(hud_overlay, 0.65, annotated, 0.35, 0, annotated)
-            cv2.rectangle(annotated, (12, 12), (12 + hud_w, 12 + hud_h), (60, 60, 60), 1, cv2.LINE_AA)
-            cv2.putText(annotated, f"Personen: {smooth_count}", (24, 46),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.85, (240, 240, 240), 2, cv2.LINE_AA)
+            if profile.annotate:
+                hud_w, hud_h = 200, 50
+                blend_rect(annotated, 12, 12, 12 + hud_w, 12 + hud_h, (15, 15, 15), 0.65, self.pool)
+                cv2.rectangle(annotated, (12, 12), (12 + hud_w, 12 + hud_h), (60, 60, 60), 1, cv2.LINE_AA)
+                cv2.putText(annotated, f"Personen: {smooth_count}", (24, 46),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.85, (240, 240, 240), 2, cv2.LINE_AA)
+            if profile.annotate:
+                LATENCY.record("annotate", (time.perf_counter() - annotate_start) * 1000.0)
+
+            # Einmal pro Ergebnis für die Anzeige aufbereiten statt in jedem Display-Frame;
+            # bei ausgeblendetem Kamerabild gar nicht (nur zählen)
+            display_frame = self._prepare_display_frame(annotated) if self._display_enabled else None
+            if profile.annotate:
+                self.pool.release(annotated)
 
             with self.lock:
-                self._frame = annotated
+                previous = self._frame
+                if display_frame is not None or previous is not None:
+                    self._frame = display_frame
+                    self._frame_seq += 1
+                # Abgelöstes Frame zurück in den Pool, sofern es nicht gerade angezeigt wird
+                if previous is not None and previous is not display_frame and previous is not self._consumer_frame:
+                    self.pool.release(previous)
                 self._person_count = smooth_count
                 self._raw_count = raw_count
+                self._latency_ms = (time.monotonic() - captured_at) * 1000.0
+            LATENCY.record("pipeline", self._latency_ms)
         except Exception as e:
           debug_log(f"FEHLER im Kamera-Thread: {e}")
           import traceback
           debug_log(traceback.format_exc())
         debug_log("Kamera-Thread beendet.")
 
+    def _prepare_display_frame(self, frame):
+        """
+        Frame auf die Panel-Größe einpassen (Seitenverhältnis bleibt) und nach RGB wandeln.
+        Ergebnis ist ein zusammenhängender Pool-Puffer, direkt für pygame.image.frombuffer.
+        """
+        h, w = frame.shape[:2]
+        target = self._display_size
+        if target:
+            scale = min(target[0] / w, target[1] / h)
+            size = (max(1, int(w * scale)), max(1, int(h * scale)))
+        else:
+            size = (w, h)
+
+        scaled = frame
+        if size != (w, h):
+            scaled = self.pool.acquire((size[1], size[0], 3))
+            cv2.resize(frame, size, dst=scaled)
+        rgb = self.pool.acquire((size[1], size[0], 3))
+        cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB, dst=rgb)
+        if scaled is not frame:
+            self.pool.release(scaled)
+        return rgb
+
+    def get_person_count(self):
+        """Thread-sicher: geglättete Personenanzahl (für den Steuerungs-Thread)."""
+        with self.lock:
+            return self._person_count
+
+    def set_display_size(self, width, height):
+        """Größe des Kamera-Panels setzen (wirkt ab dem nächsten Frame)."""
+        self._display_size = (width, height)
+
+    def set_display_enabled(self, enabled):
+        """Kamerabild sichtbar? Ausgeblendet wird kein Anzeige-Frame erzeugt (wirkt ab dem nächsten Frame)."""
+        self._display_enabled = enabled
+
     def get_frame_and_count(self):
-        """Thread-sicher: Frame und Personenanzahl abrufen."""
+        """
+        Thread-sicher: Anzeige-Frame (RGB, Panel-Größe), Personenanzahl und
+        Frame-Nummer abrufen. Die Nummer ändert sich nur bei einem neuen Bild.
+        Das Frame bleibt gültig, bis der nächste Aufruf ein neueres liefert –
+        erst dann geht das vorige zurück in den Puffer-Pool.
+        """
+        with LATENCY.span("handoff"), self.lock:
+            if self._frame is not self._consumer_frame:
+                if self._consumer_frame is not None:
+                    self.pool.release(self._consumer_frame)
+                self._consumer_frame = self._frame
+            return self._frame, self._person_count, self._frame_seq
+
+    def set_profile(self, name):
+        """Erkennungs-Profil wechseln (wirkt ab dem nächsten Frame)."""
+        if name != self.profile.name:
+            debug_log(f"Erkennungs-Profil: {name}")
+            self.profile = get_profile(name)
+
+    def set_traffic_context(self, state, person_count):
+        """Ampelzustand an den Inferenz-Governor weitergeben."""
+        self.governor.set_context(state, person_count)
+
+    def get_stats(self):
+        """Thread-sicher: Pipeline-Kennzahlen (verworfene Frames, Latenz, Governor)."""
         with self.lock:
-            return self._frame, self._person_count
+            latency_ms = self._latency_ms
+        stats = {
+            "frames_captured": self.frame_slot.published,
+            "frames_dropped": self.frame_slot.dropped,
+            "latency_ms": latency_ms,
+        }
+        stats.update(self.governor.get_status())
+        if self.motion_gate:
+            stats.update(self.motion_gate.get_stats())
+        stats.update(self.pool.get_stats())
+        return stats
 
     def stop(self):
         self._running = False
         if self._thread:
             self._thread.join(timeout=3)
+        if self._capture_thread:
+            self._capture_thread.join(timeout=3)
         if self.cap:
             self.cap.release()
+        pool_stats = self.pool.get_stats()
+        debug_log(f"Puffer-Pool: {pool_stats['buffers_held']} gehalten, "
+                  f"{pool_stats['buffers_reused']} wiederverwendet, "
+                  f"{pool_stats['buffers_allocated']} neu angelegt.")
 
 
 # ==========================================
@@ -380,6 +667,28 @@ class TrafficInterface:
         self.center_y = 0
         self.led_radius = 0
         self.dot_size_base = 0
+        self.led_ring = None
+        # Dateiname + Basis-Skalierung je Asset; skalierte Bilder kommen aus dem
+        # Platten-Cache und werden nur bei Größenänderung des Panels neu geholt
+        self.assets = None
+        self._sources = {}
+        self._waiting_files = []
+        self.scale = 0.0             # Anzeige-Skalierung relativ zur Asset-Größe (SCALE_FACTOR)
+        self._panel_size = None      # Panel-Größe des letzten set_target_size()-Aufrufs
+        self._persist_at = None      # Zeitpunkt (monotonic), ab dem die aktuelle Größe in den Asset-Cache darf
+        self.surface = None          # Persistentes Ziel-Surface in Panel-Auflösung
+        # Ebenen-Cache (siehe render): Basis, Zustands-Ebene + deren Schlüssel, Ziffern
+        self._base = None
+        self._layer = None
+        self._layer_key = None
+        self._digit_cache = {}
+        self._tram_breath = None
+        self._frame_key = None       # Bild-Schlüssel des letzten render()-Aufrufs
+        self.changed = True          # Hat der letzte render()-Aufruf das Surface verändert?
+        self.offset_rot_y = OFFSET_ROT_Y
+        self.offset_gruen_y = OFFSET_GRUEN_Y
+        self.offset_ring_y = OFFSET_RING_Y
+        self.offset_tram_y = OFFSET_TRAM_Y
 
     def load_images(self):
         """Lädt alle Assets und berechnet Dimensionen."""
@@ -387,180 +696,487 @@ class TrafficInterface:
             debug_log(f"Asset-Verzeichnis nicht gefunden: {ASSET_DIR}")
             sys.exit(1)
 
-        self.images['housing'] = self._load_img('gehaeuse.png')
-        self.images['red_on'] = self._load_img('mann_rot_an.png')
-        self.images['red_off'] = self._load_img('mann_rot_aus.png')
-        self.images['green_on'] = self._load_img('mann_gruen_an.png')
-        self.images['green_off'] = self._load_img('mann_gruen_aus.png')
-        self.images['tram'] = self._load_img('tram.png', scale=SCALE_FACTOR * 0.7)
-
-        for i in range(1, MAX_VISUAL_PERSONS + 1):
-            img = self._load_img(f'waiting_{i}.png', scale=WAITING_ICON_SCALE, optional=True)
-            self.waiting_images.append(img)
+        self.assets = AssetCache(ASSET_DIR, ASSET_CACHE_DIR, log=debug_log)
+        self._sources['housing'] = ('gehaeuse.png', SCALE_FACTOR)
+        self._sources['red_on'] = ('mann_rot_an.png', SCALE_FACTOR)
+        self._sources['red_off'] = ('mann_rot_aus.png', SCALE_FACTOR)
+        self._sources['green_on'] = ('mann_gruen_an.png', SCALE_FACTOR)
+        self._sources['green_off'] = ('mann_gruen_aus.png', SCALE_FACTOR)
+        self._sources['tram'] = ('tram.png', SCALE_FACTOR * 0.7)
+        for filename, _ in self._sources.values():
+            if not self.assets.exists(filename):
+                debug_log(f"Datei fehlt: {self.assets.path(filename)}")
+                sys.exit(1)
+
+        self._waiting_files = [f'waiting_{i}.png' for i in range(1, MAX_VISUAL_PERSONS + 1)]
+
+        self._apply_scale(1.0)
+        self._panel_size = None
+        stats = self.assets.get_stats()
+        debug_log(f"Assets: {stats['hits']} aus dem Cache, {stats['misses']} neu skaliert ({stats['cache_dir']}).")
+
+    def _apply_scale(self, scale, persist=True):
+        """
+        Skaliert Assets und Geometrie auf `scale` (1.0 = bisherige Asset-Größe).
+        persist=False: neu skalierte Assets nur im Speicher (Zwischengröße beim Resize).
+        """
+        self.scale = scale
+        for key, (filename, base_scale) in self._sources.items():
+            self.images[key] = self.assets.image(filename, base_scale * scale, persist=persist)
+        self.waiting_images = self.assets.atlas(self._waiting_files, WAITING_ICON_SCALE * scale, persist=persist)
 
         self.width = self.images['housing'].get_width()
         self.height = self.images['housing'].get_height()
         self.center_x = self.width // 2
         self.center_y = self.height // 2
-        self.led_radius = int(ORIGINAL_LED_RADIUS * SCALE_FACTOR)
-        self.dot_size_base = max(2, int(ORIGINAL_DOT_SIZE * SCALE_FACTOR))
-        self.game_font = pygame.freetype.SysFont("Arial", int(TIMER_FONT_SIZE * SCALE_FACTOR), bold=True)
-
-    def _load_img(self, filename, scale=SCALE_FACTOR, optional=False):
-        path = os.path.join(ASSET_DIR, filename)
-        if not os.path.exists(path):
-            if optional:
-                return None
-            debug_log(f"Datei fehlt: {path}")
-            sys.exit(1)
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.smoothscale(img, (int(img.get_width() * scale), int(img.get_height() * scale)))
+        self.offset_rot_y = int(round(OFFSET_ROT_Y * scale))
+        self.offset_gruen_y = int(round(OFFSET_GRUEN_Y * scale))
+        self.offset_ring_y = int(round(OFFSET_RING_Y * scale))
+        self.offset_tram_y = int(round(OFFSET_TRAM_Y * scale))
+        self.led_radius = int(ORIGINAL_LED_RADIUS * SCALE_FACTOR * scale)
+        self.dot_size_base = max(2, int(ORIGINAL_DOT_SIZE * SCALE_FACTOR * scale))
+        self.led_ring = LedRing(self.led_radius, self.dot_size_base, glow=True, color_on=COLOR_LED_ON,
+                                color_off=COLOR_LED_OFF, color_clearance=COLOR_CLEARANCE)
+        self.game_font = pygame.freetype.SysFont("Arial", max(8, int(TIMER_FONT_SIZE * SCALE_FACTOR * scale)),
+                                                 bold=True)
+        self.surface = pygame.Surface((self.width, self.height))
+        # Ebenen nach Skalierung neu aufbauen
+        self._base = None
+        self._layer = pygame.Surface((self.width, self.height))
+        self._layer_key = None
+        self._digit_cache = {}
+        self._tram_breath = self.images['tram'].copy() if self.images.get('tram') else None
+        self._frame_key = None
+
+    def set_target_size(self, max_w, max_h):
+        """
+        Passt die Ansicht an das Panel an (größtmöglich, Seitenverhältnis bleibt).
+        Kostet nur bei tatsächlicher Größenänderung etwas (VIDEORESIZE, Vollbild-Wechsel).
+        """
+        # Gleiches Panel -> gleiche Ansicht; kein Vergleich über Float-Rundungen nötig
+        if (max_w, max_h) == self._panel_size:
+            if self._persist_at is not None and time.monotonic() >= self._persist_at:
+                # Größe steht – erst jetzt auf die Platte, nicht bei jedem Zwischenschritt eines Resize
+                self._persist_at = None
+                written = self.assets.flush()
+                if written:
+                    debug_log(f"Asset-Cache: {written} Einträge für {self.width}x{self.height} gespeichert.")
+            return
+        self._panel_size = (max_w, max_h)
+        filename, base_scale = self._sources['housing']
+        housing_size = self.assets.source_size(filename)
+        base_w = housing_size[0] * base_scale
+        base_h = housing_size[1] * base_scale
+        scale = min(max_w / base_w, max_h / base_h)
+        if scale <= 0:
+            return
+        if scaled_size(housing_size, base_scale * scale) == (self.width, self.height):
+            return
+        self._apply_scale(scale, persist=False)
+        self._persist_at = time.monotonic() + ASSET_CACHE_SETTLE_S
+        debug_log(f"Ampel-Ansicht neu skaliert: {self.width}x{self.height} (Faktor {scale:.2f})")
 
     def draw_crowd_image(self, surface, person_count):
         if person_count <= 0:
             return
         idx = min(person_count, MAX_VISUAL_PERSONS) - 1
         if self.waiting_images and 0 <= idx < len(self.waiting_images) and self.waiting_images[idx]:
-            rect = self.waiting_images[idx].get_rect(center=(self.center_x, self.center_y + OFFSET_RING_Y))
+            rect = self.waiting_images[idx].get_rect(center=(self.center_x, self.center_y + self.offset_ring_y))
             surface.blit(self.waiting_images[idx], rect)
         else:
             text = str(person_count)
-            self.game_font.render_to(surface, (self.center_x - 10, self.center_y + OFFSET_RING_Y - 10), text, (255, 255, 255))
+            text_offset = int(10 * self.scale)
+            self.game_font.render_to(surface, (self.center_x - text_offset, self.center_y + self.offset_ring_y - text_offset),
+                                     text, (255, 255, 255))
 
     def draw_countdown_timer(self, surface, remaining_ms):
         seconds = math.ceil(remaining_ms / 1000)
         if seconds < 1:
             seconds = 1
         text = str(seconds)
-        text_rect = self.game_font.get_rect(text)
-        x = self.center_x - (text_rect.width // 2)
-        y = self.center_y + OFFSET_RING_Y - (text_rect.height // 2)
-        self.game_font.render_to(surface, (x, y), text, (255, 255, 255))
-
-    def draw_led_ring(self, surface, active_leds, total_leds, state, breathing_alpha=255):
-        ring_center_y = self.center_y + OFFSET_RING_Y
-        current_dot_size = self.dot_size_base
-        if total_leds > 60:
-            current_dot_size = max(2, int(self.dot_size_base * (60 / total_leds)))
-
-        # Glow-Größe für beleuchtete Punkte (sehr dezent)
-        glow_radius = current_dot_size + 2
-
-        for i in range(total_leds):
-            angle = math.radians(-90 + (360 / total_leds) * i)
-            x_int = int(self.center_x + self.led_radius * math.cos(angle))
-            y_int = int(ring_center_y + self.led_radius * math.sin(angle))
-
-            is_lit = False
-            current_color = COLOR_LED_OFF
-
-            if state == STATE_GREEN:
-                leds_gone = total_leds - active_leds
-                shifted_i = (i - 1) % total_leds
-                if shifted_i >= leds_gone:
-                    is_lit = True
-                    current_color = COLOR_LED_ON
-            elif state == STATE_RED:
-                if i < active_leds:
-                    is_lit = True
-                    current_color = COLOR_LED_ON
-            elif state == STATE_TRAM:
-                leds_gone = total_leds - active_leds
-                shifted_i = (i - 1) % total_leds
-                if shifted_i >= leds_gone:
-                    is_lit = True
-                    current_color = COLOR_LED_ON
-            elif state == STATE_CLEARANCE:
-                is_lit = True
-                current_color = COLOR_CLEARANCE
-            elif state == STATE_SAFETY_1:
-                is_lit = True
-                current_color = COLOR_LED_ON
-
-            if is_lit:
-                # Alle beleuchteten Dots über SRCALPHA-Surface rendern (verhindert schwarze Vierecke)
-                dot_alpha = breathing_alpha if state == STATE_CLEARANCE else 255
-                r, g, b = current_color
-
-                # Dezenter Glow-Effekt hinter dem Punkt
-                glow_surf_size = (glow_radius * 2) + 4
-                glow_center = glow_surf_size // 2
-                glow_surf = pygame.Surface((glow_surf_size, glow_surf_size), pygame.SRCALPHA)
-                glow_color = (r, g, b, max(10, dot_alpha // 8))
-                pygame.draw.circle(glow_surf, glow_color, (glow_center, glow_center), glow_radius)
-                surface.blit(glow_surf, (x_int - glow_center, y_int - glow_center))
-
-                # Hauptpunkt
-                dot_surf_size = (current_dot_size * 2) + 4
-                dot_center = dot_surf_size // 2
-                dot_surf = pygame.Surface((dot_surf_size, dot_surf_size), pygame.SRCALPHA)
-                pygame.draw.circle(dot_surf, (r, g, b, dot_alpha), (dot_center, dot_center), current_dot_size)
-                surface.blit(dot_surf, (x_int - dot_center, y_int - dot_center))
-            else:
-                # Inaktive Dots – dezent ohne Glow
-                gfxdraw.filled_circle(surface, x_int, y_int, current_dot_size, COLOR_LED_OFF)
-                gfxdraw.aacircle(surface, x_int, y_int, current_dot_size, COLOR_LED_OFF)
+        # Ziffern werden nur einmal pro Wert und Skalierung gerendert
+        digit_surf = self._digit_cache.get(text)
+        if digit_surf is None:
+            digit_surf, _ = self.game_font.render(text, (255, 255, 255))
+            self._digit_cache[text] = digit_surf
+        x = self.center_x - (digit_surf.get_width() // 2)
+        y = self.center_y + self.offset_ring_y - (digit_surf.get_height() // 2)
+        surface.blit(digit_surf, (x, y))
+
+    def draw_led_ring(self, surface, active_leds, total_leds, state, breathing_alpha=255, draw_off=True):
+        # Vorgerenderte Sprites, ein Surface.blits-Aufruf pro Ring (siehe led_ring.py)
+        self.led_ring.draw(surface, self.center_x, self.center_y + self.offset_ring_y,
+                           active_leds, total_leds, state, breathing_alpha, draw_off)
+
+    def _state_layer(self, p_green, overlay, person_count, unlit_ring=True):
+        """
+        Zustands-Ebene: Gehäuse (statische Basis), Ampelmännchen, Crowd-/Tram-Icon
+        und der unbeleuchtete Ring. Wird nur neu aufgebaut, wenn sich eine
+        dieser Eingaben ändert – in einer typischen Rotphase also praktisch nie.
+        unlit_ring=False lässt den Ring weg (Räumzeit: alle LEDs leuchten halbtransparent).
+        """
+        key = (p_green == 1, overlay, person_count if overlay == "crowd" else 0, unlit_ring)
+        if key == self._layer_key:
+            return self._layer
 
-    def render(self, state, visual_active_leds, person_count, p_green, clearance_alpha, now,
-               clearance_start_time, tram_active, green_leds_left_float):
-        """Rendert die komplette Ampel-Ansicht auf ein eigenes Surface."""
-        surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        surface.fill((0, 0, 0, 255))
+        if self._base is None:
+            # Statische Basis: Gehäuse auf Schwarz (nur pro Skalierung neu)
+            self._base = pygame.Surface((self.width, self.height))
+            self._base.fill((0, 0, 0))
+            housing_rect = self.images['housing'].get_rect(center=(self.center_x, self.center_y))
+            self._base.blit(self.images['housing'], housing_rect)
 
-        # Gehäuse
-        housing_rect = self.images['housing'].get_rect(center=(self.center_x, self.center_y))
-        surface.blit(self.images['housing'], housing_rect)
+        layer = self._layer
+        layer.blit(self._base, (0, 0))
 
-        pos_rot = (self.center_x, self.center_y + OFFSET_ROT_Y)
-        pos_gruen = (self.center_x, self.center_y + OFFSET_GRUEN_Y)
-        pos_tram = (self.center_x, self.center_y + OFFSET_TRAM_Y)
+        pos_rot = (self.center_x, self.center_y + self.offset_rot_y)
+        pos_gruen = (self.center_x, self.center_y + self.offset_gruen_y)
+        pos_tram = (self.center_x, self.center_y + self.offset_tram_y)
 
         # Ampelmännchen
         if p_green == 1:
-            surface.blit(self.images['red_off'], self.images['red_off'].get_rect(center=pos_rot))
-            surface.blit(self.images['green_on'], self.images['green_on'].get_rect(center=pos_gruen))
+            layer.blit(self.images['red_off'], self.images['red_off'].get_rect(center=pos_rot))
+            layer.blit(self.images['green_on'], self.images['green_on'].get_rect(center=pos_gruen))
         else:
-            surface.blit(self.images['red_on'], self.images['red_on'].get_rect(center=pos_rot))
-            surface.blit(self.images['green_off'], self.images['green_off'].get_rect(center=pos_gruen))
+            layer.blit(self.images['red_on'], self.images['red_on'].get_rect(center=pos_rot))
+            layer.blit(self.images['green_off'], self.images['green_off'].get_rect(center=pos_gruen))
 
-        # Zustands-abhängiges Rendering
+        if overlay == "tram":
+            layer.blit(self.images['tram'], self.images['tram'].get_rect(center=pos_tram))
+        elif overlay == "crowd":
+            self.draw_crowd_image(layer, person_count)
+
+        # Unbeleuchteter Ring; leuchtende LEDs kommen pro Frame darüber
+        if unlit_ring:
+            self.draw_led_ring(layer, 0, VISUAL_LED_COUNT, STATE_IDLE)
+        self._layer_key = key
+        return layer
+
+    def render(self, state, visual_active_leds, person_count, p_green, clearance_alpha, now,
+               clearance_remaining_ms, tram_active, green_leds_left_float):
+        """
+        Rendert die komplette Ampel-Ansicht in das persistente Surface (Panel-Auflösung).
+        Pro Frame: eine Kopie der gecachten Zustands-Ebene plus leuchtende LEDs,
+        Countdown-Ziffern bzw. das pulsierende Tram-Icon.
+
+        Sieht das Bild genauso aus wie beim letzten Aufruf, bleibt das Surface
+        unangetastet und `self.changed` ist False (für Dirty-Rect-Updates).
+        """
+        surface = self.surface
+        tram_breathing = state == STATE_GREEN and tram_active and self.images.get('tram')
+
+        # Zustands-abhängige Ebene
         if state == STATE_TRAM:
-            tram_rect = self.images['tram'].get_rect(center=pos_tram)
-            surface.blit(self.images['tram'], tram_rect)
-            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_TRAM, 255)
+            overlay = "tram"
+        elif state == STATE_CLEARANCE or tram_breathing:
+            overlay = None
+        else:
+            # Personen-Icons (auch während Grünphase)
+            overlay = "crowd"
+
+        # Alles, was das Bild bestimmt – gleiche Werte ergeben dasselbe Bild
+        ring_leds = visual_active_leds if state in (STATE_TRAM, STATE_GREEN, STATE_RED) else 0
+        ring_alpha = quantize_alpha(clearance_alpha) if state == STATE_CLEARANCE else 255
+        countdown = max(1, math.ceil(clearance_remaining_ms / 1000)) if state == STATE_CLEARANCE else 0
+        breath_alpha = int(153 + 102 * math.sin(now * 0.003)) if tram_breathing else 0
+        frame_key = (state, p_green == 1, overlay, person_count if overlay == "crowd" else 0,
+                     ring_leds, ring_alpha, countdown, breath_alpha)
+        self.changed = frame_key != self._frame_key
+        if not self.changed:
+            return surface
+        self._frame_key = frame_key
+
+        surface.blit(self._state_layer(p_green, overlay, person_count, state != STATE_CLEARANCE), (0, 0))
+
+        # Pro-Frame-Ebene
+        if state == STATE_TRAM:
+            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_TRAM, 255, draw_off=False)
 
         elif state == STATE_CLEARANCE:
-            self.draw_led_ring(surface, VISUAL_LED_COUNT, VISUAL_LED_COUNT, STATE_CLEARANCE, clearance_alpha)
-            time_left = TIME_CLEARANCE - (now - clearance_start_time)
-            self.draw_countdown_timer(surface, time_left)
+            self.draw_led_ring(surface, VISUAL_LED_COUNT, VISUAL_LED_COUNT, STATE_CLEARANCE, ring_alpha,
+                               draw_off=False)
+            self.draw_countdown_timer(surface, clearance_remaining_ms)
 
         elif state == STATE_GREEN:
-            if tram_active and self.images.get('tram'):
-                breath_alpha = int(153 + 102 * math.sin(now * 0.003))
-                tram_surf = self.images['tram'].copy()
-                tram_surf.set_alpha(breath_alpha)
-                tram_rect = tram_surf.get_rect(center=pos_tram)
-                surface.blit(tram_surf, tram_rect)
-            else:
-                # Personen-Icons auch während Grünphase anzeigen
-                self.draw_crowd_image(surface, person_count)
-            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_GREEN, 255)
+            if tram_breathing:
+                self._tram_breath.set_alpha(breath_alpha)
+                pos_tram = (self.center_x, self.center_y + self.offset_tram_y)
+                surface.blit(self._tram_breath, self._tram_breath.get_rect(center=pos_tram))
+            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_GREEN, 255, draw_off=False)
 
         elif state == STATE_RED:
-            self.draw_crowd_image(surface, person_count)
-            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_RED, 255)
+            self.draw_led_ring(surface, visual_active_leds, VISUAL_LED_COUNT, STATE_RED, 255, draw_off=False)
 
         elif state == STATE_SAFETY_1:
-            self.draw_crowd_image(surface, person_count)
-            self.draw_led_ring(surface, VISUAL_LED_COUNT, VISUAL_LED_COUNT, STATE_RED, 255)
-
-        elif state == STATE_IDLE:
-            self.draw_crowd_image(surface, person_count)
-            self.draw_led_ring(surface, 0, VISUAL_LED_COUNT, STATE_IDLE, 255)
+            self.draw_led_ring(surface, VISUAL_LED_COUNT, VISUAL_LED_COUNT, STATE_RED, 255, draw_off=False)
 
         return surface
 
 
+class FrameRatePolicy:
+    """
+    Adaptive Bildrate des UI-Threads.
+
+    Im Zustand IDLE, wenn sich UI_IDLE_AFTER_S lang weder Kamera- noch
+    Sensor-Zählung geändert haben, zeichnet das Fenster nur noch mit
+    UI_FPS_IDLE. Jedes Pygame-Event, jeder Zustandswechsel und jede neue
+    Zählung weckt es sofort wieder auf volle Rate (UI_FPS_ACTIVE).
+    Die Steuerung läuft in ihrem eigenen Takt und ist davon unberührt.
+    """
+
+    def __init__(self, active_fps=UI_FPS_ACTIVE, idle_fps=UI_FPS_IDLE, idle_after_s=UI_IDLE_AFTER_S):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after_s = idle_after_s
+        self.clock = pygame.time.Clock()
+        self.idle = False
+        self._activity = None
+        self._last_activity = time.monotonic()
+        self._last_frame = time.monotonic()
+
+    def note_activity(self):
+        """Sofort zurück auf volle Rate (z. B. bei Tastendruck oder Fenster-Event)."""
+        self._last_activity = time.monotonic()
+        self.idle = False
+
+    def update(self, state, activity_key):
+        """
+        Mit dem aktuellen Zustand und allem, was auf Aktivität hindeutet
+        (z. B. Personenzahlen), aufrufen. Gibt True zurück, wenn gedrosselt wird.
+        """
+        now = time.monotonic()
+        if state != STATE_IDLE or activity_key != self._activity:
+            self._activity = activity_key
+            self._last_activity = now
+        self.idle = state == STATE_IDLE and now - self._last_activity >= self.idle_after_s
+        return self.idle
+
+    def tick(self, activity=None):
+        """
+        Auf das nächste Frame warten. Gedrosselt wird in kurzen Schritten gewartet,
+        damit ein Pygame-Event oder eine Änderung von `activity()` (gleicher
+        Schlüssel wie bei update()) das Warten sofort abbricht.
+        """
+        if self.idle:
+            deadline = self._last_frame + 1.0 / self.idle_fps
+            while time.monotonic() < deadline:
+                if pygame.event.peek() or (activity and activity() != self._activity):
+                    self.note_activity()
+                    break
+                time.sleep(min(UI_IDLE_POLL_S, max(0.0, deadline - time.monotonic())))
+            self.clock.tick()
+        else:
+            self.clock.tick(self.active_fps)
+        self._last_frame = time.monotonic()
+
+    @property
+    def fps(self):
+        return self.clock.get_fps()
+
+
+# ==========================================
+#      STEUERUNG (fester Takt, eigener Thread)
+# ==========================================
+
+class CrossingController:
+    """
+    Ampel-Steuerung mit festem Takt (CONTROL_HZ) auf der monotonen Uhr.
+
+    Zustandsautomat (CrossingEngine), Sensor-Entprellung und LED-Ausgabe an
+    den ESP laufen in einem eigenen Thread. Jeder Schritt rechnet mit genau CONTROL_STEP_MS;
+    kommt der Thread in Verzug, werden die fehlenden Schritte nachgeholt
+    (Catch-up). Langsames Rendern oder GC-Pausen im UI-Thread verlängern
+    so keine Ampelphasen mehr und verzögern keine LED-Updates.
+
+    Lampenwechsel warten nicht auf den nächsten Takt: der Fahrplan des
+    Automaten (`engine.next_lamp_change_ms()`) sagt, wann die nächste
+    Änderung fällig ist; liegt sie zwischen zwei Takten, wird genau dann
+    ein Teilschritt gerechnet und an den ESP gesendet. Der Rest des
+    Intervalls folgt im regulären Schritt – die Summe der Schritte bleibt gleich.
+
+    Der UI-Thread schickt Tasten-Befehle per `post()` und liest den
+    Zustand per `snapshot()` – in welcher Bildrate auch immer.
+    """
+
+    def __init__(self, detector, esp=None, config=None):
+        self.detector = detector
+        self.esp = esp
+        self.lock = threading.Lock()
+        self._commands = []
+        self._running = False
+        self._thread = None
+        self._snapshot = None
+
+        self.steps = 0
+        self.catchup_steps = 0
+        self.lamp_substeps = 0
+        self.resyncs = 0
+
+        # Zustandsautomat (Interface/crossing_engine.py); die Steuerungs-Uhr ist engine.now
+        self.engine = CrossingEngine(config or CrossingConfig.from_constants(globals()), log=debug_log)
+        self.camera_person_count = 0
+        self.esp_sensor_person_count = 0
+        self.last_esp_values = None
+        self.esp_pulsing = False
+
+        # ESP Hall-Sensor Debouncing
+        self.esp_sensor_debounce_values = [0] * 8   # Geglättete Sensorwerte
+        self.esp_sensor_pending = [0] * 8           # Anstehende Werte
+        self.esp_sensor_pending_time = [0.0] * 8    # Zeitstempel der letzten Änderung
+
+        self._publish()
+
+    # --- Schnittstelle zum UI-Thread ---
+
+    def post(self, command):
+        """Tasten-Befehl ("start", "tram", "slow", "person_up", "person_down") einreihen."""
+        with self.lock:
+            self._commands.append(command)
+
+    def snapshot(self):
+        """Konsistenter Stand des letzten Schritts (dict, wird nicht mehr verändert)."""
+        with self.lock:
+            return self._snapshot
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=3)
+        debug_log(f"Steuerung: {self.steps} Schritte à {CONTROL_STEP_MS} ms, "
+                  f"{self.lamp_substeps} Teilschritte für Lampenwechsel, "
+                  f"{self.catchup_steps} nachgeholt, {self.resyncs}x neu synchronisiert.")
+
+    # --- Takt ---
+
+    def _run(self):
+        """Fester Takt mit Catch-up: pro verstrichenem Intervall genau ein Schritt."""
+        debug_log(f"Steuerungs-Thread gestartet ({CONTROL_HZ} Hz).")
+        step_s = CONTROL_STEP_MS / 1000.0
+        next_tick = time.monotonic()
+        step_done = 0   # ms des laufenden Intervalls, die schon per Teilschritt gerechnet sind
+        while self._running:
+            now_s = time.monotonic()
+            if now_s < next_tick:
+                # Lampenwechsel vor dem nächsten Takt? Dann genau zum Wechsel einen Teilschritt
+                change = self.engine.next_lamp_change_ms()
+                delta = max(1, math.ceil(change)) if change is not None else CONTROL_STEP_MS
+                if step_done + delta < CONTROL_STEP_MS:
+                    change_s = next_tick - step_s + (step_done + delta) / 1000.0
+                    if now_s < change_s:
+                        time.sleep(change_s - now_s)
+                    with LATENCY.span("control"):
+                        self.step(delta)
+                    step_done += delta
+                    self.lamp_substeps += 1
+                    continue
+                time.sleep(next_tick - now_s)
+                continue
+
+            behind = int((now_s - next_tick) / step_s) + 1
+            if behind > CONTROL_MAX_CATCHUP:
+                # Zu weit zurück (z. B. Rechner im Standby) – nicht im Zeitraffer nachholen
+                self.resyncs += 1
+                debug_log(f"Steuerung {behind} Schritte im Verzug – synchronisiere neu.")
+                behind = 1
+                next_tick = now_s
+            for _ in range(behind):
+                with LATENCY.span("control"):
+                    self.step(CONTROL_STEP_MS - step_done)
+                step_done = 0
+                next_tick += step_s
+            # Teilschritte zählen nur in lamp_substeps – steps sind die vollen Takte
+            self.steps += behind
+            self.catchup_steps += behind - 1
+        debug_log("Steuerungs-Thread beendet.")
+
+    def _publish(self):
+        engine = self.engine
+        snapshot = {
+            "now": engine.now,
+            "state": engine.state,
+            "visual_active_leds": engine.visual_active_leds,
+            "person_count": engine.person_count,
+            "camera_person_count": self.camera_person_count,
+            "esp_sensor_person_count": self.esp_sensor_person_count,
+            "p_green": engine.p_green,
+            "clearance_remaining_ms": engine.clearance_remaining_ms(),  # Räumzeit aus der geladenen Config
+            "tram_active": engine.tram_active,
+            "green_leds_left_float": engine.green_leds_left_float,
+            "slow_mode_active": engine.slow_mode_active,
+            "esp_connected": bool(self.esp and self.esp.connected),
+        }
+        with self.lock:
+            self._snapshot = snapshot
+
+    def _read_esp(self, now):
+        """ESP-Taster und Sensoren lesen; liefert die entprellte Personenzahl der Hall-Sensoren."""
+        esp = self.esp
+        engine = self.engine
+        if esp.button_pressed:
+            esp.button_pressed = False
+            engine.handle(EVENT_START)
+        if esp.button2_pressed:
+            esp.button2_pressed = False
+            engine.handle(EVENT_SLOW)
+
+        # Sensor-Daten lesen (MUSS vor Tram-Check und Debounce stehen!)
+        esp.read_sensor_data()
+
+        # Hall-Sensor Debouncing (Personen-Sensoren Index 0-5), auf der Steuerungs-Uhr
+        current_time_s = now / 1000.0
+        for si in range(min(6, len(esp.sensor_values))):
+            raw_val = esp.sensor_values[si]
+            if raw_val != self.esp_sensor_pending[si]:
+                self.esp_sensor_pending[si] = raw_val
+                self.esp_sensor_pending_time[si] = current_time_s
+            elif current_time_s - self.esp_sensor_pending_time[si] >= ESP_SENSOR_DEBOUNCE_TIME:
+                self.esp_sensor_debounce_values[si] = self.esp_sensor_pending[si]
+
+        # Tram-Sensoren: Latched-Flag aus ESPController nutzen
+        # (read_sensor_data() merkt sich jede 1 auf Sensor 6/7, auch kurze Flanken)
+        if esp.tram_triggered:
+            esp.tram_triggered = False  # Flag zurücksetzen (einmalig konsumieren)
+            engine.handle(EVENT_TRAM_SENSOR)
+
+        return min(MAX_PERSON_CAP, sum(self.esp_sensor_debounce_values[:6]))
+
+    def step(self, dt=CONTROL_STEP_MS):
+        """Ein Steuerungsschritt: Eingaben, Sensoren, Zustandsautomat, LED-Ausgabe."""
+        engine = self.engine
+        esp = self.esp
+        now = engine.now + dt
+
+        with self.lock:
+            commands, self._commands = self._commands, []
+        for command in commands:
+            engine.handle(command)
+
+        # Personen zusammenführen: Kamera + HAL-Sensoren (Maximum)
+        self.camera_person_count = self.detector.get_person_count()
+        self.esp_sensor_person_count = self._read_esp(now) if esp and esp.connected else 0
+        engine.set_person_count(max(self.camera_person_count, self.esp_sensor_person_count))
+
+        self.detector.set_traffic_context(engine.state, engine.person_count)
+
+        lights = engine.step(dt)
+
+        if esp:
+            if engine.pulsing != self.esp_pulsing:
+                esp.set_pulsing(engine.pulsing)
+                self.esp_pulsing = engine.pulsing
+            # ESP LEDs senden (bei Änderung, sonst alle 2 s als Keepalive)
+            if esp.connected and (lights != self.last_esp_values or (now % 2000 < dt)):
+                esp.update_leds(*lights)
+                self.last_esp_values = lights
+
+        self._publish()
+
+
 # ==========================================
 #      HAUPT-ANWENDUNG
 # ==========================================
@@ -570,6 +1186,25 @@ def main():
     parser.add_argument("--source", default="0", help="Kameraindex oder Stream-URL")
     parser.add_argument("--no-esp", action="store_true", help="ESP deaktivieren")
     parser.add_argument("--windowed", action="store_true", help="Feste Fenstergröße 1600x900 (Standard: 85%% Bildschirm)")
+    parser.add_argument("--cpu-budget", type=float, default=INFERENCE_CPU_BUDGET,
+                        help="Max. CPU-Anteil (eines Kerns) für YOLO, 0.05-1.0 (Standard: %(default)s)")
+    parser.add_argument("--no-motion-gate", action="store_true",
+                        help="YOLO auf jedem fälligen Frame ausführen, auch bei unveränderter Szene")
+    parser.add_argument("--backend", choices=BACKENDS, default="torch",
+                        help="Inferenz-Backend; onnx/openvino werden beim ersten Start exportiert und gecacht, "
+                             "onnx-int8 zusätzlich auf den Clips in image-detection/render/input kalibriert")
+    parser.add_argument("--imgsz", type=int, default=DEFAULT_IMGSZ, help="YOLO-Eingabegröße (Standard: %(default)s)")
+    parser.add_argument("--profile", choices=PROFILE_NAMES, default=PROFILE_FULL,
+                        help="Erkennungs-Profil bei sichtbarem Kamerabild; ausgeblendet/minimiert gilt immer count-only")
+    parser.add_argument("--latency-report", default=None,
+                        help="Pfad für den Latenz-Bericht (JSON) beim Beenden (Standard: logs/latency_<Zeitstempel>.json)")
+    parser.add_argument("--full-redraw", action="store_true",
+                        help="Jedes Frame das ganze Fenster neu zeichnen (keine Dirty-Rect-Updates)")
+    parser.add_argument("--renderer", choices=("software", "sdl2"), default="software",
+                        help="sdl2: Texturen + SDL-Renderer (pygame._sdl2), fällt ohne Renderer auf software zurück")
+    parser.add_argument("--timing", default=TIMING_FILE,
+                        help="Optimierte Ampel-Zeiten (JSON von timing_optimizer.py); fehlt die Datei, "
+                             "gelten die Konstanten (Standard: %(default)s)")
     args = parser.parse_args()
 
     # Source parsen
@@ -596,9 +1231,14 @@ def main():
         SCREEN_W = int(native_w * 0.85)
         SCREEN_H = int(native_h * 0.85)
 
-    screen = pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.RESIZABLE)
-
-    pygame.display.set_caption("TrafficOwl – Integriertes System")
+    # Textur-Backend (pygame._sdl2) oder bisheriges Software-Rendering
+    gpu = None
+    screen = None
+    if args.renderer == "sdl2":
+        gpu = TextureRenderer.create("TrafficOwl – Integriertes System", (SCREEN_W, SCREEN_H), log=debug_log)
+    if gpu is None:
+        screen = pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.RESIZABLE)
+        pygame.display.set_caption("TrafficOwl – Integriertes System")
 
     # === Ampel-Interface laden ===
     traffic_ui = TrafficInterface()
@@ -613,58 +1253,81 @@ def main():
         if not esp.connected:
             debug_log(f"ESP konnte nicht verbunden werden auf {port}. Fahre ohne ESP fort.")
             esp = None
-    last_esp_values = None
 
     # === Kamera-Detektor starten ===
-    detector = CameraDetector(source=source)
+    detector = CameraDetector(source=source, cpu_budget=args.cpu_budget,
+                              motion_gate=not args.no_motion_gate,
+                              backend=args.backend, imgsz=args.imgsz, profile=args.profile)
     camera_ok = detector.start()
     if not camera_ok:
         debug_log("Kamera-Erkennung konnte nicht gestartet werden. Interface läuft ohne Kamera.")
 
-    # === Zustandsvariablen ===
-    clock = pygame.time.Clock()
-    current_state = STATE_IDLE
-    timer_total_duration_red = DURATION_RED_BASE_MS
-    timer_elapsed = 0
-    green_leds_left_float = 0.0
-    clearance_start_time = 0
-    tram_display_timer = 0
-    person_count = 0
-    camera_person_count = 0
-    slow_mode_active = False
-    visual_active_leds = 0
-    tram_active = False
-
-    # Trigger-Logik: Neuer Zyklus nur wenn Personen vorher auf 0 waren
-    cycle_was_zero = True  # Startet als True, damit der erste Erkennungsfall triggert
-
-    # ESP Hall-Sensor Debouncing
-    esp_sensor_debounce_values = [0] * 8   # Geglättete Sensorwerte
-    esp_sensor_pending = [0] * 8           # Anstehende Werte
-    esp_sensor_pending_time = [0.0] * 8    # Zeitstempel der letzten Änderung
-    ESP_SENSOR_DEBOUNCE_TIME = 0.3         # 300ms Debounce für Sensoren
+    # === Steuerung (fester Takt, eigener Thread) ===
+    timing = CrossingConfig.from_constants(globals())
+    load_timing_file(timing, args.timing, log=debug_log)
+    controller = CrossingController(detector, esp, timing)
+    controller.start()
 
     # Placeholder-Surface wenn keine Kamera
     no_cam_font = pygame.font.SysFont("Arial", 30)
 
+    # Kamerabild sichtbar? (ausgeblendet per [K] oder Fenster minimiert -> Profil count-only)
+    camera_panel_visible = True
+    window_minimized = False
+
+    # Latenz-Overlay (Taste [L])
+    latency_overlay_visible = False
+    latency_font = pygame.font.SysFont("Menlo,Consolas,DejaVu Sans Mono,monospace", 13)
+
+    # Status-Leiste (Fonts einmal laden, Texte gecacht)
+    status_bar = StatusBar()
+
+    # Dirty-Rect-Updates: nur geänderte Flächen zeichnen und übertragen
+    dirty = DirtyRegions(enabled=not args.full_redraw)
+    cam_surface = None      # Persistentes Surface des Kamerabilds
+    uploaded_seq = -1       # Frame-Nummer, die gerade in cam_surface bzw. der Kamera-Textur steht
+    cam_frame_size = (0, 0)
+    placeholder_key = None  # Textur-Backend: (Text, Größe) der hochgeladenen Platzhalter-Textur
+    placeholder_text_size = (0, 0)
+
+    # Adaptive Bildrate: in ruhigem IDLE gedrosselt, weckt sofort bei Aktivität
+    frame_rate = FrameRatePolicy()
+
+    def control_activity(control):
+        return (control["state"], control["camera_person_count"], control["esp_sensor_person_count"],
+                control["person_count"])
+
     running = True
     while running:
-        dt = clock.tick(60)
-        now = pygame.time.get_ticks()
+        frame_rate.tick(activity=lambda: control_activity(controller.snapshot()))
 
         # === Events ===
         for event in pygame.event.get():
+            frame_rate.note_activity()
             if event.type == pygame.QUIT:
                 running = False
-            if event.type == pygame.VIDEORESIZE:
+            if event.type == pygame.VIDEORESIZE and not gpu:
                 SCREEN_W, SCREEN_H = event.w, event.h
                 screen = pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.RESIZABLE)
+                dirty.invalidate()
+            if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN,
+                              pygame.WINDOWMAXIMIZED, pygame.WINDOWSIZECHANGED):
+                # Fensterinhalt evtl. verloren -> einmal komplett neu zeichnen
+                dirty.invalidate()
+                if gpu:
+                    gpu.invalidate()
+            if event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                window_minimized = True
+            if event.type in (pygame.WINDOWRESTORED, pygame.WINDOWSHOWN, pygame.WINDOWMAXIMIZED):
+                window_minimized = False
             if event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     running = False
                 if event.key == pygame.K_f:
                     # Fullscreen-Toggle mit F-Taste
-                    if screen.get_flags() & pygame.FULLSCREEN:
+                    if gpu:
+                        gpu.set_fullscreen(not gpu.fullscreen, (int(native_w * 0.85), int(native_h * 0.85)))
+                    elif screen.get_flags() & pygame.FULLSCREEN:
                         SCREEN_W = int(native_w * 0.85)
                         SCREEN_H = int(native_h * 0.85)
                         screen = pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.RESIZABLE)
@@ -672,277 +1335,151 @@ def main():
                         SCREEN_W = native_w
                         SCREEN_H = native_h
                         screen = pygame.display.set_mode((SCREEN_W, SCREEN_H), pygame.FULLSCREEN)
+                    dirty.invalidate()
 
-                if event.key == pygame.K_g and current_state == STATE_IDLE:
-                    debug_log("G-Taste: Starte Rotphase.")
-                    current_state = STATE_RED
-                    timer_elapsed = 0
-                    timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                    if esp:
-                        esp.set_pulsing(True)
+                if event.key == pygame.K_l:
+                    latency_overlay_visible = not latency_overlay_visible
+                    dirty.invalidate()
 
-                if event.key == pygame.K_t:
-                    debug_log("T-Taste: Tram!")
-                    if current_state == STATE_CLEARANCE:
-                        debug_log("Tram ignoriert: Räumzeit läuft.")
-                    elif current_state == STATE_GREEN:
-                        tram_active = True
-                        green_leds_left_float = float(VISUAL_LED_COUNT)
-                        slow_mode_active = False
-                    else:
-                        current_state = STATE_TRAM
-                        timer_elapsed = 0
-                        tram_active = True
-                        tram_display_timer = now
+                if event.key == pygame.K_k:
+                    camera_panel_visible = not camera_panel_visible
+                    debug_log(f"Kamerabild {'eingeblendet' if camera_panel_visible else 'ausgeblendet'}.")
 
+                # Steuerungs-Befehle laufen über den Steuerungs-Thread
+                if event.key == pygame.K_g:
+                    controller.post("start")
+                if event.key == pygame.K_t:
+                    controller.post("tram")
                 if event.key == pygame.K_SPACE:
-                    if current_state == STATE_GREEN:
-                        slow_mode_active = not slow_mode_active
-                        debug_log(f"Slow Mode: {slow_mode_active}")
-
+                    controller.post("slow")
                 if event.key == pygame.K_UP:
-                    person_count = min(MAX_PERSON_CAP, person_count + 1)
+                    controller.post("person_up")
                 if event.key == pygame.K_DOWN:
-                    person_count = max(0, person_count - 1)
+                    controller.post("person_down")
 
         # === Kamera-Daten abrufen ===
-        cam_frame, cam_count = detector.get_frame_and_count()
-        camera_person_count = cam_count
-
-        # Personen-Zusammenführung: Maximum aus Kamera und ESP-Sensoren
-        # (ESP-Sensoren werden unten gelesen und ebenfalls in person_count gespeichert)
-        # Kamera-Count hat Vorrang / wird addiert mit HAL-Sensor-Count
-        esp_sensor_person_count = 0
-
-        # === ESP Daten lesen ===
-        if esp and esp.connected:
-            # Button 1 (Start)
-            if esp.button_pressed:
-                esp.button_pressed = False
-                if current_state == STATE_IDLE:
-                    debug_log("ESP Button 1: Starte Rotphase.")
-                    current_state = STATE_RED
-                    timer_elapsed = 0
-                    timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                    esp.set_pulsing(True)
-
-            # Button 2 (Slow)
-            if esp.button2_pressed:
-                esp.button2_pressed = False
-                if current_state == STATE_GREEN:
-                    slow_mode_active = not slow_mode_active
-                    debug_log(f"ESP Button 2: Slow Mode = {slow_mode_active}")
-
-            # Sensor-Daten lesen (MUSS vor Tram-Check und Debounce stehen!)
-            sensor_count = esp.read_sensor_data()
-
-            # Hall-Sensor Debouncing (Personen-Sensoren Index 0-5)
-            current_time_s = time.time()
-            for si in range(min(6, len(esp.sensor_values))):
-                raw_val = esp.sensor_values[si]
-                if raw_val != esp_sensor_pending[si]:
-                    esp_sensor_pending[si] = raw_val
-                    esp_sensor_pending_time[si] = current_time_s
-                else:
-                    if current_time_s - esp_sensor_pending_time[si] >= ESP_SENSOR_DEBOUNCE_TIME:
-                        esp_sensor_debounce_values[si] = esp_sensor_pending[si]
-
-            # Tram-Sensoren: Latched-Flag aus ESPController nutzen
-            # (read_sensor_data() merkt sich jede 1 auf Sensor 6/7, auch kurze Flanken)
-            if esp.tram_triggered:
-                esp.tram_triggered = False  # Flag zurücksetzen (einmalig konsumieren)
-                if not tram_active and current_state != STATE_CLEARANCE:
-                    debug_log(f"Tram erkannt (Sensor)! debounce[6]={esp_sensor_debounce_values[6]}, debounce[7]={esp_sensor_debounce_values[7]}")
-                    if current_state == STATE_GREEN:
-                        tram_active = True
-                        green_leds_left_float = float(VISUAL_LED_COUNT)
-                        slow_mode_active = False
-                    elif current_state != STATE_TRAM:
-                        current_state = STATE_TRAM
-                        timer_elapsed = 0
-                        tram_active = True
-                        tram_display_timer = now
-
-            esp_sensor_person_count = min(MAX_PERSON_CAP, sum(esp_sensor_debounce_values[:6]))
-
-        # Personen zusammenführen: Kamera + HAL-Sensoren (Maximum)
-        combined_count = max(camera_person_count, esp_sensor_person_count)
-        person_count = min(MAX_PERSON_CAP, combined_count)
-
-        # Trigger-Logik: Neuer Zyklus nur wenn vorher 0 Personen waren
-        if person_count == 0:
-            cycle_was_zero = True
-
-        # === ZEIT-FAKTOR ===
-        current_time_factor = 1.0
-        if current_state == STATE_RED:
-            current_time_factor = 1.0 + ((person_count / 5) * CROWD_BONUS_FACTOR)
+        # Kamerabild nicht sichtbar -> nur zählen, keine Masken/Annotation
+        camera_shown = camera_panel_visible and not window_minimized
+        detector.set_profile(args.profile if camera_shown else PROFILE_COUNT_ONLY)
+        detector.set_display_enabled(camera_shown)
+        cam_frame, _, cam_frame_seq = detector.get_frame_and_count()
+        cam_stats = detector.get_stats()
+
+        # === Zustand der Steuerung übernehmen (Schnappschuss des letzten Takts) ===
+        control = controller.snapshot()
+        now = control["now"]
+        current_state = control["state"]
+        visual_active_leds = control["visual_active_leds"]
+        person_count = control["person_count"]
+        camera_person_count = control["camera_person_count"]
+        esp_sensor_person_count = control["esp_sensor_person_count"]
+        p_green = control["p_green"]
+        clearance_remaining_ms = control["clearance_remaining_ms"]
+        tram_active = control["tram_active"]
+        green_leds_left_float = control["green_leds_left_float"]
+        slow_mode_active = control["slow_mode_active"]
+
+        frame_rate.update(current_state, control_activity(control))
 
         # FADING Clearance
         clearance_alpha = 255
         if current_state == STATE_CLEARANCE:
             clearance_alpha = int(128 + 127 * math.sin(now * 0.020))
 
-        # === ZUSTANDS-LOGIK ===
-
-        if current_state == STATE_IDLE:
-            if person_count > 0 and cycle_was_zero:
-                debug_log(f"Person(en) erkannt ({person_count})! Starte Rotphase.")
-                cycle_was_zero = False
-                current_state = STATE_RED
-                timer_elapsed = 0
-                timer_total_duration_red = DURATION_RED_BASE_MS + TIME_SAFETY_PRE_GREEN
-                if esp:
-                    esp.set_pulsing(True)
-
-        elif current_state == STATE_TRAM:
-            timer_elapsed += dt
-            ratio = timer_elapsed / TIME_TRAM_PRE_GREEN
-            leds_visible_ratio = max(0.0, 1.0 - ratio)
-            visual_active_leds = int(leds_visible_ratio * VISUAL_LED_COUNT)
-
-            if timer_elapsed >= TIME_TRAM_PRE_GREEN:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                green_leds_left_float = float(VISUAL_LED_COUNT)
-                slow_mode_active = False
-
-        elif current_state == STATE_RED:
-            timer_elapsed += dt * current_time_factor
-            ratio = min(1.0, timer_elapsed / timer_total_duration_red)
-            visual_active_leds = int(ratio * VISUAL_LED_COUNT)
-
-            if timer_elapsed >= timer_total_duration_red:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                if esp:
-                    esp.set_pulsing(False)
-                bonus_leds = person_count * ADD_LEDS_PER_PERSON
-                green_leds_left_float = float(BASE_LEDS_GREEN + bonus_leds)
-                if green_leds_left_float > MAX_LEDS_LIMIT:
-                    green_leds_left_float = float(MAX_LEDS_LIMIT)
-                slow_mode_active = False
-
-        elif current_state == STATE_SAFETY_1:
-            timer_elapsed += dt
-            visual_active_leds = VISUAL_LED_COUNT
-            if timer_elapsed >= TIME_SAFETY_PRE_GREEN:
-                current_state = STATE_GREEN
-                timer_elapsed = 0
-                if esp:
-                    esp.set_pulsing(False)
-
-        elif current_state == STATE_GREEN:
-            if tram_active:
-                seconds_per_led = TIME_TRAM_GREEN_DURATION / 1000.0 / VISUAL_LED_COUNT
-            else:
-                seconds_per_led = SECONDS_PER_LED_GREEN_SLOW if slow_mode_active else SECONDS_PER_LED_GREEN
-            ms_per_led = seconds_per_led * 1000
-            points_consumed = dt / ms_per_led
-            green_leds_left_float -= points_consumed
-            visual_active_leds = min(VISUAL_LED_COUNT, int(green_leds_left_float))
-
-            if green_leds_left_float <= 0:
-                current_state = STATE_CLEARANCE
-                clearance_start_time = now
-                visual_active_leds = VISUAL_LED_COUNT
-
-        elif current_state == STATE_CLEARANCE:
-            if now - clearance_start_time > TIME_CLEARANCE:
-                current_state = STATE_IDLE
-                timer_elapsed = 0
-                person_count = 0
-                slow_mode_active = False
-                tram_active = False
-                if esp:
-                    esp.set_pulsing(False)
-                debug_log("Zyklus beendet.")
-
-        # === HARDWARE AMPEL LOGIK ===
-        p_red, p_green = 1, 0
-        c_red, c_yellow, c_green = 0, 0, 1
-
-        if current_state == STATE_IDLE:
-            pass
-        elif current_state == STATE_RED:
-            time_left = timer_total_duration_red - timer_elapsed
-            if time_left <= TIME_SAFETY_PRE_GREEN:
-                c_red, c_yellow, c_green = 1, 0, 0
-            elif time_left <= (TIME_SAFETY_PRE_GREEN + TIME_CAR_YELLOW):
-                c_red, c_yellow, c_green = 0, 1, 0
-            else:
-                c_red, c_yellow, c_green = 0, 0, 1
-        elif current_state == STATE_SAFETY_1:
-            c_red, c_yellow, c_green = 1, 0, 0
-        elif current_state == STATE_GREEN:
-            p_red, p_green = 0, 1
-            c_red, c_yellow, c_green = 1, 0, 0
-        elif current_state == STATE_CLEARANCE:
-            p_red, p_green = 1, 0
-            time_passed = now - clearance_start_time
-            time_left_clearance = TIME_CLEARANCE - time_passed
-            if time_left_clearance < TIME_CAR_RED_YELLOW:
-                c_red, c_yellow, c_green = 1, 1, 0
-            else:
-                c_red, c_yellow, c_green = 1, 0, 0
-        elif current_state == STATE_TRAM:
-            if timer_elapsed < TIME_TRAM_YELLOW:
-                c_red, c_yellow, c_green = 0, 1, 0
-            else:
-                c_red, c_yellow, c_green = 1, 0, 0
-            p_red, p_green = 1, 0
-
-        # ESP LEDs senden
-        if esp and esp.connected:
-            current_values = (p_red, p_green, c_red, c_yellow, c_green)
-            if current_values != last_esp_values or (now % 2000 < dt):
-                esp.update_leds(*current_values)
-                last_esp_values = current_values
-
         # === RENDERING ===
-        screen.fill((12, 12, 14))
+        # Software: nur geänderte Flächen werden neu gezeichnet und übertragen (siehe dirty_regions.py);
+        # nach Resize/Vollbild/Freilegen des Fensters zeichnet dirty.full alles neu.
+        # Textur-Backend: geänderte Flächen werden in Texturen geladen, der Renderer setzt zusammen.
+        render_start = time.perf_counter()
+        if gpu:
+            SCREEN_W, SCREEN_H = gpu.size
 
         # --- Layout berechnen ---
-        status_bar_h = 36
+        status_bar_h = status_bar.height
         content_h = SCREEN_H - status_bar_h
         interface_area_w = max(160, SCREEN_W // 6)
         cam_area_w = SCREEN_W - interface_area_w
         margin = 6
 
-        # --- RECHTS: Panel-Hintergrund ---
         panel_x = SCREEN_W - interface_area_w
         panel_w = interface_area_w
-        pygame.draw.rect(screen, (14, 14, 16), (panel_x, 0, panel_w, content_h))
-        # Trennlinie
-        pygame.draw.line(screen, (32, 32, 36), (panel_x, 0), (panel_x, content_h), 1)
+
+        if gpu:
+            gpu.begin((12, 12, 14))
+            gpu.fill_rect((14, 14, 16), (panel_x, 0, panel_w, content_h))
+            gpu.draw_line((32, 32, 36), (panel_x, 0), (panel_x, content_h))
+        elif dirty.full:
+            screen.fill((12, 12, 14))
+            # --- RECHTS: Panel-Hintergrund ---
+            pygame.draw.rect(screen, (14, 14, 16), (panel_x, 0, panel_w, content_h))
+            # Trennlinie
+            pygame.draw.line(screen, (32, 32, 36), (panel_x, 0), (panel_x, content_h), 1)
 
         # --- LINKS: Kamerabild (korrekt skaliert, kein Abschneiden) ---
-        if cam_frame is not None:
-            cam_h_src, cam_w_src = cam_frame.shape[:2]
-            # Skalieren damit das Bild in den verfügbaren Bereich passt (aspect ratio beibehalten)
-            scale_w = cam_area_w / cam_w_src
-            scale_h = content_h / cam_h_src
-            cam_scale = min(scale_w, scale_h)  # fit (kein Abschneiden)
+        # Der Detektor liefert schon RGB in Panel-Größe (wirkt ab dem nächsten Frame)
+        detector.set_display_size(cam_area_w, content_h)
+        show_cam_frame = cam_frame is not None and camera_shown
+        if show_cam_frame and cam_frame_seq != uploaded_seq:
+            # Neues Bild: einmal in das persistente Surface bzw. die Textur hochladen
+            frame_h, frame_w = cam_frame.shape[:2]
+            frame_view = pygame.image.frombuffer(cam_frame, (frame_w, frame_h), "RGB")
+            if gpu:
+                gpu.upload("camera", frame_view)
+            else:
+                if cam_surface is None or cam_surface.get_size() != (frame_w, frame_h):
+                    cam_surface = pygame.Surface((frame_w, frame_h))
+                cam_surface.blit(frame_view, (0, 0))
+            cam_frame_size = (frame_w, frame_h)
+            uploaded_seq = cam_frame_seq
+        placeholder_text = "Kamera wird initialisiert..." if camera_panel_visible else "Kamera ausgeblendet [K]"
+
+        if show_cam_frame:
+            cam_w_src, cam_h_src = cam_frame_size
+            # Einpassen (aspect ratio beibehalten) – nur nötig, bis nach einer
+            # Größenänderung das erste Frame in neuer Panel-Größe ankommt
+            cam_scale = min(cam_area_w / cam_w_src, content_h / cam_h_src)  # fit (kein Abschneiden)
             new_cam_w = int(cam_w_src * cam_scale)
             new_cam_h = int(cam_h_src * cam_scale)
-            resized = cv2.resize(cam_frame, (new_cam_w, new_cam_h))
-            rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-            cam_surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
-
-            # Zentriert im Kamerabereich platzieren
             cam_x = (cam_area_w - new_cam_w) // 2
             cam_y = (content_h - new_cam_h) // 2
-            screen.blit(cam_surface, (cam_x, cam_y))
-        else:
-            # Placeholder
-            placeholder = pygame.Surface((cam_area_w, content_h))
-            placeholder.fill((16, 16, 18))
-            text_surf = no_cam_font.render("Kamera wird initialisiert...", True, (60, 60, 60))
-            text_rect = text_surf.get_rect(center=(cam_area_w // 2, content_h // 2))
-            placeholder.blit(text_surf, text_rect)
-            screen.blit(placeholder, (0, 0))
-
-        # --- Ampel-Visualisierung rendern ---
+
+        if gpu:
+            if show_cam_frame:
+                gpu.draw("camera", (cam_x, cam_y, new_cam_w, new_cam_h))
+            else:
+                if placeholder_key != (placeholder_text, cam_area_w, content_h):
+                    placeholder_key = (placeholder_text, cam_area_w, content_h)
+                    text_surf = no_cam_font.render(placeholder_text, True, (60, 60, 60))
+                    gpu.upload("placeholder", text_surf)
+                    placeholder_text_size = text_surf.get_size()
+                gpu.fill_rect((16, 16, 18), (0, 0, cam_area_w, content_h))
+                text_rect = pygame.Rect((0, 0), placeholder_text_size)
+                text_rect.center = (cam_area_w // 2, content_h // 2)
+                gpu.draw("placeholder", text_rect)
+        # Das Latenz-Overlay liegt über dem Kamerabild und wird jedes Frame neu geblendet
+        elif dirty.changed("camera", (uploaded_seq if show_cam_frame else placeholder_text,
+                                      now if latency_overlay_visible else 0), (0, 0, cam_area_w, content_h)):
+            if show_cam_frame:
+                frame_surface = cam_surface
+                if (new_cam_w, new_cam_h) != (cam_w_src, cam_h_src):
+                    frame_surface = pygame.transform.scale(cam_surface, (new_cam_w, new_cam_h))
+
+                # Zentriert im Kamerabereich platzieren (Ränder neu füllen, Fenster wird nicht mehr gelöscht)
+                screen.fill((12, 12, 14), (0, 0, cam_area_w, content_h))
+                screen.blit(frame_surface, (cam_x, cam_y))
+            else:
+                # Placeholder
+                placeholder = pygame.Surface((cam_area_w, content_h))
+                placeholder.fill((16, 16, 18))
+                text_surf = no_cam_font.render(placeholder_text, True, (60, 60, 60))
+                text_rect = text_surf.get_rect(center=(cam_area_w // 2, content_h // 2))
+                placeholder.blit(text_surf, text_rect)
+                screen.blit(placeholder, (0, 0))
+
+        # --- Ampel-Visualisierung rendern (direkt in Panel-Auflösung) ---
+        panel_inner_w = panel_w - margin * 2
+        panel_inner_h = content_h - margin * 2
+        traffic_ui.set_target_size(panel_inner_w, panel_inner_h)
         ampel_surface = traffic_ui.render(
             state=current_state,
             visual_active_leds=visual_active_leds,
@@ -950,34 +1487,24 @@ def main():
             p_green=p_green,
             clearance_alpha=clearance_alpha,
             now=now,
-            clearance_start_time=clearance_start_time,
+            clearance_remaining_ms=clearance_remaining_ms,
             tram_active=tram_active,
             green_leds_left_float=green_leds_left_float
         )
 
-        # Ampel skalieren für das rechte Panel
-        ampel_h = ampel_surface.get_height()
-        ampel_w = ampel_surface.get_width()
-        panel_inner_w = panel_w - margin * 2
-        panel_inner_h = content_h - margin * 2
-        scale_factor = min(panel_inner_w / ampel_w, panel_inner_h / ampel_h)
-        scaled_ampel_w = int(ampel_w * scale_factor)
-        scaled_ampel_h = int(ampel_h * scale_factor)
-        scaled_ampel = pygame.transform.smoothscale(ampel_surface, (scaled_ampel_w, scaled_ampel_h))
-
         # Zentriert im Panel
-        ampel_x = panel_x + (panel_w - scaled_ampel_w) // 2
-        ampel_y = (content_h - scaled_ampel_h) // 2
-        screen.blit(scaled_ampel, (ampel_x, ampel_y))
+        ampel_x = panel_x + (panel_w - ampel_surface.get_width()) // 2
+        ampel_y = (content_h - ampel_surface.get_height()) // 2
+        ampel_rect = (ampel_x, ampel_y, ampel_surface.get_width(), ampel_surface.get_height())
+        if gpu:
+            gpu.upload("ampel", ampel_surface, None if traffic_ui.changed else [])
+            gpu.draw("ampel", ampel_rect)
+        elif dirty.full or traffic_ui.changed:
+            screen.blit(ampel_surface, (ampel_x, ampel_y))
+            dirty.mark(ampel_rect)
 
         # ─── MODERNE STATUS-LEISTE UNTEN ───
         bar_y = SCREEN_H - status_bar_h
-        # Hintergrund
-        bar_surf = pygame.Surface((SCREEN_W, status_bar_h), pygame.SRCALPHA)
-        bar_surf.fill((18, 18, 22, 240))
-        screen.blit(bar_surf, (0, bar_y))
-        # Obere Linie
-        pygame.draw.line(screen, (40, 40, 48), (0, bar_y), (SCREEN_W, bar_y), 1)
 
         # Status-Farbe
         state_color = (80, 220, 80) if current_state == STATE_GREEN else \
@@ -985,33 +1512,25 @@ def main():
                       (220, 180, 40) if current_state == STATE_CLEARANCE else \
                       (60, 180, 220) if current_state == STATE_TRAM else (100, 100, 100)
 
-        # Status-Punkt (farbiger Indikator)
-        dot_x = 16
-        dot_y = bar_y + status_bar_h // 2
-        pygame.draw.circle(screen, state_color, (dot_x, dot_y), 5)
-        # Mini-Glow
-        dot_glow = pygame.Surface((18, 18), pygame.SRCALPHA)
-        pygame.draw.circle(dot_glow, (*state_color, 30), (9, 9), 9)
-        screen.blit(dot_glow, (dot_x - 9, dot_y - 9))
-
-        # Text-Rendering (modern, sauber)
-        sf = pygame.font.SysFont("Helvetica", 13)
-        sf_bold = pygame.font.SysFont("Helvetica", 13, bold=True)
-
-        # Status-Label
-        state_label = sf_bold.render(current_state, True, state_color)
-        screen.blit(state_label, (dot_x + 12, bar_y + 10))
-
-        # Trenner und Info-Segmente
-        info_x = dot_x + 12 + state_label.get_width() + 20
-        separator_color = (50, 50, 55)
-
         segments = []
         segments.append(("Kamera", str(camera_person_count), (160, 160, 170)))
         segments.append(("ESP", str(esp_sensor_person_count), (160, 160, 170)))
         segments.append(("Gesamt", str(person_count), (220, 220, 230)))
 
-        if esp and esp.connected:
+        if camera_ok:
+            segments.append(("Backend", detector.backend, (160, 160, 170)))
+            segments.append(("Profil", detector.profile.name, (160, 160, 170)))
+            segments.append(("YOLO", f"{cam_stats['rate_hz']:.1f} Hz {cam_stats['mode']} "
+                                     f"({cam_stats['cpu_budget'] * 100:.0f}% CPU)", (160, 160, 170)))
+            # Latenz, Drops, Skip und Pool ändern sich mit jedem Kamerabild – sie stehen im
+            # Latenz-Overlay [L], sonst wäre die Status-Leiste nie ruhig (Dirty-Rects, Ruhe-Takt)
+
+        if frame_rate.idle:
+            segments.append(("UI", f"{frame_rate.idle_fps} fps Ruhe", (100, 100, 110)))
+        else:
+            segments.append(("UI", f"{frame_rate.active_fps} fps", (160, 160, 170)))
+
+        if control["esp_connected"]:
             segments.append(("ESP", "●", (60, 200, 80)))
         else:
             segments.append(("ESP", "○", (100, 100, 100)))
@@ -1022,30 +1541,64 @@ def main():
         if tram_active:
             segments.append(("", "TRAM", (60, 180, 220)))
 
-        for label_text, value_text, val_color in segments:
-            # Trennstrich
-            pygame.draw.line(screen, separator_color, (info_x, bar_y + 8), (info_x, bar_y + status_bar_h - 8), 1)
-            info_x += 12
-
-            if label_text:
-                lbl = sf.render(f"{label_text} ", True, (90, 90, 100))
-                screen.blit(lbl, (info_x, bar_y + 10))
-                info_x += lbl.get_width()
-
-            val = sf_bold.render(value_text, True, val_color)
-            screen.blit(val, (info_x, bar_y + 10))
-            info_x += val.get_width() + 16
-
-        # Rechte Seite: Tastenkürzel
-        keys_text = "[F] Vollbild   [G] Start   [T] Tram   [SPACE] Slow   [ESC] Beenden"
-        keys_surf = sf.render(keys_text, True, (60, 60, 68))
-        screen.blit(keys_surf, (SCREEN_W - keys_surf.get_width() - 12, bar_y + 10))
+        # Nur geänderte Segmente werden neu gezeichnet (Texte gecacht, siehe status_bar.py)
+        bar_rects = status_bar.update(SCREEN_W, current_state, state_color, segments)
+        if gpu:
+            gpu.upload("status", status_bar.surface, bar_rects)
+            gpu.draw("status", (0, bar_y, SCREEN_W, status_bar_h))
+        elif dirty.full:
+            screen.blit(status_bar.surface, (0, bar_y))
+        else:
+            for rect in bar_rects:
+                screen.blit(status_bar.surface, rect.move(0, bar_y), rect)
+                dirty.mark(rect.move(0, bar_y))
+
+        # --- Latenz-Overlay [L] (Werte in ms, gleitendes Fenster) ---
+        if latency_overlay_visible:
+            lines = LATENCY.format_lines()
+            if camera_ok:
+                pipeline = f"Latenz {cam_stats['latency_ms']:.0f} ms  Drops {cam_stats['frames_dropped']}"
+                if 'inferences_skipped' in cam_stats:
+                    gated_total = cam_stats['inferences_executed'] + cam_stats['inferences_skipped']
+                    pipeline += f"  Skip {cam_stats['inferences_skipped']}/{gated_total}"
+                pipeline += f"  Pool {cam_stats['buffers_held']}/{cam_stats['buffers_reused']}"
+                lines.append(pipeline)
+            line_h = latency_font.get_linesize()
+            overlay_w = max(latency_font.size(line)[0] for line in lines) + 20
+            overlay = pygame.Surface((overlay_w, line_h * len(lines) + 16), pygame.SRCALPHA)
+            overlay.fill((10, 10, 12, 215))
+            for i, line in enumerate(lines):
+                color = (150, 150, 160) if i == 0 else (220, 220, 230)
+                overlay.blit(latency_font.render(line, True, color), (10, 8 + i * line_h))
+            if gpu:
+                gpu.upload("latency", overlay)
+                gpu.draw("latency", overlay.get_rect(topleft=(12, 12)))
+            else:
+                screen.blit(overlay, (12, 12))
 
-        pygame.display.flip()
+        if gpu:
+            gpu.present()
+        else:
+            dirty.present()
+        LATENCY.record("render", (time.perf_counter() - render_start) * 1000.0)
 
     # === Cleanup ===
     debug_log("Beende Anwendung...")
+    controller.stop()
+    if gpu:
+        debug_log(f"Textur-Backend: {gpu.get_stats()}")
+        gpu.destroy()
+    else:
+        debug_log(f"Display-Updates: {dirty.get_stats()}")
     detector.stop()
+    latency_path = args.latency_report or os.path.join(
+        LOG_DIR, time.strftime("latency_%Y%m%d_%H%M%S.json"))
+    try:
+        LATENCY.dump(latency_path, extra={"backend": detector.backend, "imgsz": detector.imgsz,
+                                          "profile": args.profile, "camera": detector.get_stats()})
+        debug_log(f"Latenz-Bericht gespeichert: {latency_path}")
+    except OSError as e:
+        debug_log(f"Latenz-Bericht konnte nicht gespeichert werden: {e}")
     if esp:
         esp.close()
     pygame.quit()